@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the rerun time of a page of product cards when few of them change.
+
+Renders `--cards` keyed product cards (or one grid of them) in AppTest,
+then changes the price of `--changed` percent of them per step, `--steps`
+times. Reports the median Python time of a rerun's card calls and the CPU
+time of the whole rerun.
+
+Usage:
+    python benchmarks/card_rerun.py [--cards 1000] [--changed 1]
+        [--steps 20] [--mode cards|grid]
+"""
+import argparse
+import random
+import statistics
+import string
+import textwrap
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP = string.Template(
+    textwrap.dedent(
+        """
+    import time
+
+    import streamlit as st
+    from streamlit_product_card import product_card, product_grid
+
+    STYLES = {
+        "card": {
+            "border-radius": "12px",
+            "box-shadow": "0 4px 8px rgba(0,0,0,0.1)",
+        },
+        "button": {"background-color": "#141413", "color": "#F4E0C2"},
+    }
+    prices = st.session_state.setdefault("prices", {})
+    prices.update(st.session_state.get("batch", {}))
+    products = [
+        dict(
+            key=f"sku_{i}",
+            product_name=f"Product {i}",
+            description=["Soft cotton", "Machine washable"],
+            price=prices.get(i, i + 0.99),
+            product_image=f"https://example.com/img/{i}.jpg",
+            button_text="Add to Cart",
+            styles=STYLES,
+        )
+        for i in range($cards)
+    ]
+    start = time.perf_counter()
+    if "$mode" == "cards":
+        for product in products:
+            product_card(**product)
+    else:
+        product_grid(products, key="grid")
+    st.session_state["seconds"] = time.perf_counter() - start
+    """
+    )
+)
+
+
+def measure(cards: int, changed: float, steps: int, mode: str) -> dict:
+    at = AppTest.from_string(
+        APP.substitute(cards=cards, mode=mode), default_timeout=600
+    )
+    at.run()
+    rng = random.Random(0)
+    seconds, cpu = [], []
+    for step in range(steps):
+        keys = rng.sample(range(cards), max(1, round(cards * changed / 100)))
+        at.session_state["batch"] = {i: step + i / 100 for i in keys}
+        start = time.process_time()
+        at.run()
+        cpu.append(time.process_time() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        seconds.append(at.session_state["seconds"])
+    return {
+        "cards_ms": 1000 * statistics.median(seconds),
+        "cpu_ms": 1000 * statistics.median(cpu),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--changed", type=float, default=1.0)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--mode", choices=["cards", "grid"], default="cards")
+    args = parser.parse_args()
+
+    r = measure(args.cards, args.changed, args.steps, args.mode)
+    print(f"{'cards ms':>9} {'rerun CPU ms':>13}")
+    print(f"{r['cards_ms']:9.1f} {r['cpu_ms']:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
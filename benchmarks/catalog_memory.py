@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the memory of a product catalog held as dicts and as a ProductCatalog.
+
+Generates `--products` products with realistic repetition (a few button
+texts, stock texts and styles, images under one directory, descriptions
+drawn from a small set of lines) and measures, with tracemalloc, what it
+takes to hold them as a list of plain dicts, as a list of `ProductSpec`s
+and as one `ProductCatalog`. Every string is built per product, as rows
+read from a database or an API arrive. Reports MB per 100k products, and
+the total for `--sessions` sessions: one copy per session for the lists,
+which apps typically build per session, and one shared catalog.
+
+Usage:
+    python benchmarks/catalog_memory.py [--products 100000] [--sessions 50]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator
+
+from streamlit_product_card import ProductCatalog, ProductSpec
+
+LINES = [
+    "Soft organic cotton",
+    "Machine washable",
+    "Relaxed fit",
+    "Made in Portugal",
+    "Ships in 2 days",
+    "Recycled packaging",
+]
+STOCK = ["In stock", "Low stock", "Sold out"]
+BUTTONS = ["Add to Cart", "Pre-order"]
+COLORS = ["#141413", "#2D6A4F", "#9D0208", "#3A0CA3"]
+
+
+def fresh(text: str) -> str:
+    """A new string equal to `text`, as a database driver would return."""
+    return "".join(list(text))
+
+
+def rows(count: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(0)
+    for i in range(count):
+        color = rng.choice(COLORS)
+        yield {
+            "key": f"sku-{i:07d}",
+            "product_name": f"Product {i}",
+            "description": [fresh(line) for line in rng.sample(LINES, 2)],
+            "price": f"€{rng.randrange(500, 50000) / 100:,.2f}",
+            "product_image": f"https://cdn.example.com/products/{i}.jpg",
+            "button_text": fresh(rng.choice(BUTTONS)),
+            "stock": fresh(rng.choice(STOCK)),
+            "styles": {"button": {"background-color": fresh(color)}},
+        }
+
+
+def measure(build: Callable[[], Any]) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = build()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return {"bytes": size, "seconds": seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    n = args.products
+    layouts = [
+        ("dicts", lambda: list(rows(n)), True),
+        (
+            "ProductSpec list",
+            lambda: [ProductSpec(**row) for row in rows(n)],
+            True,
+        ),
+        (
+            "ProductCatalog",
+            lambda: ProductCatalog(rows(n), price_format="€{:,.2f}"),
+            False,
+        ),
+    ]
+    print(
+        f"{'':<17} {'MB / 100k':>10} {'build s':>8} "
+        f"{f'MB, {args.sessions} sessions':>18}"
+    )
+    for label, build, per_session in layouts:
+        r = measure(build)
+        mb = r["bytes"] / 2**20
+        total = mb * (args.sessions if per_session else 1)
+        print(
+            f"{label:<17} {mb * 100_000 / n:10.1f} {r['seconds']:8.2f} "
+            f"{total:18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the serialized size and server-side encode time of a grid's cards
+sent as JSON against the same cards sent as an Arrow catalog.
+
+Encoding mirrors what Streamlit does with component args: `json.dumps` for
+plain values and Arrow IPC for DataFrames. "grid" builds the catalog from
+`product_grid`-style card dicts; "dataframe" from the normalized columns
+of `product_cards_from_dataframe`, without per-row dicts.
+
+Usage:
+    python benchmarks/catalog_transport.py [--cards 1000 10000 50000]
+"""
+import argparse
+import json
+import time
+
+import pandas as pd
+from streamlit.components.v1 import component_arrow
+from streamlit.proto.Components_pb2 import ArrowTable
+
+from streamlit_product_card._core import (
+    _build_card_args,
+    _catalog_payload,
+    _grid_payload,
+)
+
+STYLES = [
+    {"card": {"background-color": "#F4E0C2", "border-radius": "12px"}},
+    {"card": {"background-color": "#141413"}, "title": {"color": "#F4E0C2"}},
+    {},
+]
+
+
+def make_cards(count: int) -> list:
+    return [
+        _build_card_args(
+            product_name=f"Product {i}",
+            description=["Soft cotton", f"Batch {i % 97}"],
+            price=f"€{i % 500}.99",
+            product_image=f"https://example.com/img/{i % 500}.jpg",
+            button_text="Add to Cart",
+            image_aspect_ratio="1/1",
+            styles=STYLES[i % len(STYLES)],
+            columns=3,
+        )
+        for i in range(count)
+    ]
+
+
+def encode(payload: dict) -> int:
+    """Serializes grid args as Streamlit would; returns the byte count."""
+    size = 0
+    json_args = {}
+    for name, value in payload.items():
+        if isinstance(value, pd.DataFrame):
+            proto = ArrowTable()
+            component_arrow.marshall(proto, value)
+            size += proto.ByteSize()
+        else:
+            json_args[name] = value
+    return size + len(json.dumps(json_args))
+
+
+def timed(build, repeat: int = 3) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = encode(build())
+        best = min(best, time.perf_counter() - start)
+    return size, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--cards", type=int, nargs="+", default=[1000, 10000, 50000]
+    )
+    for count in parser.parse_args().cards:
+        cards = make_cards(count)
+        shared = {k: v for k, v in cards[0].items() if k != "styles"}
+        columns = pd.DataFrame(
+            {
+                "productName": [card["productName"] for card in cards],
+                "description": [card["description"] for card in cards],
+                "price": [card["price"] for card in cards],
+                "productImage": [card["productImage"] for card in cards],
+                "buttonText": "Add to Cart",
+                "styleId": 0,
+            }
+        ).astype({"styleId": "int32"})
+
+        variants = {
+            "json": lambda: _grid_payload(cards, "json"),
+            "arrow (grid)": lambda: _grid_payload(cards, "arrow"),
+            "arrow (dataframe)": lambda: _catalog_payload(columns, [shared]),
+        }
+        print(f"{count:,} cards")
+        for label, build in variants.items():
+            size, seconds = timed(build)
+            print(
+                f"  {label:>17}: {size:>12,} B ({size / count:6.1f} B/card), "
+                f"encode {seconds * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Compares rendering a catalog DataFrame with a per-row `product_card` loop
+against one `product_cards_from_dataframe` call.
+
+Each variant runs as a Streamlit app script in AppTest; the time reported is
+the script run, including argument serialization for every component.
+
+Usage:
+    python benchmarks/dataframe_cards.py [--rows 1000 10000 50000]
+"""
+import argparse
+import string
+import textwrap
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP = string.Template(
+    textwrap.dedent(
+        """
+    import numpy as np
+    import pandas as pd
+    from streamlit_product_card import (
+        product_card,
+        product_cards_from_dataframe,
+    )
+
+    rng = np.random.default_rng(0)
+    catalog = pd.DataFrame({
+        "sku": [f"SKU-{i:06d}" for i in range($rows)],
+        "name": [f"Product {i}" for i in range($rows)],
+        "blurb": ["Soft cotton|Machine washable"] * $rows,
+        "price": rng.uniform(1, 5000, $rows).round(2),
+        "image": [
+            f"https://example.com/img/{i % 500}.jpg" for i in range($rows)
+        ],
+    })
+
+    if "$variant" == "loop":
+        for row in catalog.itertuples():
+            product_card(
+                product_name=row.name,
+                description=row.blurb.split("|"),
+                price="€{:,.2f}".format(row.price),
+                product_image=row.image,
+                button_text="Add to Cart",
+                key=row.sku,
+            )
+    else:
+        product_cards_from_dataframe(
+            catalog,
+            column_map={"product_name": "name", "description": "blurb",
+                        "product_image": "image", "key": "sku"},
+            price_format="€{:,.2f}",
+            description_separator="|",
+            button_text="Add to Cart",
+            virtualized=True,
+            key="catalog",
+        )
+    """
+    )
+)
+
+
+def measure(rows: int, variant: str) -> float:
+    at = AppTest.from_string(
+        APP.substitute(rows=rows, variant=variant), default_timeout=3600
+    )
+    at.run()  # Warm-up: imports and component registration
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[1000, 10000, 50000]
+    )
+    for rows in parser.parse_args().rows:
+        loop = measure(rows, "loop")
+        bulk = measure(rows, "dataframe")
+        print(
+            f"{rows:>7,} rows: per-row loop {loop:8.2f} s, "
+            f"product_cards_from_dataframe {bulk:6.2f} s "
+            f"({loop / bulk:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Measures time to first paint of each product card frame in a real browser.
+
+Starts `streamlit run` on a page of individual `product_card`s with the
+default look, loads it in headless Chromium and reads, inside every card
+iframe, the `first-contentful-paint` time (relative to that frame's
+navigation start) and the number of CSS rules the frame inserted at
+runtime. Both come from standard browser APIs, so the script measures any
+build of the frontend: build the commit before a change, run, then build
+the change and run again.
+
+Requires a built frontend (`npm run build` in `frontend/`) and Playwright
+(`pip install playwright && playwright install chromium`).
+
+Usage:
+    python benchmarks/first_paint.py [--cards 30] [--styled]
+"""
+import argparse
+import os
+import socket
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import urllib.request
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sys.exit(
+        "This benchmark needs Playwright: "
+        "pip install playwright && playwright install chromium"
+    )
+
+APP = string.Template(
+    textwrap.dedent(
+        """
+    import streamlit as st
+    from streamlit_product_card import product_card
+
+    STYLES = {"card": {"border-radius": "4px"}, "button": {"color": "#000"}}
+
+    for i in range($cards):
+        product_card(
+            product_name=f"Product {i}",
+            description="Soft cotton, machine washable",
+            price=f"€{i}.99",
+            button_text="Add to Cart",
+            picture_position=("top", "left", "right", "bottom")[i % 4],
+            mobile_breakpoint_behavior="stack top",
+            styles=STYLES if $styled else None,
+            key=f"card_{i}",
+        )
+    """
+    )
+)
+
+# Runs inside each card frame.
+FRAME_METRICS = """
+() => {
+  const paint = performance.getEntriesByName("first-contentful-paint")[0];
+  let runtimeRules = 0;
+  document.querySelectorAll("style").forEach(style => {
+    if (style.sheet) runtimeRules += style.sheet.cssRules.length;
+  });
+  return { firstPaint: paint ? paint.startTime : null, runtimeRules };
+}
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_healthy(port: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/_stcore/health")
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def measure(cards: int, styled: bool) -> list:
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "cards.py")
+        with open(script, "w") as f:
+            f.write(APP.substitute(cards=cards, styled=styled))
+        port = _free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "streamlit",
+                "run",
+                script,
+                "--server.headless",
+                "true",
+                "--server.port",
+                str(port),
+                "--browser.gatherUsageStats",
+                "false",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_until_healthy(port)
+            with sync_playwright() as p:
+                browser = p.chromium.launch()
+                page = browser.new_page()
+                page.goto(f"http://localhost:{port}")
+                page.wait_for_function(
+                    f"document.querySelectorAll('iframe').length >= {cards}",
+                    timeout=60000,
+                )
+                frames = [f for f in page.frames if "/component/" in f.url]
+                for frame in frames:
+                    frame.wait_for_selector(".pc-card, button, h3")
+                time.sleep(1)  # Let late paints settle
+                metrics = [frame.evaluate(FRAME_METRICS) for frame in frames]
+                browser.close()
+            return metrics
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=30)
+    parser.add_argument(
+        "--styled",
+        action="store_true",
+        help="Give every card a `styles` override, not the default look.",
+    )
+    args = parser.parse_args()
+
+    metrics = measure(args.cards, args.styled)
+    paints = sorted(m["firstPaint"] for m in metrics if m["firstPaint"])
+    rules = [m["runtimeRules"] for m in metrics]
+    p95 = paints[max(0, round(0.95 * len(paints)) - 1)]
+    print(
+        f"{len(metrics)} card frames: first paint median "
+        f"{statistics.median(paints):.1f} ms, p95 {p95:.1f} ms; "
+        f"{statistics.mean(rules):.1f} CSS rules inserted at runtime per frame"
+    )
+
+
+if __name__ == "__main__":
+    main()
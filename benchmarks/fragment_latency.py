@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Measures click-to-update latency on a 200-card page with full-app reruns
+and with `fragment=True`.
+
+Starts `streamlit run` on a generated storefront app whose script spends
+`--inventory-ms` loading "inventory" before drawing its cards, then talks to
+the server over its websocket like a browser would: each simulated click
+sends the card's component value (with the fragment id in fragment mode)
+and the latency is the time until the server reports the rerun finished.
+Browser rendering time is not included.
+
+Requires a built frontend (`npm run build` in `frontend/`) and the
+`websockets` package.
+
+Usage:
+    python benchmarks/fragment_latency.py [--cards 200] [--clicks 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+APP = string.Template(
+    textwrap.dedent(
+        """
+    import time
+
+    import streamlit as st
+    from streamlit_product_card import product_card
+
+    time.sleep($inventory_ms / 1000)  # Inventory query
+    st.title("Storefront")
+
+    for i in range($cards):
+        product_card(
+            product_name=f"Product {i}",
+            description="Soft cotton, machine washable",
+            price=f"€{i}.99",
+            button_text="Add to Cart",
+            on_button_click=lambda: st.success("Added to cart"),
+            fragment=$fragment,
+            key=f"card_{i}",
+        )
+    """
+    )
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_healthy(port: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/_stcore/health")
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+async def _run(ws, client_state) -> tuple:
+    """Sends a rerun request; returns (seconds, bytes received, elements)."""
+    msg = BackMsg()
+    msg.rerun_script.CopyFrom(client_state)
+    start = time.perf_counter()
+    await ws.send(msg.SerializeToString())
+    received = 0
+    elements = []
+    while True:
+        data = await ws.recv()
+        received += len(data)
+        forward_msg = ForwardMsg()
+        forward_msg.ParseFromString(data)
+        kind = forward_msg.WhichOneof("type")
+        if kind == "delta":
+            delta = forward_msg.delta
+            element = delta.new_element
+            if element.WhichOneof("type") == "component_instance":
+                elements.append(
+                    (element.component_instance.id, delta.fragment_id)
+                )
+        elif kind == "script_finished":
+            return time.perf_counter() - start, received, elements
+
+
+async def _measure(port: int, fragment: bool, clicks: int) -> tuple:
+    async with websockets.connect(
+        f"ws://localhost:{port}/_stcore/stream",
+        subprotocols=["streamlit"],
+        max_size=None,
+    ) as ws:
+        initial = BackMsg().rerun_script
+        _, _, cards = await _run(ws, initial)
+
+        latencies = []
+        sizes = []
+        for seq in range(1, clicks + 1):
+            widget_id, fragment_id = cards[(seq * 37) % len(cards)]
+            client_state = BackMsg().rerun_script
+            widget = client_state.widget_states.widgets.add()
+            widget.id = widget_id
+            widget.json_value = json.dumps(
+                {
+                    "instanceId": "benchmark",
+                    "events": [{"seq": seq, "timestamp": time.time() * 1000}],
+                }
+            )
+            if fragment:
+                client_state.fragment_id = fragment_id
+            seconds, received, _ = await _run(ws, client_state)
+            latencies.append(seconds)
+            sizes.append(received)
+        return latencies, sizes
+
+
+def measure(
+    cards: int, clicks: int, inventory_ms: int, fragment: bool
+) -> tuple:
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "storefront.py")
+        with open(script, "w") as f:
+            f.write(
+                APP.substitute(
+                    cards=cards, inventory_ms=inventory_ms, fragment=fragment
+                )
+            )
+        port = _free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "streamlit",
+                "run",
+                script,
+                "--server.headless",
+                "true",
+                "--server.port",
+                str(port),
+                "--browser.gatherUsageStats",
+                "false",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_until_healthy(port)
+            return asyncio.run(_measure(port, fragment, clicks))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--clicks", type=int, default=20)
+    parser.add_argument("--inventory-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    for label, fragment in (("full rerun", False), ("fragment", True)):
+        latencies, sizes = measure(
+            args.cards, args.clicks, args.inventory_ms, fragment
+        )
+        latencies_ms = sorted(1000 * s for s in latencies)
+        p95 = latencies_ms[max(0, round(0.95 * len(latencies_ms)) - 1)]
+        print(
+            f"{label:>10}: median {statistics.median(latencies_ms):7.1f} ms, "
+            f"p95 {p95:7.1f} ms, "
+            f"{statistics.mean(sizes) / 1024:7.1f} KB sent per click"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Measures what importing `streamlit_product_card` costs when it isn't used.
+
+Runs `python -X importtime -c "import streamlit_product_card"` in fresh
+interpreters and reports the median of:
+
+- the package's own module bodies (self time of `streamlit_product_card.*`),
+- everything the import pulls in (the package's cumulative time),
+- `import streamlit_product_card, streamlit`, i.e. the cost once the
+  package is actually used, for comparison,
+
+and lists the heaviest modules imported on the package's behalf. A warm-up
+run writes bytecode caches first, so compilation is not counted.
+
+Usage:
+    python benchmarks/import_time.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE = "streamlit_product_card"
+
+
+def _importtime(code: str) -> list:
+    """Returns (module, self µs, cumulative µs, depth) for each import."""
+    env = {
+        k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def _package_import(imports: list) -> tuple:
+    """Returns (own self µs, cumulative µs, modules imported under it)."""
+    own = sum(s for name, s, _, _ in imports if name.split(".")[0] == PACKAGE)
+    top = [i for i, entry in enumerate(imports) if entry[0] == PACKAGE][0]
+    # importtime prints children before their parent, deeper indented.
+    children = []
+    for name, self_us, _, depth in reversed(imports[:top]):
+        if depth <= imports[top][3]:
+            break
+        children.append((name, self_us))
+    return own, imports[top][2], children
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    _importtime(f"import {PACKAGE}")  # Warm-up: writes bytecode caches.
+    own, cumulative, with_streamlit = [], [], []
+    children: list = []
+    for _ in range(args.runs):
+        run_own, run_cumulative, children = _package_import(
+            _importtime(f"import {PACKAGE}")
+        )
+        own.append(run_own)
+        cumulative.append(run_cumulative)
+        with_streamlit.append(
+            sum(
+                c
+                for name, _, c, _ in _importtime(
+                    f"import {PACKAGE}, streamlit"
+                )
+                if name in (PACKAGE, "streamlit")
+            )
+        )
+
+    for label, times in (
+        ("package modules (self)", own),
+        (f"import {PACKAGE}", cumulative),
+        (f"import {PACKAGE}, streamlit", with_streamlit),
+    ):
+        print(f"{label:<42} {statistics.median(times) / 1000:7.1f} ms")
+    loaded = {name.split(".")[0] for name, _ in children}
+    print(f"streamlit imported: {'yes' if 'streamlit' in loaded else 'no'}")
+    print("heaviest modules imported by the package:")
+    for name, self_us in sorted(children, key=lambda c: -c[1])[:8]:
+        print(f"  {name:<40} {self_us / 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
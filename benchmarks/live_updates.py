@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Compares `push_card_updates` with full reruns for changing card prices.
+
+Renders a page of `--cards` keyed product cards (or one grid of them) in
+AppTest, then changes the price and stock of `--batch` random cards per
+step, `--steps` times:
+
+- "rerun": the whole page is rendered again with the new values, as an
+  app without live updates would do,
+- "push": only a `push_card_updates` call runs, as in a fragment with
+  `run_every`; the cards themselves are not rerun.
+
+Reports the Python time per step, the updates per second that makes
+possible, and the bytes of component args sent per step. Applying a batch
+in the browser touches only the frames and cards it names, which AppTest
+can't measure.
+
+Usage:
+    python benchmarks/live_updates.py [--cards 300] [--batch 50]
+        [--steps 20] [--mode cards|grid]
+"""
+import argparse
+import random
+import statistics
+import string
+import textwrap
+
+from streamlit.testing.v1 import AppTest
+
+APP = string.Template(
+    textwrap.dedent(
+        """
+    import time
+
+    import streamlit as st
+    from streamlit_product_card import (
+        product_card,
+        product_grid,
+        push_card_updates,
+    )
+
+    prices = st.session_state.setdefault("prices", {})
+    batch = st.session_state.get("batch", {})
+    start = time.perf_counter()
+    if st.session_state.get("push_only"):
+        push_card_updates(
+            {
+                key: {"price": price, "stock": "Low stock"}
+                for key, price in batch.items()
+            }
+        )
+    else:
+        prices.update(batch)
+        products = [
+            dict(
+                key=f"sku_{i}",
+                product_name=f"Product {i}",
+                description=["Soft cotton", "Machine washable"],
+                price=prices.get(f"sku_{i}", f"€{i}.99"),
+                stock="Low stock" if f"sku_{i}" in prices else None,
+                product_image=f"https://example.com/img/{i}.jpg",
+                button_text="Add to Cart",
+            )
+            for i in range($cards)
+        ]
+        if "$mode" == "cards":
+            for product in products:
+                product_card(**product)
+        else:
+            product_grid(products, key="grid")
+    st.session_state["seconds"] = time.perf_counter() - start
+    """
+    )
+)
+
+
+def _args_bytes(at: AppTest) -> int:
+    return sum(
+        len(e.proto.json_args)
+        for e in at.main
+        if hasattr(e.proto, "json_args")
+    )
+
+
+def measure(
+    cards: int, batch_size: int, steps: int, mode: str, push: bool
+) -> dict:
+    at = AppTest.from_string(
+        APP.substitute(cards=cards, mode=mode), default_timeout=600
+    )
+    at.run()
+    rng = random.Random(0)
+    seconds, sizes = [], []
+    for step in range(steps):
+        keys = rng.sample(range(cards), batch_size)
+        at.session_state["batch"] = {
+            f"sku_{i}": f"€{step}.{i % 100:02d}" for i in keys
+        }
+        at.session_state["push_only"] = push
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        seconds.append(at.session_state["seconds"])
+        sizes.append(_args_bytes(at))
+    step_s = statistics.median(seconds)
+    return {
+        "step_ms": 1000 * step_s,
+        "updates_per_s": batch_size / step_s,
+        "bytes": statistics.median(sizes),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=300)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--mode", choices=["cards", "grid"], default="cards")
+    args = parser.parse_args()
+
+    print(f"{'':<6} {'ms/step':>9} {'updates/s':>10} {'KB/step':>9}")
+    for label, push in (("rerun", False), ("push", True)):
+        r = measure(args.cards, args.batch, args.steps, args.mode, push)
+        print(
+            f"{label:<6} {r['step_ms']:9.2f} {r['updates_per_s']:10.0f} "
+            f"{r['bytes'] / 1024:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
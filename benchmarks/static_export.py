@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Measures `export_product_cards_html` on a large catalog.
+
+Exports `--products` products to a temporary directory, then exports the
+catalog again three times:
+
+- "full": the first export, rendering every product,
+- "unchanged": nothing changed, so only digests are computed,
+- "changed": `--changed` percent of the prices changed,
+- "changed, 1 process": the same, rendering in this process only.
+
+Reports the time of each export and how many products it rendered.
+
+Usage:
+    python benchmarks/static_export.py [--products 50000] [--changed 1]
+        [--processes N]
+"""
+import argparse
+import random
+import tempfile
+
+from streamlit_product_card import export_product_cards_html
+
+
+def catalog(size: int) -> list:
+    return [
+        dict(
+            key=f"sku_{i}",
+            product_name=f"Product {i}",
+            description=["Soft cotton", "Machine washable"],
+            price=f"€{i % 500}.99",
+            product_image=f"https://example.com/img/{i}.jpg",
+            button_text="Add to Cart",
+            button_url=f"https://example.com/p/{i}",
+            picture_position=("top", "left", "right")[i % 3],
+            mobile_breakpoint_behavior="stack top",
+            styles={"card": {"border-radius": 8}},
+        )
+        for i in range(size)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--changed", type=float, default=1.0)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    products = catalog(args.products)
+    rng = random.Random(0)
+    changes = int(args.products * args.changed / 100)
+
+    def change_prices() -> None:
+        for i in rng.sample(range(args.products), changes):
+            products[i]["price"] = f"€{rng.randint(1, 999)}.49"
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        print(f"{'':<20} {'seconds':>8} {'rendered':>9}")
+        for label, prepare, processes in (
+            ("full", None, args.processes),
+            ("unchanged", None, args.processes),
+            ("changed", change_prices, args.processes),
+            ("changed, 1 process", change_prices, 1),
+        ):
+            if prepare:
+                prepare()
+            stats = export_product_cards_html(
+                products, out_dir, processes=processes
+            )
+            print(f"{label:<20} {stats.seconds:8.2f} {stats.rendered:9d}")
+
+
+if __name__ == "__main__":
+    main()
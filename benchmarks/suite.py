@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Headless benchmark suite for `product_card` and `product_grid`.
+
+Renders pages of 1, 100, 1,000 and 10,000 cards in AppTest, either as one
+`product_card` per product or as one `product_grid`, and measures per size:
+
+- Python time spent in the component calls, per call and per card,
+- the whole script run, as AppTest sees it,
+- serialized component args per rerun (JSON plus Arrow bytes),
+- the card tracking state held by the session, after the first run and
+  after the simulated clicks,
+- peak Python memory allocated during a rerun (traced separately, since
+  tracing slows the run down),
+- a rerun with `--clicks` simulated clicks, injected as component values
+  the way the browser sends them, and how many of them Python received.
+
+Everything runs in-process and offline. Results are printed as a table
+and, with `--output`, written as JSON together with the package, Streamlit
+and Python versions, so runs can be compared across releases.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1 100 1000 10000] [--modes cards grid]
+        [--reruns 3] [--clicks 10] [--output results.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import string
+import textwrap
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import streamlit
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from streamlit.testing.v1 import AppTest
+
+APP = string.Template(
+    textwrap.dedent(
+        """
+    import time
+
+    import streamlit as st
+    from streamlit_product_card import (
+        card_state_info,
+        product_card,
+        product_grid,
+    )
+
+    products = [
+        dict(
+            key=f"sku_{i}",
+            product_name=f"Product {i}",
+            description=["Soft cotton", "Machine washable"],
+            price=f"€{i}.99",
+            product_image=f"https://example.com/img/{i % 500}.jpg",
+        )
+        for i in range($cards)
+    ]
+
+    received = 0
+    start = time.perf_counter()
+    if "$mode" == "cards":
+        for product in products:
+            received += len(product_card(button_text="Add to Cart", **product))
+    else:
+        received += len(
+            product_grid(
+                products,
+                button_text="Add to Cart",
+                virtualized=len(products) > 100,
+                key="grid",
+            )
+        )
+    seconds = time.perf_counter() - start
+
+    info = card_state_info()
+    st.session_state["benchmark"] = {
+        "seconds": seconds,
+        "received_clicks": received,
+        "state_entries": info.entries,
+        "state_bytes": info.approx_bytes,
+    }
+    """
+    )
+)
+
+
+def _component_elements(at: AppTest) -> list:
+    return [e for e in at.main if hasattr(e.proto, "json_args")]
+
+
+def _args_bytes(at: AppTest) -> int:
+    total = 0
+    for element in _component_elements(at):
+        total += len(element.proto.json_args)
+        for arg in element.proto.special_args:
+            total += len(arg.arrow_dataframe.data)
+    return total
+
+
+def _click(at: AppTest, mode: str, cards: int, clicks: int) -> None:
+    """Reruns `at` with `clicks` clicks spread over the page's cards."""
+    elements = _component_elements(at)
+    now_ms = time.time() * 1000
+    widget_states = WidgetStates()
+    if mode == "cards":
+        for n in range(min(clicks, len(elements))):
+            widget = widget_states.widgets.add()
+            widget.id = elements[(n * 7919) % len(elements)].proto.id
+            widget.json_value = json.dumps(
+                {
+                    "instanceId": "benchmark",
+                    "events": [{"seq": 1, "timestamp": now_ms}],
+                }
+            )
+    else:
+        widget = widget_states.widgets.add()
+        widget.id = elements[0].proto.id
+        widget.json_value = json.dumps(
+            {
+                "instanceId": "benchmark",
+                "events": [
+                    {
+                        "seq": n + 1,
+                        "timestamp": now_ms,
+                        "cardIndex": (n * 7919) % cards,
+                    }
+                    for n in range(clicks)
+                ],
+            }
+        )
+    # AppTest has no public API for custom component values, so the widget
+    # states are sent like the browser would send them.
+    at._run(widget_states)
+
+
+def measure(cards: int, mode: str, reruns: int, clicks: int) -> Dict[str, Any]:
+    at = AppTest.from_string(
+        APP.substitute(cards=cards, mode=mode), default_timeout=3600
+    )
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    first = at.session_state["benchmark"]
+
+    call_seconds: List[float] = []
+    run_seconds: List[float] = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        run_seconds.append(time.perf_counter() - start)
+        call_seconds.append(at.session_state["benchmark"]["seconds"])
+    args_bytes = _args_bytes(at)
+
+    tracemalloc.start()
+    at.run()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    _click(at, mode, cards, clicks)
+    click_seconds = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    clicked = at.session_state["benchmark"]
+
+    calls = cards if mode == "cards" else 1
+    call_s = statistics.median(call_seconds)
+    return {
+        "mode": mode,
+        "cards": cards,
+        "calls": calls,
+        "call_ms": 1000 * call_s / calls,
+        "card_us": 1e6 * call_s / cards,
+        "run_ms": 1000 * statistics.median(run_seconds),
+        "cards_per_s": cards / call_s,
+        "args_bytes": args_bytes,
+        "state_entries": first["state_entries"],
+        "state_bytes": first["state_bytes"],
+        "state_bytes_after_clicks": clicked["state_bytes"],
+        "peak_memory_bytes": peak_bytes,
+        "clicks_sent": clicks if mode == "grid" else min(clicks, cards),
+        "clicks_received": clicked["received_clicks"],
+        "click_run_ms": 1000 * click_seconds,
+    }
+
+
+def _package_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("streamlit-product-card")
+    except Exception:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 100, 1000, 10000]
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["cards", "grid"],
+        default=["cards", "grid"],
+    )
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--clicks", type=int, default=10)
+    parser.add_argument(
+        "--output", help="Write the results as JSON to this file."
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':>5} {'cards':>6} {'ms/call':>8} {'µs/card':>8} "
+        f"{'run ms':>8} {'args KB':>8} {'state KB':>9} {'peak MB':>8} "
+        f"{'clicks':>7} {'click ms':>9}"
+    )
+    results = []
+    for mode in args.modes:
+        for cards in args.sizes:
+            r = measure(cards, mode, args.reruns, args.clicks)
+            results.append(r)
+            print(
+                f"{mode:>5} {cards:>6} {r['call_ms']:8.3f} "
+                f"{r['card_us']:8.1f} {r['run_ms']:8.1f} "
+                f"{r['args_bytes'] / 1024:8.1f} "
+                f"{r['state_bytes_after_clicks'] / 1024:9.1f} "
+                f"{r['peak_memory_bytes'] / 2**20:8.1f} "
+                f"{r['clicks_received']:>3}/{r['clicks_sent']:<3} "
+                f"{r['click_run_ms']:9.1f}"
+            )
+
+    if args.output:
+        report = {
+            "package_version": _package_version(),
+            "streamlit_version": streamlit.__version__,
+            "python_version": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the component-arg bytes sent per rerun for a page of cards that
+all share one brand look, passed inline as `styles` or as a registered
+theme.
+
+Usage:
+    python benchmarks/theme_payload.py [--cards 300]
+"""
+import argparse
+import string
+import textwrap
+
+from streamlit.testing.v1 import AppTest
+
+APP = string.Template(
+    textwrap.dedent(
+        """
+    from streamlit_product_card import product_card, register_card_theme
+
+    STYLES = {
+        "card": {"background-color": "#F4E0C2", "border-radius": "12px",
+                 "box-shadow": "0 4px 8px rgba(0,0,0,0.1)"},
+        "title": {"font-family": "'Bodoni Moda', serif", "font-size": "1.6em",
+                  "font-weight": "bold", "color": "#141413"},
+        "text": {"font-family": "'Montserrat', sans-serif",
+                 "font-size": "0.9em", "color": "#141413"},
+        "price": {"font-family": "'Montserrat', sans-serif",
+                  "font-size": "1.2em", "font-weight": "bold",
+                  "color": "#141413"},
+        "button": {"font-family": "'Montserrat', sans-serif",
+                   "background-color": "#141413", "color": "#F4E0C2"},
+    }
+    FONT_URL = (
+        "https://fonts.googleapis.com/css2?family=Bodoni+Moda"
+        "&family=Montserrat&display=swap"
+    )
+    register_card_theme("brand", STYLES, font_url=FONT_URL)
+
+    for i in range($cards):
+        if $use_theme:
+            look = dict(theme="brand")
+        else:
+            look = dict(styles=STYLES, font_url=FONT_URL)
+        product_card(
+            product_name=f"Product {i}",
+            price=f"€{i}.99",
+            button_text="Add to Cart",
+            key=f"card_{i}",
+            **look,
+        )
+    """
+    )
+)
+
+
+def _args_bytes(at: AppTest) -> int:
+    return sum(
+        len(element.proto.json_args)
+        for element in at.main
+        if hasattr(element.proto, "json_args")
+    )
+
+
+def measure(cards: int, use_theme: bool) -> list:
+    at = AppTest.from_string(APP.substitute(cards=cards, use_theme=use_theme))
+    sizes = []
+    for _ in range(2):
+        at.run(timeout=60)
+        sizes.append(_args_bytes(at))
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=300)
+    cards = parser.parse_args().cards
+
+    for label, use_theme in (("inline styles", False), ("theme", True)):
+        first, rerun = measure(cards, use_theme)
+        print(
+            f"{label:>14}: first run {first:>9,} B, "
+            f"rerun {rerun:>9,} B ({rerun / cards:,.0f} B/card)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 import setuptools
 
 with open("README.md", "r", encoding="utf-8") as fh:
@@ -23,4 +24,5 @@ setuptools.setup(
     ],
     python_requires=">=3.8",
     install_requires=["streamlit>=1.0"],
-)
\ No newline at end of file
+    extras_require={"images": ["Pillow>=9.1"]},
+)
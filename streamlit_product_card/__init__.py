@@ -1,103 +1,468 @@
 # -*- coding: utf-8 -*-
-import os
-from typing import Any, Callable, Dict, List, Optional, Union
-import streamlit as st # Import streamlit
-import streamlit.components.v1 as components
-
-_RELEASE = True
-_COMPONENT_NAME = "streamlit_product_card"
-
-if _RELEASE:
-    root_dir = os.path.dirname(os.path.abspath(__file__))
-    build_dir = os.path.join(root_dir, "frontend", "build")
-    _component = components.declare_component(_COMPONENT_NAME, path=build_dir)
-else:
-    _component = components.declare_component(
-        _COMPONENT_NAME, url="http://localhost:3000" # Adjust port
-    )
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from ._core import (
+    _CARD_FIELDS,
+    _check_transport,
+    _component,
+    _encoded_card,
+    _grid_cards,
+    _grid_payload,
+    _grid_state,
+    _in_fragment,
+    _is_new_event,
+    _render_grid,
+)
+from .background import (
+    ClickTask,
+    _dispatch_click,
+    _pending_tasks,
+    _poll_ms,
+    click_task,
+    configure_click_workers,
+)
+from .catalog import ProductCatalog, ProductSpec
+from .dataframe import product_cards_from_dataframe
+from .events import ClickEvent, _click_acks, _take_new_clicks
+from .feed import product_feed
+from .fonts import register_card_font
+from .images import configure_image_cache
+from .instrumentation import (
+    CardMetrics,
+    _recorder,
+    log_card_metrics,
+    set_card_metrics_hook,
+)
+from .live import _live_values, push_card_updates
+from .search import CatalogView, catalog_view
+from .state import (
+    CardStateInfo,
+    _card_state,
+    _live_used,
+    card_state_info,
+    configure_card_state,
+)
+from .static import (
+    ExportStats,
+    export_product_cards_html,
+    product_card_css,
+    render_product_card_html,
+)
+from .themes import (
+    _forget_sent_themes,
+    _theme_body_if_carrier,
+    get_card_theme,
+    register_card_theme,
+)
+
+__all__ = [
+    "CardMetrics",
+    "CardStateInfo",
+    "CatalogView",
+    "ClickEvent",
+    "ClickTask",
+    "ExportStats",
+    "ProductCatalog",
+    "ProductSpec",
+    "card_state_info",
+    "catalog_view",
+    "click_task",
+    "configure_card_state",
+    "configure_click_workers",
+    "configure_image_cache",
+    "export_product_cards_html",
+    "log_card_metrics",
+    "product_card",
+    "product_card_css",
+    "product_cards_from_dataframe",
+    "product_feed",
+    "product_grid",
+    "push_card_updates",
+    "register_card_font",
+    "register_card_theme",
+    "render_product_card_html",
+    "set_card_metrics_hook",
+]
 
 
 def product_card(
-    product_name: str,
+    product_name: Union[str, ProductSpec],
     description: Optional[Union[str, List[str]]] = None,
     price: Optional[Union[str, float]] = None,
     product_image: Optional[str] = None,
-    button_text: Optional[str] = None, 
-    picture_position: str = "top",      
+    button_text: Optional[str] = None,
+    picture_position: str = "top",
     enable_animation: bool = True,
     font_url: Optional[str] = None,
-    image_width_percent: Optional[int] = 30, 
-    image_aspect_ratio: str = "native", 
-    image_object_fit: str = "cover",    
-    mobile_breakpoint_behavior: str = "none", 
+    image_width_percent: Optional[int] = 30,
+    image_aspect_ratio: str = "native",
+    image_object_fit: str = "cover",
+    mobile_breakpoint_behavior: str = "none",
     on_button_click: Optional[Callable[[], Any]] = None,
     styles: Optional[Dict[str, Dict[str, Any]]] = None,
+    optimize_image: bool = False,
+    theme: Optional[str] = None,
+    stock: Optional[Union[str, int]] = None,
+    image_placeholder: Optional[str] = None,
+    image_load_margin: Optional[int] = 200,
+    fragment: bool = False,
+    background: bool = False,
     key: Optional[str] = None,
-) -> bool:
+) -> List[ClickEvent]:
     """
-    Renders a product card. (Docstring content remains similar, focusing on props)
-    ...
+    Renders a product card.
+
+    Args:
+        product_name: The card's title. Can also be a `ProductSpec`, e.g. a
+            row of a `ProductCatalog`: its fields fill the arguments left at
+            None, and its `key` becomes the card's key unless one is given.
+        description: A string, or a list of strings rendered one per line.
+        price: The price, shown as given; numbers are converted with `str()`.
+        product_image: URL or local path of the product image.
+        button_text: Text of the button. Without it no button is rendered
+            and the whole card is clickable.
+        picture_position: Where the image goes: `"top"`, `"bottom"`,
+            `"left"` or `"right"`.
+        enable_animation: If True, the card scales on hover and click.
+        font_url: URL of a font stylesheet, e.g. from Google Fonts. A font
+            registered with `register_card_font` is served by the app.
+        image_width_percent: Width of the image, in percent of the card,
+            when `picture_position` is `"left"` or `"right"`.
+        image_aspect_ratio: `"native"`, or a CSS aspect ratio such as
+            `"1/1"` or `"16/9"`.
+        image_object_fit: CSS `object-fit` of the image, e.g. `"cover"` or
+            `"contain"`.
+        mobile_breakpoint_behavior: What a horizontal card does on viewports
+            of 600px or less: `"stack top"`, `"stack bottom"`, `"shrink"`
+            or `"none"`.
+        on_button_click: Called once per click, on the button if there is
+            one and on the card otherwise.
+        styles: CSS per slot (`"card"`, `"title"`, `"text"`, `"price"`,
+            `"stock"`, `"button"`, `"image"`), with kebab-case property
+            names.
+        optimize_image: If True, `product_image` is resized once to the
+            card's layout and served as WebP and JPEG variants with a
+            `srcset`. Requires Pillow.
+        theme: Name of a theme registered with `register_card_theme`. Its
+            `styles` and `font_url` apply underneath the card's own, and
+            its body is sent to the browser once per page.
+        stock: Text of a stock badge shown under the price, e.g.
+            `"Only 3 left"`.
+        image_placeholder: `"color"` or `"blur"` shows the image's average
+            color or a blurred thumbnail until the image loads, at the
+            image's size so nothing moves when it arrives. Requires Pillow.
+        image_load_margin: The image loads once the card is within this
+            many pixels of the viewport. None loads it right away.
+        fragment: If True, the card runs in a Streamlit fragment: a click
+            reruns only the card and `on_button_click`, and anything the
+            callback draws appears in the card's place. Clicks then reach
+            Python only through `on_button_click`.
+        background: If True, `on_button_click` runs in a worker thread (or,
+            for a coroutine function, an event loop thread) instead of
+            during the rerun, one task at a time per card. The card shows a
+            pending state until it finishes, and `click_task(key)` reports
+            its outcome on later runs.
+        key: A unique key for the component. It keeps the card's click
+            tracking across reruns, and `push_card_updates` addresses the
+            card by it.
+
     Returns:
-        bool: True if the on_button_click callback was invoked in the current run 
-              due to a new click event, False otherwise.
+        List[ClickEvent]: The clicks on this card received since the previous
+        run, oldest first, each delivered exactly once even when several
+        happen between two reruns. A `ClickEvent` has the click's `seq` in
+        the card's click sequence and its browser `timestamp` in seconds
+        since the epoch. `on_button_click` is called once per event. Empty,
+        and therefore falsy, if there were none.
     """
-    if description is None:
-        desc_list: List[str] = []
-    else:
-        desc_list = description if isinstance(description, list) else [description]
-    price_str = "" if price is None else str(price)
-    
-    current_button_text = button_text if button_text is not None else ""
-    current_styles = styles if styles is not None else {}
-    current_image_width_percent = 30 
-    if image_width_percent is not None:
-        current_image_width_percent = image_width_percent
-
-    # Ensure a unique session state key if the component key is provided
-    # If no key is provided by the user, this event handling might not be instance-specific
-    # which could be problematic for multiple cards without keys.
-    # Streamlit generally requires keys for input elements to maintain state.
-    # For robust event handling per card, a unique `key` prop is highly recommended.
-    session_event_key = None
-    if key:
-        session_event_key = f"__product_card_{key}_last_event_id"
-    elif product_name: # Fallback to product_name if no key, less ideal
-        session_event_key = f"__product_card_{product_name}_last_event_id"
-
-
-    component_value = _component(
-        productName=product_name,
-        description=desc_list,
-        price=price_str,
-        productImage=product_image,
-        buttonText=current_button_text,
-        picturePosition=picture_position,
-        enableAnimation=enable_animation,
-        fontUrl=font_url,
-        imageWidthPercent=current_image_width_percent,
-        imageAspectRatio=image_aspect_ratio,
-        imageObjectFit=image_object_fit,
-        mobileBreakpointBehavior=mobile_breakpoint_behavior,
-        styles=current_styles, 
-        key=key, # Pass the key to the component for Streamlit to manage its instance
-        default={"clickEventId": None}, # Default value for our event tracking
+    if isinstance(product_name, ProductSpec):
+        spec = product_name
+        product_name = spec.product_name
+        description = spec.description if description is None else description
+        price = spec.price if price is None else price
+        product_image = (
+            spec.product_image if product_image is None else product_image
+        )
+        button_text = spec.button_text if button_text is None else button_text
+        styles = spec.styles if styles is None else styles
+        theme = spec.theme if theme is None else theme
+        stock = spec.stock if stock is None else stock
+        if key is None and spec.key is not None:
+            key = str(spec.key)
+    if fragment:
+        return (
+            _in_fragment(product_card)(
+                product_name,
+                description=description,
+                price=price,
+                product_image=product_image,
+                button_text=button_text,
+                picture_position=picture_position,
+                enable_animation=enable_animation,
+                font_url=font_url,
+                image_width_percent=image_width_percent,
+                image_aspect_ratio=image_aspect_ratio,
+                image_object_fit=image_object_fit,
+                mobile_breakpoint_behavior=mobile_breakpoint_behavior,
+                on_button_click=on_button_click,
+                styles=styles,
+                optimize_image=optimize_image,
+                theme=theme,
+                stock=stock,
+                image_placeholder=image_placeholder,
+                image_load_margin=image_load_margin,
+                background=background,
+                key=key,
+            )
+            or []
+        )
+
+    recorder = _recorder("product_card", key or product_name)
+    live_values = _live_values().get(key) if key else None
+    if live_values:
+        _live_used([key])
+    # The props travel as one JSON string: Streamlit inspects every dict or
+    # list argument for dataframes, which costs more than encoding it.
+    card_json = _encoded_card(
+        dict(
+            product_name=product_name,
+            description=description,
+            price=price,
+            product_image=product_image,
+            button_text=button_text,
+            picture_position=picture_position,
+            enable_animation=enable_animation,
+            font_url=font_url,
+            image_width_percent=image_width_percent,
+            image_aspect_ratio=image_aspect_ratio,
+            image_object_fit=image_object_fit,
+            mobile_breakpoint_behavior=mobile_breakpoint_behavior,
+            styles=styles,
+            optimize_image=optimize_image,
+            theme=theme,
+            stock=stock,
+            image_placeholder=image_placeholder,
+            image_load_margin=image_load_margin,
+        ),
+        live_key=key or None,
+        live_values=live_values,
     )
+    # Click tracking is per frame instance, so cards sharing a name (or a
+    # missing key) no longer swallow each other's clicks; a `key` still
+    # keeps the tracking slot stable across reruns.
+    card_id = f"card:{key or product_name}"
+    card_state = _card_state(card_id)
+
+    args: Dict[str, Any] = {"card": card_json}
+    if theme is not None:
+        theme_body = _theme_body_if_carrier(get_card_theme(theme), card_id)
+        if theme_body is not None:
+            args["themeBody"] = theme_body
+
+    if background:
+        args["pending"] = bool(_pending_tasks(card_state))
+        args["pollMs"] = _poll_ms()
+    if key or background:
+        # Without a key the frame's identity is derived from its args, so
+        # changing acks would remount it; unkeyed frames keep their queue
+        # and Python still drops events it has already handled. Background
+        # cards need them to end the pending state a click starts.
+        args["acks"] = _click_acks(card_state)
+
+    if recorder is not None:
+        recorder.mark("build")
+        recorder.component_args(args)
+    component_value = (
+        _component(
+            **args,
+            key=key,  # Pass the key to the component for Streamlit to manage its instance
+            default=None,
+        )
+        or {}
+    )
+    if recorder is not None:
+        recorder.mark("component")
+        recorder.component_value(component_value, card_state)
+
+    # The frame couldn't find a theme body (e.g. sessionStorage is blocked):
+    # send it again with the next card that uses it.
+    missing_themes = component_value.get("missingThemeIds")
+    if missing_themes and _is_new_event(
+        card_state, "theme_request", component_value.get("themeRequestId")
+    ):
+        import streamlit as st
+
+        _forget_sent_themes(missing_themes)
+        st.rerun()
 
-    clicked_in_this_run = False
-    new_event_id = component_value.get("clickEventId")
+    clicks = [
+        ClickEvent(event["seq"], event["timestamp"] / 1000)
+        for event in _take_new_clicks(component_value, card_state)
+    ]
+    if recorder is not None:
+        recorder.mark("clicks")
+    if on_button_click:
+        for _ in clicks:
+            if background:
+                _dispatch_click(on_button_click, card_state)
+            else:
+                on_button_click()
+    if recorder is not None:
+        recorder.mark("callback")
+        recorder.finish(len(clicks))
+    return clicks
 
-    if new_event_id is not None:
-        if session_event_key: # Only process if we have a way to track instance state
-            if st.session_state.get(session_event_key) != new_event_id:
-                st.session_state[session_event_key] = new_event_id
-                if on_button_click:
-                    on_button_click()
-                clicked_in_this_run = True
-        elif on_button_click: # Fallback for no key, but fires on every event from any such card
-            # This branch is less ideal as it doesn't distinguish card instances well without a key
-            # Consider warning the user if key is None but on_button_click is used.
-            on_button_click()
-            clicked_in_this_run = True
 
+def product_grid(
+    products: Sequence[Mapping[str, Any]],
+    columns: int = 3,
+    gap: int = 16,
+    virtualized: bool = False,
+    height: int = 600,
+    row_height: int = 420,
+    overscan_rows: int = 2,
+    key: Optional[str] = None,
+    transport: str = "json",
+    fragment: bool = False,
+    background: bool = False,
+    searchable: bool = False,
+    **card_defaults: Any,
+) -> List[ClickEvent]:
+    """
+    Renders many product cards as a responsive grid inside one component.
+
+    Every card of a `product_card` page mounts its own iframe; `product_grid`
+    sends all card specs to a single frontend instance instead, so the bundle,
+    stylesheet and Streamlit handshake are paid once per grid.
+
+    Args:
+        products: One dict per card. Keys are the `product_card` keyword
+            arguments (`product_name`, `price`, `styles`, ...), plus an
+            optional `key` identifying the product and an optional
+            `on_button_click` callback for that product. A `ProductCatalog`
+            (or any sequence of `ProductSpec`s) works as well.
+        columns: Number of cards per row. Collapses to one column on
+            viewports narrower than 600px.
+        gap: Space between cards, in pixels.
+        virtualized: If True, the grid scrolls inside a viewport of `height`
+            pixels and only the rows in or near that viewport are mounted,
+            so the DOM size stays bounded however many products are passed.
+        height: Viewport height in pixels when `virtualized` is True.
+        row_height: Fixed height of each row in pixels when `virtualized` is
+            True. Cards taller than this are clipped.
+        overscan_rows: Rows kept mounted above and below the viewport when
+            `virtualized` is True, to avoid blank rows during fast scrolling.
+        key: A unique key for the Streamlit component.
+        transport: `"json"` sends the cards as a list of dicts. `"arrow"`
+            sends them as one Arrow table, with each distinct combination of
+            layout and style fields sent once and referenced by id, and the
+            browser only decodes the cards it renders. Requires pyarrow.
+        fragment: If True, the grid runs in a Streamlit fragment, so a click
+            reruns only the grid and its callbacks instead of the whole
+            script. Clicks then reach Python only through the callbacks.
+        background: If True, callbacks run in the background as with
+            `product_card`, one task at a time per product. Clicked cards
+            show a pending state, and `click_task(key, product)` reports
+            the outcome.
+        searchable: If True, the grid has a search box, a sort menu and
+            a price range, which filter and sort the cards in the browser
+            without rerunning the script. Search matches the words of
+            product names and descriptions. `catalog_view(key)` reports the
+            selection as of the shopper's last click or search submission.
+        **card_defaults: Grid-wide defaults for any `product_card` argument,
+            including `on_button_click`. Per-product values take precedence;
+            `styles` are merged slot by slot.
+
+    Returns:
+        List[ClickEvent]: The clicks received since the previous run, oldest
+        first, each delivered exactly once. `ClickEvent.product` is the
+        clicked product's `key`, or its index in `products` if it has none.
+    """
+    unknown = set(card_defaults) - set(_CARD_FIELDS) - {"on_button_click"}
+    if unknown:
+        raise TypeError(
+            "product_grid() got unexpected keyword arguments: "
+            f"{sorted(unknown)}"
+        )
+    _check_transport(transport)
+    if fragment:
+        return (
+            _in_fragment(product_grid)(
+                products,
+                columns=columns,
+                gap=gap,
+                virtualized=virtualized,
+                height=height,
+                row_height=row_height,
+                overscan_rows=overscan_rows,
+                key=key,
+                transport=transport,
+                background=background,
+                searchable=searchable,
+                **card_defaults,
+            )
+            or []
+        )
+    recorder = _recorder("product_grid", key, len(products))
+    default_callback = card_defaults.pop("on_button_click", None)
+    cards, themes = _grid_cards(
+        products, card_defaults, columns, _live_values(), searchable=searchable
+    )
+
+    grid_state = _grid_state(key)
+    pending = None
+    if background:
+        running = _pending_tasks(grid_state)
+        pending = [
+            i
+            for i, product in enumerate(products)
+            if running and product.get("key", i) in running
+        ]
+
+    new_clicks = _render_grid(
+        _grid_payload(cards, transport),
+        themes,
+        columns=columns,
+        gap=gap,
+        virtualized=virtualized,
+        height=height,
+        row_height=row_height,
+        overscan_rows=overscan_rows,
+        key=key,
+        recorder=recorder,
+        pending=pending,
+        searchable=searchable,
+    )
 
-    return clicked_in_this_run
+    clicks: List[ClickEvent] = []
+    for event in new_clicks:
+        card_index = event.get("cardIndex")
+        if card_index is None or card_index >= len(products):
+            continue  # Stale event from a longer product list
+        product = products[card_index]
+        product_key = product.get("key", card_index)
+        callback = product.get("on_button_click", default_callback)
+        if callback:
+            if recorder is not None:
+                recorder.mark("clicks")
+            if background:
+                _dispatch_click(callback, grid_state, product_key)
+            else:
+                callback()
+            if recorder is not None:
+                recorder.mark("callback")
+        clicks.append(
+            ClickEvent(event["seq"], event["timestamp"] / 1000, product_key)
+        )
+    if recorder is not None:
+        recorder.mark("clicks")
+        recorder.finish(len(clicks))
+    return clicks
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""The component handle and the argument handling shared by all renderers."""
+import json
+import os
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .background import _poll_ms
+from .events import _click_acks, _take_new_clicks
+from .fonts import _font_args, _fonts
+from .images import placeholder_args, prepare_image_args
+from .instrumentation import _CallRecorder
+from .search import _price_value, _store_view
+from .state import _card_state, _live_used
+from .themes import get_card_theme
+
+_RELEASE = True
+_COMPONENT_NAME = "streamlit_product_card"
+
+_declared_component: Optional[Callable[..., Any]] = None
+
+
+def _component(**kwargs: Any) -> Any:
+    """Mounts the card component, declaring it with Streamlit on first use.
+
+    Declaring is deferred so that importing the package, e.g. for type hints
+    or helpers in worker processes, doesn't load Streamlit.
+    """
+    global _declared_component
+    if _declared_component is None:
+        import streamlit.components.v1 as components
+
+        if _RELEASE:
+            root_dir = os.path.dirname(os.path.abspath(__file__))
+            build_dir = os.path.join(root_dir, "frontend", "build")
+            _declared_component = components.declare_component(
+                _COMPONENT_NAME, path=build_dir
+            )
+        else:
+            _declared_component = components.declare_component(
+                _COMPONENT_NAME, url="http://localhost:3000"  # Adjust port
+            )
+    return _declared_component(**kwargs)
+
+
+# Keyword arguments of `product_card` that describe how a single card looks.
+# `product_grid` accepts any of these per product or as grid-wide defaults.
+_CARD_FIELDS = (
+    "product_name",
+    "description",
+    "price",
+    "product_image",
+    "button_text",
+    "stock",
+    "picture_position",
+    "enable_animation",
+    "font_url",
+    "image_width_percent",
+    "image_aspect_ratio",
+    "image_object_fit",
+    "mobile_breakpoint_behavior",
+    "styles",
+    "optimize_image",
+    "theme",
+    "image_placeholder",
+    "image_load_margin",
+)
+
+
+def _build_card_args(
+    product_name: str,
+    description: Optional[Union[str, List[str]]] = None,
+    price: Optional[Union[str, float]] = None,
+    product_image: Optional[str] = None,
+    button_text: Optional[str] = None,
+    stock: Optional[Union[str, int]] = None,
+    picture_position: str = "top",
+    enable_animation: bool = True,
+    font_url: Optional[str] = None,
+    image_width_percent: Optional[int] = 30,
+    image_aspect_ratio: str = "native",
+    image_object_fit: str = "cover",
+    mobile_breakpoint_behavior: str = "none",
+    styles: Optional[Dict[str, Dict[str, Any]]] = None,
+    optimize_image: bool = False,
+    theme: Optional[str] = None,
+    image_placeholder: Optional[str] = None,
+    image_load_margin: Optional[int] = 200,
+    columns: int = 1,
+    font_args: Optional[Dict[Optional[str], Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Normalizes `product_card` arguments into the props the frontend reads.
+
+    `columns` is the number of cards sharing the frame's width, used to size
+    optimized images. Renderers building many cards pass a `font_args` dict
+    to resolve each `font_url` only once.
+    """
+    if description is None:
+        desc_list: List[str] = []
+    else:
+        desc_list = (
+            description if isinstance(description, list) else [description]
+        )
+    price_str = "" if price is None else str(price)
+
+    current_button_text = button_text if button_text is not None else ""
+    current_styles = styles if styles is not None else {}
+    current_image_width_percent = 30
+    if image_width_percent is not None:
+        current_image_width_percent = image_width_percent
+
+    card_args = {
+        "productName": product_name,
+        "description": desc_list,
+        "price": price_str,
+        "productImage": product_image,
+        "buttonText": current_button_text,
+        "picturePosition": picture_position,
+        "enableAnimation": enable_animation,
+        "imageWidthPercent": current_image_width_percent,
+        "imageAspectRatio": image_aspect_ratio,
+        "imageObjectFit": image_object_fit,
+        "mobileBreakpointBehavior": mobile_breakpoint_behavior,
+        "styles": current_styles,
+        "imageLoadMargin": image_load_margin,
+    }
+    if stock is not None:
+        card_args["stock"] = str(stock)
+    if font_args is None:
+        card_args.update(_font_args(font_url))
+    else:
+        if font_url not in font_args:
+            font_args[font_url] = _font_args(font_url)
+        card_args.update(font_args[font_url])
+    if theme is not None:
+        card_args["themeId"] = get_card_theme(theme).theme_id
+    if optimize_image and product_image:
+        card_args.update(
+            prepare_image_args(
+                product_image,
+                picture_position=picture_position,
+                image_width_percent=current_image_width_percent,
+                image_aspect_ratio=image_aspect_ratio,
+                image_object_fit=image_object_fit,
+                columns=columns,
+            )
+        )
+    if image_placeholder and product_image:
+        card_args.update(
+            placeholder_args(
+                product_image,
+                image_placeholder,
+                image_aspect_ratio=image_aspect_ratio,
+                image_object_fit=image_object_fit,
+            )
+        )
+    return card_args
+
+
+def _encoded_card(
+    fields: Dict[str, Any],
+    live_key: Optional[str] = None,
+    live_values: Optional[Dict[str, str]] = None,
+) -> str:
+    """`_build_card_args(**fields)` as JSON, with `live_key` as the card's
+    `liveKey` and the `live_values` pushed to it applied.
+
+    A registered font's files are registered with the session once per run,
+    however many cards use it.
+    """
+    font_url = fields.get("font_url")
+    font_args = None
+    if font_url in _fonts:
+        font_args = {font_url: _font_args(font_url)}
+    card_args = _build_card_args(**fields, font_args=font_args)
+    if live_key is not None:
+        card_args["liveKey"] = live_key
+        card_args.update(live_values or ())
+    return json.dumps(card_args)
+
+
+def _merge_styles(
+    defaults: Optional[Dict[str, Dict[str, Any]]],
+    overrides: Optional[Dict[str, Dict[str, Any]]],
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Merges two `styles` dicts slot by slot, `overrides` winning."""
+    if not defaults:
+        return overrides
+    if not overrides:
+        return defaults
+    merged = {slot: dict(props) for slot, props in defaults.items()}
+    for slot, props in overrides.items():
+        merged.setdefault(slot, {}).update(props)
+    return merged
+
+
+_fragments: Dict[Callable[..., Any], Callable[..., Any]] = {}
+
+
+def _in_fragment(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Returns `func` as a Streamlit fragment, so interacting with the
+    components it renders reruns only `func`, not the whole script."""
+    if func not in _fragments:
+        import streamlit as st
+
+        fragment = getattr(st, "fragment", None) or getattr(
+            st, "experimental_fragment", None
+        )
+        if fragment is None:
+            raise RuntimeError(
+                "fragment=True requires Streamlit 1.33 or newer."
+            )
+        _fragments[func] = fragment(func)
+    return _fragments[func]
+
+
+def _is_new_event(
+    card_state: Dict[str, Any], name: str, event_id: Any
+) -> bool:
+    """Records `event_id` as the card's last `name` event; True if unseen."""
+    if card_state.get(name) == event_id:
+        return False
+    card_state[name] = event_id
+    return True
+
+
+# Card fields that differ from card to card. With `transport="arrow"` they
+# travel as columns of one Arrow table; the remaining fields of a card form
+# its look, sent once per distinct look and referenced by a `styleId` column.
+_ROW_FIELDS = (
+    "productName",
+    "description",
+    "price",
+    "productImage",
+    "buttonText",
+    "stock",
+    "liveKey",
+    "priceValue",
+    "productImageSrcSet",
+    "productImageSizes",
+    "productImageSources",
+    "productImagePlaceholder",
+    "productImageWidth",
+    "productImageHeight",
+)
+_TRANSPORTS = ("json", "arrow")
+
+
+def _check_transport(transport: str) -> None:
+    if transport not in _TRANSPORTS:
+        raise ValueError(
+            f"transport must be one of {_TRANSPORTS}, got {transport!r}"
+        )
+
+
+def _catalog_payload(
+    catalog: Any, looks: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Grid args for an Arrow catalog: a DataFrame of `_ROW_FIELDS` columns
+    plus `styleId`, and the looks those ids index into."""
+    catalog = catalog.reset_index(drop=True)
+    if "productImageSources" in catalog:
+        # A list of structs per row; sent as JSON text rather than as nested
+        # Arrow types, which older Arrow JS readers decode poorly.
+        catalog["productImageSources"] = [
+            json.dumps(sources) if sources else None
+            for sources in catalog["productImageSources"]
+        ]
+    return {"catalog": catalog, "looks": looks}
+
+
+def _grid_cards(
+    products: Iterable[Mapping[str, Any]],
+    card_defaults: Dict[str, Any],
+    columns: int,
+    live: Dict[str, Dict[str, str]],
+    searchable: bool = False,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Builds the card args of `products` over grid-wide `card_defaults`.
+
+    Returns the cards and the bodies of the themes they use. A product's
+    `key` becomes the card's `liveKey`, with the values pushed to it in
+    `live` applied; cards of a `searchable` grid get a `priceValue`.
+    """
+    defaults = dict(card_defaults)
+    default_styles = defaults.pop("styles", None)
+    cards: List[Dict[str, Any]] = []
+    themes: Dict[str, Dict[str, Any]] = {}
+    font_args: Dict[Optional[str], Dict[str, Any]] = {}
+    live_used: List[str] = []
+    for product in products:
+        fields = {**defaults}
+        fields.update(
+            (name, value)
+            for name, value in product.items()
+            if name in _CARD_FIELDS
+        )
+        fields["styles"] = _merge_styles(default_styles, product.get("styles"))
+        card_args = _build_card_args(
+            **fields, columns=columns, font_args=font_args
+        )
+        price = fields.get("price")
+        if "key" in product:
+            live_key = card_args["liveKey"] = str(product["key"])
+            overlay = live.get(live_key) if live else None
+            if overlay:
+                card_args.update(overlay)
+                price = overlay.get("price", price)
+                live_used.append(live_key)
+        if searchable:
+            card_args["priceValue"] = _price_value(price)
+        if "themeId" in card_args and card_args["themeId"] not in themes:
+            themes[card_args["themeId"]] = get_card_theme(
+                fields["theme"]
+            ).body()
+        cards.append(card_args)
+    _live_used(live_used)
+    return cards, themes
+
+
+def _grid_payload(
+    cards: List[Dict[str, Any]], transport: str = "json"
+) -> Dict[str, Any]:
+    """Grid args carrying `cards`, as a JSON list or as an Arrow catalog."""
+    if transport == "json":
+        return {"cards": cards}
+
+    import numpy as np
+    import pandas as pd
+
+    looks: List[Dict[str, Any]] = []
+    look_ids: Dict[Any, int] = {}
+    # Cards built from the same `styles` dict share it, so each dict is
+    # serialized once to key the looks that include it.
+    styles_keys: Dict[int, str] = {}
+    style_ids = np.empty(len(cards), dtype=np.int32)
+    for i, card in enumerate(cards):
+        look = {k: v for k, v in card.items() if k not in _ROW_FIELDS}
+        styles = look.get("styles")
+        styles_key = styles_keys.get(id(styles))
+        if styles_key is None:
+            styles_key = json.dumps(styles, sort_keys=True)
+            styles_keys[id(styles)] = styles_key
+        look_key = (styles_key,) + tuple(
+            item for item in look.items() if item[0] != "styles"
+        )
+        style_id = look_ids.setdefault(look_key, len(looks))
+        if style_id == len(looks):
+            looks.append(look)
+        style_ids[i] = style_id
+
+    columns = {
+        field: [card.get(field) for card in cards] for field in _ROW_FIELDS
+    }
+    catalog = pd.DataFrame(
+        {
+            field: values
+            for field, values in columns.items()
+            if any(value is not None for value in values)
+        }
+    )
+    catalog["styleId"] = style_ids
+    return _catalog_payload(catalog, looks)
+
+
+def _has_price_values(payload: Dict[str, Any]) -> bool:
+    if "catalog" in payload:
+        catalog = payload["catalog"]
+        return "priceValue" in catalog and bool(
+            catalog["priceValue"].notna().any()
+        )
+    if "cardColumns" in payload:
+        prices = payload["cardColumns"].get("priceValue", ())
+        return any(price is not None for price in prices)
+    return any(card.get("priceValue") is not None for card in payload["cards"])
+
+
+def _grid_state(key: Optional[str]) -> Dict[str, Any]:
+    return _card_state(f"grid:{key or ''}")
+
+
+def _render_grid(
+    payload: Dict[str, Any],
+    themes: Dict[str, Dict[str, Any]],
+    columns: int = 3,
+    gap: int = 16,
+    virtualized: bool = False,
+    height: int = 600,
+    row_height: int = 420,
+    overscan_rows: int = 2,
+    key: Optional[str] = None,
+    recorder: Optional[_CallRecorder] = None,
+    pending: Optional[List[int]] = None,
+    searchable: bool = False,
+) -> List[Dict[str, Any]]:
+    """Mounts one grid component for the cards in `payload` (see
+    `_grid_payload`) and returns its new clicks. `pending` lists the cards
+    with background callbacks still running, if the grid has any. Cards of
+    a `searchable` grid carry a `priceValue`."""
+    card_state = _grid_state(key)
+    args = dict(
+        payload,
+        themes=themes,
+        columns=columns,
+        gap=gap,
+        virtualized=virtualized,
+        height=height,
+        rowHeight=row_height,
+        overscanRows=overscan_rows,
+        acks=_click_acks(card_state) if key or pending is not None else None,
+    )
+    if pending is not None:
+        args.update(pending=pending, pollMs=_poll_ms())
+    if searchable:
+        args["search"] = {"priceRange": _has_price_values(payload)}
+    if recorder is not None:
+        recorder.mark("build")
+        recorder.component_args(args)
+    component_value = _component(**args, key=key, default=None) or {}
+    if recorder is not None:
+        recorder.mark("component")
+        recorder.component_value(component_value, card_state)
+    if searchable:
+        _store_view(component_value, card_state)
+    return _take_new_clicks(component_value, card_state)
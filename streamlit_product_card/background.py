@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Background execution of `on_button_click` callbacks.
+
+With `background=True`, a click no longer runs its callback inside the
+rerun: it is submitted to a bounded thread pool, or, for coroutine
+functions, to an event loop running in its own thread, and the rerun goes
+on rendering the page. The task is kept in the clicked card's tracking
+state, the card shows a pending state, and while any card is pending its
+frame asks for a rerun every `poll_seconds`, so the page picks up the
+outcome through `click_task` on a later run.
+
+Callbacks run outside the script thread: they can't call Streamlit
+commands, and should return their result instead of writing to
+`st.session_state`. `max_pending` caps the tasks running or queued in the
+process; clicks beyond it fail right away instead of piling up.
+
+asyncio and the thread pool are imported on the first background click,
+so apps that don't use this don't pay for importing them.
+"""
+import logging
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from .state import _session_state
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 32
+DEFAULT_TIMEOUT_SECONDS = 30.0
+DEFAULT_POLL_SECONDS = 0.5
+
+# Finished tasks remembered per card or grid, for `click_task`.
+_MAX_TASKS = 100
+
+_max_workers = DEFAULT_MAX_WORKERS
+_max_pending = DEFAULT_MAX_PENDING
+_timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS
+_poll_seconds: float = DEFAULT_POLL_SECONDS
+
+_executor: Optional["ThreadPoolExecutor"] = None
+_loop: Optional["asyncio.AbstractEventLoop"] = None
+_in_flight = 0
+_lock = threading.Lock()
+
+
+class ClickTask(NamedTuple):
+    status: str
+    """`"pending"`, `"done"` or `"error"`."""
+    result: Any
+    """What the callback returned, once `"done"`."""
+    error: Optional[BaseException]
+    """Why the task failed: the callback's exception, a `TimeoutError`, or
+    a `RuntimeError` if too many tasks were pending to start it."""
+    started: float
+    """When the click was dispatched, in seconds since the epoch."""
+
+
+class _BackgroundTask:
+    """A dispatched callback, as kept in a card's tracking state."""
+
+    __slots__ = ("future", "started", "deadline", "timed_out")
+
+    def __init__(self, future: "Future[Any]") -> None:
+        self.future = future
+        self.started = time.time()
+        self.deadline = time.monotonic() + _timeout_seconds
+        self.timed_out = False
+
+    def pending(self) -> bool:
+        if self.future.done() or self.timed_out:
+            return False
+        if time.monotonic() < self.deadline:
+            return True
+        # A running thread can't be stopped; it is abandoned, and keeps its
+        # worker until it returns. Coroutines are cancelled by `wait_for`.
+        self.future.cancel()
+        self.timed_out = True
+        return False
+
+    def info(self) -> ClickTask:
+        if self.pending():
+            return ClickTask("pending", None, None, self.started)
+        if self.timed_out or self.future.cancelled():
+            error: Optional[BaseException] = TimeoutError(
+                f"on_button_click took longer than {_timeout_seconds:g} s"
+            )
+        else:
+            error = self.future.exception()
+        if error is not None:
+            return ClickTask("error", None, error, self.started)
+        return ClickTask("done", self.future.result(), None, self.started)
+
+
+def configure_click_workers(
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+    poll_seconds: Optional[float] = None,
+) -> None:
+    """
+    Sets how `background=True` cards and grids run their callbacks.
+
+    Args:
+        max_workers: Threads running callbacks. Defaults to 4. Coroutine
+            callbacks share one event loop thread instead.
+        max_pending: Tasks running or queued in the process; further clicks
+            fail with a `RuntimeError` until some finish. Defaults to 32.
+        timeout_seconds: Tasks still running after this long are reported
+            as failed with a `TimeoutError`. Coroutines are cancelled;
+            threads can't be, and keep their worker until they return.
+            Defaults to 30 seconds.
+        poll_seconds: How often a frame with pending cards asks for a
+            rerun to pick up their outcome. Defaults to 0.5 seconds.
+    """
+    global _max_workers, _max_pending, _timeout_seconds, _poll_seconds
+    global _executor
+    with _lock:
+        workers = DEFAULT_MAX_WORKERS if max_workers is None else max_workers
+        if workers != _max_workers and _executor is not None:
+            # Queued and running tasks still complete on the old pool.
+            _executor.shutdown(wait=False)
+            _executor = None
+        _max_workers = workers
+        _max_pending = (
+            DEFAULT_MAX_PENDING if max_pending is None else max_pending
+        )
+        _timeout_seconds = (
+            DEFAULT_TIMEOUT_SECONDS
+            if timeout_seconds is None
+            else timeout_seconds
+        )
+        _poll_seconds = (
+            DEFAULT_POLL_SECONDS if poll_seconds is None else poll_seconds
+        )
+
+
+def _event_loop() -> "asyncio.AbstractEventLoop":
+    import asyncio
+
+    global _loop
+    if _loop is None:
+        loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=loop.run_forever, name="product_card_callbacks", daemon=True
+        ).start()
+        _loop = loop
+    return _loop
+
+
+async def _with_timeout(callback: Callable[[], Any], timeout: float) -> Any:
+    import asyncio
+
+    return await asyncio.wait_for(callback(), timeout)
+
+
+def _task_finished(future: "Future[Any]") -> None:
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+    if not future.cancelled() and future.exception() is not None:
+        _LOGGER.warning(
+            "Background on_button_click failed", exc_info=future.exception()
+        )
+
+
+def _submit(callback: Callable[[], Any]) -> "Future[Any]":
+    import asyncio
+    import inspect
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    global _executor, _in_flight
+    with _lock:
+        if _in_flight >= _max_pending:
+            future: "Future[Any]" = Future()
+            future.set_exception(
+                RuntimeError(
+                    f"{_max_pending} click callbacks are already pending; "
+                    "see configure_click_workers"
+                )
+            )
+            _LOGGER.warning("Click callback rejected: too many pending")
+            return future
+        _in_flight += 1
+        if inspect.iscoroutinefunction(callback):
+            future = asyncio.run_coroutine_threadsafe(
+                _with_timeout(callback, _timeout_seconds), _event_loop()
+            )
+        else:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    _max_workers, thread_name_prefix="product_card_callback"
+                )
+            future = _executor.submit(callback)
+    future.add_done_callback(_task_finished)
+    return future
+
+
+def _dispatch_click(
+    callback: Callable[[], Any],
+    card_state: Dict[str, Any],
+    task_key: Hashable = None,
+) -> None:
+    """Runs `callback` in the background for a click on `task_key` (a grid
+    product, or None for a card), unless its previous one is pending."""
+    tasks: Dict[Hashable, _BackgroundTask] = card_state.setdefault("tasks", {})
+    task = tasks.pop(task_key, None)
+    if task is None or not task.pending():
+        task = _BackgroundTask(_submit(callback))
+    tasks[task_key] = task  # Re-inserted as the most recent task
+    if len(tasks) > _MAX_TASKS:
+        finished = [k for k, t in tasks.items() if not t.pending()]
+        for k in finished[: len(tasks) - _MAX_TASKS]:
+            del tasks[k]
+
+
+def _pending_tasks(card_state: Dict[str, Any]) -> Set[Hashable]:
+    """The task keys of `card_state` whose callback is still running."""
+    return {
+        k for k, task in card_state.get("tasks", {}).items() if task.pending()
+    }
+
+
+def _poll_ms() -> int:
+    return int(1000 * _poll_seconds)
+
+
+def click_task(
+    key: str, product: Optional[Hashable] = None
+) -> Optional[ClickTask]:
+    """
+    Reports the latest background `on_button_click` task of a card.
+
+    Args:
+        key: The `key` of a `product_card` (its `product_name` if it has
+            none), or of a `product_grid` or `product_cards_from_dataframe`.
+        product: For grids, the product as in `ClickEvent.product`: its
+            `key`, or its index if it has none.
+
+    Returns:
+        Optional[ClickTask]: The task's status and outcome, or None if the
+        card hasn't been clicked with `background=True` (or its tracking
+        state was dropped).
+    """
+    card_id = f"card:{key}" if product is None else f"grid:{key or ''}"
+    entry = _session_state().entries.get(card_id)
+    task = entry.get("tasks", {}).get(product) if entry else None
+    return task.info() if task is not None else None
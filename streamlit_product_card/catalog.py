@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Compact product catalogs, built once per process and shared by sessions.
+
+An app that builds a list of product dicts in every session holds one copy
+of the catalog per session: a dict, a price, a description list and a few
+strings per product, times the number of sessions. `ProductCatalog` stores
+a catalog column by column instead. Prices are one array of floats, plus
+the text of text prices when they are shown as given, and repeated strings
+(button texts, image directories, stock texts, themes, description lines)
+are stored once and shared by the rows using them, as is each distinct
+`styles` dict. Built once, e.g. in a function cached with
+`st.cache_resource`, it is only read by the sessions using it.
+
+Its rows are `ProductSpec`s, made on access. A spec reads like a dict of its
+set fields, so catalogs and specs can be passed wherever the renderers take
+product dicts, and `product_card` takes a spec in place of `product_name`.
+"""
+import array
+import math
+from collections.abc import Mapping, Sequence
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .search import _price_value
+
+PriceFormat = Union[str, Callable[[float], str]]
+
+
+class ProductSpec(Mapping):
+    """
+    The content of one product card, in a fixed set of slots.
+
+    Layout arguments (`picture_position`, `image_aspect_ratio`, ...) aren't
+    part of a spec; renderers take them as defaults for every card. As a
+    read-only mapping of the fields that are not None, a spec can stand in
+    for a product dict.
+    """
+
+    __slots__ = (
+        "product_name",
+        "description",
+        "price",
+        "product_image",
+        "button_text",
+        "stock",
+        "theme",
+        "styles",
+        "key",
+    )
+
+    def __init__(
+        self,
+        product_name: str,
+        description: Optional[Union[str, List[str]]] = None,
+        price: Optional[Union[str, float]] = None,
+        product_image: Optional[str] = None,
+        button_text: Optional[str] = None,
+        stock: Optional[Union[str, int]] = None,
+        theme: Optional[str] = None,
+        styles: Optional[Dict[str, Dict[str, Any]]] = None,
+        key: Optional[Hashable] = None,
+    ) -> None:
+        self.product_name = product_name
+        self.description = description
+        self.price = price
+        self.product_image = product_image
+        self.button_text = button_text
+        self.stock = stock
+        self.theme = theme
+        self.styles = styles
+        self.key = key
+
+    def __getitem__(self, name: str) -> Any:
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (
+            name for name in self.__slots__ if getattr(self, name) is not None
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={self[name]!r}" for name in self)
+        return f"ProductSpec({fields})"
+
+
+_SPEC_FIELDS = frozenset(ProductSpec.__slots__)
+_STRING_FIELDS = ("button_text", "stock", "theme")
+
+
+class ProductCatalog(Sequence):
+    """
+    A read-only catalog of products stored column by column.
+
+    Args:
+        products: Product dicts (or `ProductSpec`s) with any of the fields
+            of `ProductSpec`. Layout arguments are given to the renderer
+            instead.
+        price_format: How prices are shown: a `str.format` pattern such as
+            `"€{:,.2f}"`, or a callable taking the price as a float.
+            Prices are stored as numbers, and text prices ("€1,299.00")
+            are parsed, so that searchable grids can sort and filter them.
+            By default text prices are shown as given and numbers as plain
+            numbers.
+
+    Indexing or iterating yields `ProductSpec`s, made on access, so the
+    catalog can be passed to `product_grid`, `product_feed` and
+    `export_product_cards_html` as it is, and its rows to `product_card`.
+    """
+
+    def __init__(
+        self,
+        products: Iterable[Mapping[str, Any]],
+        price_format: Optional[PriceFormat] = None,
+    ) -> None:
+        strings: Dict[str, str] = {}
+        styles_by_repr: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        def shared(text: Optional[str]) -> Optional[str]:
+            return None if text is None else strings.setdefault(text, text)
+
+        names: List[str] = []
+        descriptions: List[Optional[Tuple[str, ...]]] = []
+        prices = array.array("d")
+        price_texts: List[Optional[str]] = []
+        image_dirs: List[Optional[str]] = []
+        image_files: List[Optional[str]] = []
+        columns: Dict[str, List[Any]] = {field: [] for field in _STRING_FIELDS}
+        styles: List[Optional[Dict[str, Dict[str, Any]]]] = []
+        keys: List[Optional[Hashable]] = []
+        for product in products:
+            unknown = product.keys() - _SPEC_FIELDS
+            if unknown:
+                raise TypeError(
+                    "ProductCatalog() can't store the fields "
+                    f"{sorted(unknown)}; pass them to the renderer as "
+                    "defaults instead"
+                )
+            names.append(product["product_name"])
+            description = product.get("description")
+            if isinstance(description, str):
+                description = [description]
+            descriptions.append(
+                None
+                if description is None
+                else tuple(shared(str(line)) for line in description)
+            )
+            price = product.get("price")
+            prices.append(_as_number(price))
+            # Only shown, as given, when there's no format to apply.
+            price_texts.append(
+                price
+                if price_format is None and isinstance(price, str)
+                else None
+            )
+            image = product.get("product_image")
+            if image is None:
+                image_dirs.append(None)
+                image_files.append(None)
+            else:
+                # Images mostly share a host and directory; only the file
+                # name is stored per product.
+                directory, _, file_name = image.rpartition("/")
+                image_dirs.append(shared(directory + "/") if _ else None)
+                image_files.append(file_name)
+            for field in _STRING_FIELDS:
+                value = product.get(field)
+                columns[field].append(
+                    None if value is None else shared(str(value))
+                )
+            look = product.get("styles")
+            if look is not None:
+                look = styles_by_repr.setdefault(repr(look), look)
+            styles.append(look)
+            keys.append(product.get("key"))
+
+        self._price_format = price_format
+        self._names = tuple(names)
+        self._descriptions = _column(descriptions)
+        self._prices = prices
+        self._price_texts = _column(price_texts)
+        self._image_dirs = _column(image_dirs)
+        self._image_files = _column(image_files)
+        self._button_texts = _column(columns["button_text"])
+        self._stocks = _column(columns["stock"])
+        self._themes = _column(columns["theme"])
+        self._styles = _column(styles)
+        self._keys = _column(keys)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @overload
+    def __getitem__(self, index: int) -> ProductSpec:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ProductSpec]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ProductSpec, List[ProductSpec]]:
+        if isinstance(index, slice):
+            return [self._spec(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ProductCatalog index out of range")
+        return self._spec(index)
+
+    def __iter__(self) -> Iterator[ProductSpec]:
+        return (self._spec(i) for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"ProductCatalog({len(self)} products)"
+
+    def _spec(self, i: int) -> ProductSpec:
+        description = _at(self._descriptions, i)
+        image_file = _at(self._image_files, i)
+        return ProductSpec(
+            self._names[i],
+            description=None if description is None else list(description),
+            price=self._price_text(i),
+            product_image=(
+                None
+                if image_file is None
+                else (_at(self._image_dirs, i) or "") + image_file
+            ),
+            button_text=_at(self._button_texts, i),
+            stock=_at(self._stocks, i),
+            theme=_at(self._themes, i),
+            styles=_at(self._styles, i),
+            key=_at(self._keys, i),
+        )
+
+    def _price_text(self, i: int) -> Optional[str]:
+        value = self._prices[i]
+        if self._price_format is None:
+            text = _at(self._price_texts, i)
+            if text is not None:
+                return text
+            if math.isnan(value):
+                return None
+            return str(int(value)) if value.is_integer() else str(value)
+        if math.isnan(value):
+            return None
+        if callable(self._price_format):
+            return self._price_format(value)
+        return self._price_format.format(value)
+
+
+def _as_number(price: Any) -> float:
+    value = _price_value(price)
+    return math.nan if value is None else value
+
+
+def _column(values: List[Any]) -> Optional[Tuple[Any, ...]]:
+    """The values as a tuple, or None if none is set."""
+    return (
+        tuple(values) if any(value is not None for value in values) else None
+    )
+
+
+def _at(column: Optional[Tuple[Any, ...]], i: int) -> Any:
+    return None if column is None else column[i]
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk rendering of product cards straight from a pandas DataFrame or a
+pyarrow Table.
+
+Looping over rows and calling `product_card` per row pays Python overhead
+(and an iframe) for every product. `product_cards_from_dataframe`
+normalizes whole columns at once (text, prices, image URLs, descriptions)
+and renders the result as a single `product_grid`-style component.
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ._core import (
+    _CARD_FIELDS,
+    _ROW_FIELDS,
+    _build_card_args,
+    _catalog_payload,
+    _check_transport,
+    _grid_payload,
+    _grid_state,
+    _in_fragment,
+    _render_grid,
+)
+from .background import _dispatch_click, _pending_tasks
+from .events import ClickEvent
+from .images import placeholder_args, prepare_image_args
+from .instrumentation import _recorder
+from .live import _live_values
+from .search import _price_value, _price_values
+from .state import _live_used
+from .themes import get_card_theme
+
+# Card fields that can be read from a column, with the column name used
+# when `column_map` doesn't name one.
+_DEFAULT_COLUMN_MAP = {
+    "product_name": "product_name",
+    "description": "description",
+    "price": "price",
+    "product_image": "product_image",
+    "button_text": "button_text",
+    "stock": "stock",
+    "key": "key",
+}
+
+# "{:.2f}", "€{:,.2f}", "{:.0f} kr": formats the vectorized path handles.
+_SIMPLE_PRICE_FORMAT = re.compile(
+    r"^(?P<prefix>[^{}]*)\{:(?P<comma>,?)\.(?P<decimals>\d+)f\}"
+    r"(?P<suffix>[^{}]*)$"
+)
+
+
+def _to_pandas(data: Any, columns: List[str]) -> Any:
+    """Selects `columns` from a DataFrame or pyarrow Table as a DataFrame."""
+    import pandas as pd
+
+    if isinstance(data, pd.DataFrame):
+        return data[columns]
+    if hasattr(data, "select") and hasattr(data, "to_pandas"):  # pyarrow
+        return data.select(columns).to_pandas()
+    raise TypeError(
+        "product_cards_from_dataframe() expects a pandas DataFrame or a "
+        f"pyarrow Table, got {type(data).__name__}"
+    )
+
+
+def _text_column(series: Any, missing: Optional[str] = "") -> Any:
+    """Converts a column to Python strings, with `missing` for nulls."""
+    text = series.astype("string").astype(object)
+    return text.where(series.notna(), missing)
+
+
+def _format_prices(
+    series: Any, price_format: Optional[Union[str, Callable[[Any], str]]]
+) -> Any:
+    """Formats a price column; nulls become empty strings."""
+    import numpy as np
+    import pandas as pd
+
+    if price_format is None:
+        return _text_column(series)
+
+    numeric = pd.to_numeric(series, errors="coerce")
+    if callable(price_format):
+        formatted = numeric.map(price_format, na_action="ignore")
+        return formatted.where(numeric.notna(), "")
+
+    match = _SIMPLE_PRICE_FORMAT.match(price_format)
+    if match is None:
+        formatted = numeric.map(price_format.format, na_action="ignore")
+        return formatted.where(numeric.notna(), "")
+
+    values = numeric.to_numpy(dtype=float, na_value=0.0)
+    digits = pd.Series(
+        np.char.mod(f"%.{match['decimals']}f", np.abs(values)),
+        index=numeric.index,
+    )
+    if match["comma"]:
+        parts = digits.str.partition(".")
+        integer = parts[0].str.replace(r"\B(?=(\d{3})+$)", ",", regex=True)
+        digits = integer + parts[1] + parts[2]
+    sign = np.where(values < 0, "-", "")
+    formatted = match["prefix"] + sign + digits + match["suffix"]
+    return formatted.where(numeric.notna(), "")
+
+
+def _as_lines(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if value is None or value != value:  # None or NaN
+        return []
+    return [str(line) for line in value]
+
+
+def _description_lines(series: Any, separator: Optional[str]) -> Any:
+    """Turns a description column into lists of lines."""
+    import pandas as pd
+
+    if separator is not None:
+        lines = series.astype("string").str.split(separator, regex=False)
+        # Aligned on the column's own index, which is rarely 0..n-1 for a
+        # filtered frame.
+        empty = pd.Series([[]] * len(series), index=series.index, dtype=object)
+        return lines.where(series.notna(), empty)
+    if pd.api.types.infer_dtype(series, skipna=True) == "string":
+        return pd.Series(
+            [[text] if isinstance(text, str) else [] for text in series],
+            index=series.index,
+            dtype=object,
+        )
+    return series.map(_as_lines)
+
+
+def _apply_live_values(
+    normalized: Any, live: Dict[str, Dict[str, str]]
+) -> None:
+    """Overrides the normalized fields of rows whose key got pushed values."""
+    used = []
+    for row, live_key in enumerate(normalized["liveKey"]):
+        values = live.get(live_key)
+        if not values:
+            continue
+        used.append(live_key)
+        for prop, value in values.items():
+            if prop not in normalized:
+                normalized[prop] = None
+            normalized.iat[row, normalized.columns.get_loc(prop)] = value
+            if prop == "price" and "priceValue" in normalized:
+                column = normalized.columns.get_loc("priceValue")
+                normalized.iat[row, column] = _price_value(value)
+    _live_used(used)
+
+
+def product_cards_from_dataframe(
+    data: Any,
+    column_map: Optional[Dict[str, str]] = None,
+    price_format: Optional[Union[str, Callable[[Any], str]]] = None,
+    description_separator: Optional[str] = None,
+    columns: int = 3,
+    gap: int = 16,
+    virtualized: bool = False,
+    height: int = 600,
+    row_height: int = 420,
+    overscan_rows: int = 2,
+    key: Optional[str] = None,
+    transport: str = "json",
+    fragment: bool = False,
+    background: bool = False,
+    searchable: bool = False,
+    **card_defaults: Any,
+) -> List[ClickEvent]:
+    """
+    Renders one card per row of a catalog table, as a single grid component.
+
+    Args:
+        data: A pandas DataFrame or a pyarrow Table.
+        column_map: Maps card fields (`product_name`, `description`, `price`,
+            `product_image`, `button_text`, `stock` and `key`) to column
+            names. Fields not in the map are read from a column of the same
+            name if there is one. `product_name` is required.
+        price_format: How to turn the price column into text. Either a
+            `str.format` pattern such as `"€{:,.2f}"`, applied to the column
+            as numbers, or a callable taking one price. Patterns of the form
+            `"<prefix>{:,.Nf}<suffix>"` are formatted without a per-row
+            Python call. By default prices are converted with `str()`, as in
+            `product_card`. Null prices render no price.
+        description_separator: If set, string descriptions are split into
+            lines on it. Otherwise a description is one line, or a list of
+            lines if the column holds lists.
+        columns, gap, virtualized, height, row_height, overscan_rows, key:
+            Grid layout, as in `product_grid`.
+        transport: `"json"` or `"arrow"`, as in `product_grid`. Either way
+            the normalized columns are sent without building a dict per
+            row: as JSON arrays next to the fields shared by every card, or
+            as one Arrow table that the browser decodes lazily. With
+            `optimize_image` or `image_placeholder` in `card_defaults`,
+            each card gets its own image fields, so a dict is built per row
+            and sent as in `product_grid`.
+        fragment: Run the grid in a Streamlit fragment, as in `product_grid`.
+        background: Run the callback in the background, as in
+            `product_grid`; `click_task(key, product)` takes the row's
+            `ClickEvent.product`.
+        searchable: Search, filter and sort the cards in the browser, as in
+            `product_grid`. Price ranges and sorting use the price column's
+            numbers, before `price_format` is applied.
+        **card_defaults: Any other `product_card` argument, applied to every
+            card, plus an `on_button_click` callback called once per click.
+            A column mapped to the same field takes precedence.
+
+    Returns:
+        List[ClickEvent]: The clicks since the previous run, as in
+        `product_grid`. `ClickEvent.product` is the row's `key` column
+        value, or its index label if there is no key column.
+    """
+    unknown = set(card_defaults) - set(_CARD_FIELDS) - {"on_button_click"}
+    unknown |= set(card_defaults) & {"product_name", "key"}
+    if unknown:
+        raise TypeError(
+            "product_cards_from_dataframe() got unexpected keyword "
+            f"arguments: {sorted(unknown)}"
+        )
+    _check_transport(transport)
+    if fragment:
+        return (
+            _in_fragment(product_cards_from_dataframe)(
+                data,
+                column_map=column_map,
+                price_format=price_format,
+                description_separator=description_separator,
+                columns=columns,
+                gap=gap,
+                virtualized=virtualized,
+                height=height,
+                row_height=row_height,
+                overscan_rows=overscan_rows,
+                key=key,
+                transport=transport,
+                background=background,
+                searchable=searchable,
+                **card_defaults,
+            )
+            or []
+        )
+    recorder = _recorder("product_cards_from_dataframe", key, len(data))
+    callback = card_defaults.pop("on_button_click", None)
+
+    available = set(
+        data.column_names if hasattr(data, "column_names") else data.columns
+    )
+    mapping = {
+        field: column
+        for field, column in {
+            **_DEFAULT_COLUMN_MAP,
+            **(column_map or {}),
+        }.items()
+        if column in available
+    }
+    if "product_name" not in mapping:
+        raise ValueError(
+            "product_cards_from_dataframe() needs a product_name column; "
+            "pass column_map={'product_name': <column>}"
+        )
+    frame = _to_pandas(data, sorted(set(mapping.values())))
+
+    # Column-wise normalization; rows are only merged over the defaults
+    # shared by every card when cards need per-row image fields.
+    import numpy as np
+    import pandas as pd
+
+    normalized = pd.DataFrame(
+        {"productName": _text_column(frame[mapping["product_name"]])},
+        index=frame.index,
+    )
+    if "description" in mapping:
+        normalized["description"] = _description_lines(
+            frame[mapping["description"]], description_separator
+        )
+    if "price" in mapping:
+        normalized["price"] = _format_prices(
+            frame[mapping["price"]], price_format
+        )
+        if searchable:
+            normalized["priceValue"] = _price_values(frame[mapping["price"]])
+    if "product_image" in mapping:
+        normalized["productImage"] = _text_column(
+            frame[mapping["product_image"]], missing=None
+        )
+    if "button_text" in mapping:
+        normalized["buttonText"] = _text_column(frame[mapping["button_text"]])
+    if "stock" in mapping:
+        normalized["stock"] = _text_column(
+            frame[mapping["stock"]], missing=None
+        )
+    if "key" in mapping:
+        normalized["liveKey"] = _text_column(frame[mapping["key"]])
+        live = _live_values()
+        if live:
+            _apply_live_values(normalized, live)
+
+    shared = _build_card_args("", **card_defaults, columns=columns)
+    per_card_images = card_defaults.get("optimize_image") or card_defaults.get(
+        "image_placeholder"
+    )
+    if transport == "arrow" and not per_card_images:
+        # Every row shares one look, so the normalized columns are sent as
+        # they are, plus constant columns for row fields set as defaults.
+        catalog = normalized.copy()
+        for field in _ROW_FIELDS:
+            if field not in catalog and shared.get(field):
+                catalog[field] = [shared[field]] * len(catalog)
+        catalog["styleId"] = np.zeros(len(catalog), dtype=np.int32)
+        look = {k: v for k, v in shared.items() if k not in _ROW_FIELDS}
+        payload = _catalog_payload(catalog, [look])
+    elif not per_card_images:
+        # JSON with one look as well: the normalized columns go as arrays
+        # next to the shared fields, and the frame builds each card from
+        # them when it first reads it.
+        payload = {
+            "cardColumns": {
+                field: normalized[field].tolist() for field in normalized
+            },
+            "looks": [shared],
+        }
+    else:
+        cards = [{**shared, **row} for row in normalized.to_dict("records")]
+        if card_defaults.get("optimize_image"):
+            for card in cards:
+                if card["productImage"]:
+                    card.update(
+                        prepare_image_args(
+                            card["productImage"],
+                            picture_position=card["picturePosition"],
+                            image_width_percent=card["imageWidthPercent"],
+                            image_aspect_ratio=card["imageAspectRatio"],
+                            image_object_fit=card["imageObjectFit"],
+                            columns=columns,
+                        )
+                    )
+        if card_defaults.get("image_placeholder"):
+            for card in cards:
+                if card["productImage"]:
+                    card.update(
+                        placeholder_args(
+                            card["productImage"],
+                            card_defaults["image_placeholder"],
+                            image_aspect_ratio=card["imageAspectRatio"],
+                            image_object_fit=card["imageObjectFit"],
+                        )
+                    )
+        payload = _grid_payload(cards, transport)
+
+    themes = {}
+    if card_defaults.get("theme") is not None:
+        theme = get_card_theme(card_defaults["theme"])
+        themes[theme.theme_id] = theme.body()
+
+    if "key" in mapping:
+        product_keys = frame[mapping["key"]].tolist()
+    else:
+        product_keys = frame.index.tolist()
+
+    grid_state = _grid_state(key)
+    pending = None
+    if background:
+        running = _pending_tasks(grid_state)
+        pending = [
+            i
+            for i, product_key in enumerate(product_keys)
+            if running and product_key in running
+        ]
+
+    new_clicks = _render_grid(
+        payload,
+        themes,
+        columns=columns,
+        gap=gap,
+        virtualized=virtualized,
+        height=height,
+        row_height=row_height,
+        overscan_rows=overscan_rows,
+        key=key,
+        recorder=recorder,
+        pending=pending,
+        searchable=searchable,
+    )
+    clicks: List[ClickEvent] = []
+    for event in new_clicks:
+        card_index = event.get("cardIndex")
+        if card_index is None or card_index >= len(product_keys):
+            continue  # Stale event from a longer table
+        if callback:
+            if recorder is not None:
+                recorder.mark("clicks")
+            if background:
+                _dispatch_click(callback, grid_state, product_keys[card_index])
+            else:
+                callback()
+            if recorder is not None:
+                recorder.mark("callback")
+        clicks.append(
+            ClickEvent(
+                event["seq"],
+                event["timestamp"] / 1000,
+                product_keys[card_index],
+            )
+        )
+    if recorder is not None:
+        recorder.mark("clicks")
+        recorder.finish(len(clicks))
+    return clicks
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Click event delivery between the card frames and Python.
+
+Each mounted frame numbers its clicks with a per-instance sequence and
+queues them until Python acknowledges them, sending the whole queue with
+every component value. Python remembers the last sequence it handled per
+instance, so each click is delivered exactly once even when several arrive
+between two reruns or when cards share a name.
+"""
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+# Instances remembered per card slot beyond those that may be mounted;
+# older ones belong to frames that were remounted long ago.
+_MAX_TRACKED_INSTANCES = 8
+
+
+class ClickEvent(NamedTuple):
+    """A click on a card's button, or on the card itself if it has none."""
+
+    seq: int
+    """Position of the click in its frame's sequence, starting at 1."""
+    timestamp: float
+    """When the click happened in the browser, in seconds since the epoch."""
+    product: Optional[Union[str, int]] = None
+    """For `product_grid`, the clicked product's `key` (or index)."""
+
+
+def _click_acks(card_state: Dict[str, Any]) -> str:
+    """The last handled sequence per instance, echoed back to the frames.
+
+    JSON-encoded: Streamlit inspects every dict argument for dataframes,
+    which costs more per card than the whole rest of its args.
+    """
+    return json.dumps(card_state.get("clicks", {}))
+
+
+def _take_new_clicks(
+    component_value: Dict[str, Any], card_state: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Returns the queued click events not handled yet, oldest first.
+
+    `card_state` is the card's entry from `state._card_state`.
+    """
+    instance_id = component_value.get("instanceId")
+    events = component_value.get("events") or []
+    if instance_id is None or not events:
+        return []
+
+    seqs: Dict[str, int] = card_state.setdefault("clicks", {})
+    # Instance -> the run (see `state`) it last sent clicks in.
+    runs: Dict[str, int] = card_state.setdefault("click_runs", {})
+    run = runs[instance_id] = card_state.get("run", 0)
+    last_seq = seqs.pop(instance_id, 0)
+    new_events = sorted(
+        (event for event in events if event["seq"] > last_seq),
+        key=lambda event: event["seq"],
+    )
+    if new_events:
+        last_seq = new_events[-1]["seq"]
+    seqs[instance_id] = last_seq  # Re-inserted as the most recent instance
+    # Unkeyed frames get no acks and resend their whole queue on every run,
+    # so instances that sent clicks in this run or the previous one are
+    # kept however many cards share the slot.
+    for old_id in list(seqs):
+        if len(seqs) <= _MAX_TRACKED_INSTANCES:
+            break
+        if runs.get(old_id, 0) < run - 1:
+            del seqs[old_id]
+            runs.pop(old_id, None)
+    return new_events
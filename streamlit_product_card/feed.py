@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Infinite-scroll grids fed chunk by chunk from Python.
+
+`product_feed` takes an iterable of products (a generator over a database
+cursor, say) or a page-fetch callable, and renders its first `chunk_size`
+products. The frame keeps the cards it has received and, when the shopper
+scrolls near the end of the grid, asks for more: the next rerun pulls one
+more chunk from the source and sends only that chunk, which the frame
+appends. Cards already on screen are never sent again, and the session
+holds only the source and the current chunk, not the products seen so far.
+"""
+import itertools
+import uuid
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ._core import _CARD_FIELDS, _grid_cards, _in_fragment, _render_grid
+from .events import ClickEvent
+from .instrumentation import _recorder
+from .live import _live_values
+from .state import _card_state
+
+ProductSource = Union[
+    Iterable[Mapping[str, Any]],
+    Callable[[int, int], Sequence[Mapping[str, Any]]],
+]
+
+
+def _chunks(
+    source: ProductSource, chunk_size: int
+) -> Iterator[Tuple[List[Mapping[str, Any]], bool]]:
+    """Yields (products, is_last) chunks of `source`, fetching lazily."""
+    if callable(source):
+        offset = 0
+        while True:
+            page = list(source(offset, chunk_size))
+            yield page, len(page) < chunk_size
+            if len(page) < chunk_size:
+                return
+            offset += len(page)
+    iterator = iter(source)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        yield chunk, len(chunk) < chunk_size
+        if len(chunk) < chunk_size:
+            return
+
+
+def _start_feed(
+    source: ProductSource, chunk_size: int, source_key: Any
+) -> Dict[str, Any]:
+    feed = {
+        "id": uuid.uuid4().hex,
+        "source_key": source_key,
+        "chunks": _chunks(source, chunk_size),
+        "chunk": -1,
+        "offset": 0,
+        "products": [],
+        "done": False,
+    }
+    _next_chunk(feed)
+    return feed
+
+
+def _next_chunk(feed: Dict[str, Any]) -> None:
+    """Replaces the current chunk by the next one of the source."""
+    products, is_last = next(feed["chunks"], ([], True))
+    feed["offset"] += len(feed["products"])
+    feed["chunk"] += 1
+    feed["products"] = products
+    feed["done"] = is_last
+    if is_last:
+        feed["chunks"] = None  # Lets a cursor be closed
+
+
+def product_feed(
+    source: ProductSource,
+    chunk_size: int = 24,
+    key: str = "product_feed",
+    source_key: Optional[Hashable] = None,
+    load_margin: int = 800,
+    columns: int = 3,
+    gap: int = 16,
+    virtualized: bool = False,
+    height: int = 600,
+    row_height: int = 420,
+    overscan_rows: int = 2,
+    fragment: bool = False,
+    **card_defaults: Any,
+) -> List[ClickEvent]:
+    """
+    Renders a grid that loads more products from `source` as it is scrolled.
+
+    Args:
+        source: The products, as dicts like those of `product_grid` or
+            `ProductSpec`s. Either an iterable (e.g. a generator reading a
+            database cursor, or a `ProductCatalog`), which is consumed
+            `chunk_size` products at a time, or a callable
+            `fetch(offset, limit)` returning up to `limit` products starting
+            at `offset`; fewer than `limit` means there are no more.
+        chunk_size: Products sent per chunk.
+        key: A unique key for the feed. Required to keep the feed's position
+            across reruns.
+        source_key: Identifies what `source` returns, e.g. the active search
+            filters. While it stays the same, the source from the run that
+            started the feed keeps being read and the one passed on later
+            runs is ignored, so creating a generator on every run is cheap.
+            When it changes, the feed starts over from the new source.
+        load_margin: How close to the end of the grid, in pixels, scrolling
+            has to get before the next chunk is requested.
+        columns, gap, virtualized, height, row_height, overscan_rows:
+            Grid layout, as in `product_grid`.
+        fragment: Run the feed in a Streamlit fragment, so loading a chunk
+            or a click reruns only the feed instead of the whole script.
+            Clicks then reach Python only through `on_button_click`.
+        **card_defaults: Defaults for any `product_card` argument, applied
+            to every card, plus an `on_button_click` callback called once
+            per click. A product's own `on_button_click` is not used, since
+            products are not kept after their chunk is sent.
+
+    Returns:
+        List[ClickEvent]: The clicks since the previous run, as in
+        `product_grid`. `ClickEvent.product` is the clicked product's
+        `key`, or its position in the feed if it has none.
+    """
+    unknown = set(card_defaults) - set(_CARD_FIELDS) - {"on_button_click"}
+    if unknown:
+        raise TypeError(
+            "product_feed() got unexpected keyword arguments: "
+            f"{sorted(unknown)}"
+        )
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if fragment:
+        return (
+            _in_fragment(product_feed)(
+                source,
+                chunk_size=chunk_size,
+                key=key,
+                source_key=source_key,
+                load_margin=load_margin,
+                columns=columns,
+                gap=gap,
+                virtualized=virtualized,
+                height=height,
+                row_height=row_height,
+                overscan_rows=overscan_rows,
+                **card_defaults,
+            )
+            or []
+        )
+    import streamlit as st
+
+    callback = card_defaults.pop("on_button_click", None)
+    feed_state = _card_state(f"feed:{key}")
+    feed = feed_state.get("feed")
+    # The frame's latest value, from before this run renders it.
+    request = st.session_state.get(key) or {}
+    if (
+        feed is None
+        or feed["source_key"] != source_key
+        # A frame that missed chunks (e.g. remounted) asks to start over.
+        or request.get("restart") == feed["id"]
+    ):
+        feed = feed_state["feed"] = _start_feed(source, chunk_size, source_key)
+    elif (
+        request.get("more") == [feed["id"], feed["chunk"]] and not feed["done"]
+    ):
+        _next_chunk(feed)
+
+    products = feed["products"]
+    recorder = _recorder("product_feed", key, len(products))
+    cards, themes = _grid_cards(
+        products, card_defaults, columns, _live_values()
+    )
+    for position, (product, card) in enumerate(
+        zip(products, cards), feed["offset"]
+    ):
+        card["productKey"] = product.get("key", position)
+
+    new_clicks = _render_grid(
+        {
+            "cards": cards,
+            "feed": {
+                "id": feed["id"],
+                "chunk": feed["chunk"],
+                "done": feed["done"],
+                "loadMargin": load_margin,
+            },
+        },
+        themes,
+        columns=columns,
+        gap=gap,
+        virtualized=virtualized,
+        height=height,
+        row_height=row_height,
+        overscan_rows=overscan_rows,
+        key=key,
+        recorder=recorder,
+    )
+
+    clicks: List[ClickEvent] = []
+    for event in new_clicks:
+        if "productKey" not in event:
+            continue
+        if callback:
+            if recorder is not None:
+                recorder.mark("clicks")
+            callback()
+            if recorder is not None:
+                recorder.mark("callback")
+        clicks.append(
+            ClickEvent(
+                event["seq"], event["timestamp"] / 1000, event["productKey"]
+            )
+        )
+    if recorder is not None:
+        recorder.mark("clicks")
+        recorder.finish(len(clicks))
+    return clicks
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Page-level registry of card fonts.
+
+Without it, every card frame imports its `font_url` stylesheet from the
+font host and the text waits for the font. A font registered with
+`register_card_font` is fetched once per process instead: its stylesheet
+and font files are cached on disk, so the app keeps working offline once
+they are cached, and served from the Streamlit server. Every `@font-face`
+gets `font-display: swap`, and cards preload the Latin font files. All
+card frames reference the same URLs, so the browser downloads each file
+once per page.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import urllib.parse
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .state import _run_memo
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "streamlit_product_card", "fonts"
+)
+
+# Font hosts such as Google Fonts pick the font format from the user agent;
+# a current browser's gets WOFF2.
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+_DOWNLOAD_TIMEOUT_S = 30
+_MIMETYPES = {
+    "woff2": "font/woff2",
+    "woff": "font/woff",
+    "ttf": "font/ttf",
+    "otf": "font/otf",
+}
+
+_FONT_FACE = re.compile(r"@font-face\s*{[^}]*}", re.IGNORECASE)
+_URL = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+_FONT_DISPLAY = re.compile(r"\s*font-display\s*:[^;}]*;?", re.IGNORECASE)
+_UNICODE_RANGE = re.compile(r"unicode-range\s*:([^;}]*)", re.IGNORECASE)
+
+
+class FontFile(NamedTuple):
+    name: str
+    data: bytes
+    mimetype: str
+
+
+class CardFont(NamedTuple):
+    font_url: str
+    css: str
+    """The stylesheet, with font files referenced by their `FontFile.name`."""
+    files: Tuple[FontFile, ...]
+    preload: Tuple[str, ...]
+    """Names of the files covering Latin text, which cards preload."""
+
+
+_fonts: Dict[str, CardFont] = {}
+# (font URL, served file URLs) -> stylesheet pointing at those URLs.
+_served_css: Dict[Tuple[str, Tuple[str, ...]], bytes] = {}
+_fonts_lock = threading.Lock()
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _fetch(url: str, path: str) -> bytes:
+    """Returns the cached copy of `url` at `path`, downloading it if needed."""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    import urllib.request
+
+    request = urllib.request.Request(url, headers={"User-Agent": _USER_AGENT})
+    with urllib.request.urlopen(
+        request, timeout=_DOWNLOAD_TIMEOUT_S
+    ) as response:
+        data = response.read()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return data
+
+
+def _covers_latin(unicode_range: Optional[str]) -> bool:
+    """Whether a `unicode-range` (or its absence) includes "A" (U+0041)."""
+    if unicode_range is None:
+        return True
+    for part in unicode_range.split(","):
+        part = part.strip().upper().replace("U+", "")
+        try:
+            if "-" in part:
+                low, high = part.split("-", 1)
+                start, end = int(low, 16), int(high, 16)
+            else:
+                start = int(part.replace("?", "0"), 16)
+                end = int(part.replace("?", "F"), 16)
+        except ValueError:
+            continue
+        if start <= 0x41 <= end:
+            return True
+    return False
+
+
+def _load_font(font_url: str, directory: str) -> CardFont:
+    font_dir = os.path.join(directory, _digest(font_url))
+    source = _fetch(font_url, os.path.join(font_dir, "source.css"))
+    files: Dict[str, FontFile] = {}
+    preload: List[str] = []
+
+    def rewrite_face(match: "re.Match[str]") -> str:
+        face = _FONT_DISPLAY.sub("", match.group(0))
+        face_files: List[str] = []
+
+        def rewrite_url(url_match: "re.Match[str]") -> str:
+            url = url_match.group(2)
+            if url.startswith("data:"):
+                return url_match.group(0)
+            url = urllib.parse.urljoin(font_url, url)
+            extension = os.path.splitext(urllib.parse.urlparse(url).path)[1]
+            name = _digest(url) + extension.lower()
+            if name not in files:
+                data = _fetch(url, os.path.join(font_dir, name))
+                mimetype = _MIMETYPES.get(
+                    extension.lstrip(".").lower(), "application/octet-stream"
+                )
+                files[name] = FontFile(name, data, mimetype)
+            face_files.append(name)
+            return f"url({name})"
+
+        face = _URL.sub(rewrite_url, face)
+        unicode_range = _UNICODE_RANGE.search(face)
+        if face_files and _covers_latin(
+            unicode_range.group(1) if unicode_range else None
+        ):
+            # The first source is the preferred format.
+            preload.append(face_files[0])
+        return face.replace("{", "{\n  font-display: swap;", 1)
+
+    css = _FONT_FACE.sub(rewrite_face, source.decode("utf-8"))
+    return CardFont(font_url, css, tuple(files.values()), tuple(preload))
+
+
+def register_card_font(font_url: str, cache_dir: Optional[str] = None) -> bool:
+    """
+    Serves the font stylesheet `font_url` from this app, for all its cards.
+
+    Call it once, e.g. at the top of the script, for each `font_url` passed
+    to cards, grids or themes. The stylesheet and its font files are
+    downloaded on the first call in a process and cached on disk.
+
+    Args:
+        font_url: URL to a CSS file for custom fonts, e.g. from Google Fonts.
+        cache_dir: Where the stylesheet and font files are cached. Defaults
+            to `~/.cache/streamlit_product_card/fonts`.
+
+    Returns:
+        bool: Whether the font is served locally. If it can't be fetched,
+        a warning is logged and cards keep loading `font_url` directly.
+    """
+    with _fonts_lock:
+        if font_url in _fonts:
+            return True
+    try:
+        font = _load_font(font_url, cache_dir or DEFAULT_CACHE_DIR)
+    except Exception:  # Offline and not cached yet, not a stylesheet...
+        _LOGGER.warning(
+            "Could not cache card font %r", font_url, exc_info=True
+        )
+        return False
+    with _fonts_lock:
+        _fonts[font_url] = font
+    return True
+
+
+def _with_display_swap(font_url: str) -> str:
+    """Asks Google Fonts for `font-display: swap` if the URL doesn't say."""
+    parsed = urllib.parse.urlparse(font_url)
+    if parsed.netloc != "fonts.googleapis.com" or "display=" in parsed.query:
+        return font_url
+    query = f"{parsed.query}&display=swap" if parsed.query else "display=swap"
+    return urllib.parse.urlunparse(parsed._replace(query=query))
+
+
+def _font_args(font_url: Optional[str]) -> Dict[str, Any]:
+    """Returns the font props of a card: `fontUrl`, plus `fontPreload` for
+    a registered font served by the app."""
+    if not font_url:
+        return {"fontUrl": font_url}
+    from streamlit import runtime
+
+    font = _fonts.get(font_url)
+    if font is None or not runtime.exists():
+        return {"fontUrl": _with_display_swap(font_url)}
+
+    # Files are re-added on every run, which keeps them alive for the
+    # session, but once per run is enough for all the cards using them.
+    memo = _run_memo()
+    args = memo.get(("font", font_url))
+    if args is not None:
+        return args
+    media = runtime.get_instance().media_file_mgr
+    urls = {
+        file.name: media.add(
+            file.data, file.mimetype, f"product_card_font.{file.name}"
+        )
+        for file in font.files
+    }
+    served_key = (font_url, tuple(urls.values()))
+    css = _served_css.get(served_key)
+    if css is None:
+        # The stylesheet is served next to the font files, so a relative
+        # URL works under any base path.
+        text = font.css
+        for name, url in urls.items():
+            text = text.replace(
+                f"url({name})", f"url({url.rsplit('/', 1)[-1]})"
+            )
+        css = _served_css[served_key] = text.encode("utf-8")
+    css_url = media.add(
+        css, "text/css", f"product_card_font.{_digest(font_url)}.css"
+    )
+    args = memo[("font", font_url)] = {
+        "fontUrl": css_url,
+        # A tuple, so grids can use it in the key of a card's look.
+        "fontPreload": tuple(urls[name] for name in font.preload),
+    }
+    return args
@@ -0,0 +1,123 @@
+/*
+ * Reports the size of the production build, raw and gzipped, and compares
+ * it with the baseline in bundle-size.json. Runs after `npm run build`, so
+ * a build fails if the initial gzipped size grew by more than 5%. Until a
+ * baseline is committed, it only warns. After an intended change,
+ * regenerate the baseline from a production build with
+ * `npm run size:update` and commit it, so size changes show up in review.
+ *
+ * "initial" counts index.html and the files it loads, i.e. what every card
+ * frame downloads; "lazy" counts chunks loaded only on demand.
+ *
+ * Usage:
+ *     node scripts/bundle-size.js [--update]
+ *
+ * With --update, the report is written to bundle-size.json instead of
+ * being checked against it.
+ */
+const fs = require("fs");
+const path = require("path");
+const zlib = require("zlib");
+
+const root = path.join(__dirname, "..");
+const buildDir = path.join(root, "build");
+const reportPath = path.join(root, "bundle-size.json");
+const MAX_GROWTH = 0.05;
+
+const listFiles = dir =>
+  fs.readdirSync(dir).reduce((files, name) => {
+    const file = path.join(dir, name);
+    return fs.statSync(file).isDirectory()
+      ? files.concat(listFiles(file))
+      : files.concat(file);
+  }, []);
+
+const sizeOf = file => {
+  const data = fs.readFileSync(file);
+  return { bytes: data.length, gzip: zlib.gzipSync(data, { level: 9 }).length };
+};
+
+const total = (files, group) =>
+  Object.keys(files)
+    .filter(name => files[name].group === group)
+    .reduce(
+      (sum, name) => ({
+        bytes: sum.bytes + files[name].bytes,
+        gzip: sum.gzip + files[name].gzip,
+      }),
+      { bytes: 0, gzip: 0 }
+    );
+
+const kb = bytes => `${(bytes / 1024).toFixed(1)} KB`;
+
+const change = (now, before) => {
+  if (before === undefined) return "";
+  const diff = now - before;
+  const sign = diff > 0 ? "+" : "";
+  return ` (${sign}${kb(diff)})`;
+};
+
+const main = () => {
+  if (!fs.existsSync(buildDir)) {
+    console.error("No build found; run `npm run build` first.");
+    process.exit(1);
+  }
+  const indexHtml = fs.readFileSync(path.join(buildDir, "index.html"), "utf8");
+  const files = {};
+  listFiles(buildDir)
+    .filter(file => /\.(html|js|css)$/.test(file))
+    .forEach(file => {
+      const name = path.relative(buildDir, file).split(path.sep).join("/");
+      const initial = name === "index.html" || indexHtml.includes(name);
+      files[name] = { ...sizeOf(file), group: initial ? "initial" : "lazy" };
+    });
+
+  const report = {
+    initial: total(files, "initial"),
+    lazy: total(files, "lazy"),
+    // Hashes are stripped so entries line up across builds.
+    files: Object.keys(files)
+      .sort()
+      .reduce((sorted, name) => {
+        sorted[name.replace(/\.[0-9a-f]{8}(\.chunk)?\./, "$1.")] = files[name];
+        return sorted;
+      }, {}),
+  };
+
+  const previous = fs.existsSync(reportPath)
+    ? JSON.parse(fs.readFileSync(reportPath, "utf8"))
+    : undefined;
+  ["initial", "lazy"].forEach(group => {
+    const before = previous && previous[group];
+    console.log(
+      `${group.padEnd(8)} ${kb(report[group].bytes).padStart(10)}` +
+        `${change(report[group].bytes, before && before.bytes)}, ` +
+        `gzipped ${kb(report[group].gzip)}` +
+        `${change(report[group].gzip, before && before.gzip)}`
+    );
+  });
+
+  if (process.argv.includes("--update")) {
+    fs.writeFileSync(reportPath, `${JSON.stringify(report, null, 2)}\n`);
+    return;
+  }
+  // Without a baseline there is nothing to hold the budget to yet; say so
+  // on every build until one is committed.
+  if (!previous) {
+    console.warn(
+      "Warning: no bundle-size.json baseline, so the size budget is not " +
+        "checked; run `npm run size:update` after a production build and " +
+        "commit it."
+    );
+    return;
+  }
+  if (report.initial.gzip > previous.initial.gzip * (1 + MAX_GROWTH)) {
+    console.error(
+      `Initial bundle grew by more than ${MAX_GROWTH * 100}% (gzipped); ` +
+        "if that is intended, run `npm run size:update` and commit it."
+    );
+    process.exit(1);
+  }
+};
+
+main();
@@ -0,0 +1,92 @@
+import React, { ReactNode } from "react";
+import { CatalogSort, CatalogView } from "./types";
+
+const SORT_LABELS: { [sort in CatalogSort]: string } = {
+  default: "Featured",
+  price_asc: "Price: low to high",
+  price_desc: "Price: high to low",
+  name: "Name",
+};
+
+interface CatalogToolbarProps {
+  view: CatalogView;
+  priceRange: boolean;
+  matches: number;
+  total: number;
+  onChange: (view: CatalogView) => void;
+  // Enter in the search box: the shopper settled on a selection.
+  onSubmit: () => void;
+}
+
+/**
+ * Search box, sort menu and price range of a `searchable` grid. Changes go
+ * straight to the grid, which filters in the browser; Python only hears of
+ * the selection when it is submitted or a card is clicked.
+ */
+class CatalogToolbar extends React.PureComponent<CatalogToolbarProps> {
+  private update(change: Partial<CatalogView>): void {
+    this.props.onChange({ ...this.props.view, ...change });
+  }
+
+  private onSubmit = (e: React.FormEvent<HTMLFormElement>): void => {
+    e.preventDefault();
+    this.props.onSubmit();
+  };
+
+  render(): ReactNode {
+    const { view, priceRange, matches, total } = this.props;
+    return (
+      <form className="pc-toolbar" role="search" onSubmit={this.onSubmit}>
+        <input
+          className="pc-toolbar-search"
+          type="search"
+          placeholder="Search products"
+          aria-label="Search products"
+          value={view.query}
+          onChange={e => this.update({ query: e.target.value })}
+        />
+        <select
+          className="pc-toolbar-sort"
+          aria-label="Sort by"
+          value={view.sort}
+          onChange={e => this.update({ sort: e.target.value as CatalogSort })}
+        >
+          {(Object.keys(SORT_LABELS) as CatalogSort[]).map(sort => (
+            <option key={sort} value={sort}>
+              {SORT_LABELS[sort]}
+            </option>
+          ))}
+        </select>
+        {priceRange && (
+          <>
+            <input
+              className="pc-toolbar-price"
+              type="number"
+              min={0}
+              placeholder="Min price"
+              aria-label="Min price"
+              value={view.minPrice}
+              onChange={e => this.update({ minPrice: e.target.value })}
+            />
+            <input
+              className="pc-toolbar-price"
+              type="number"
+              min={0}
+              placeholder="Max price"
+              aria-label="Max price"
+              value={view.maxPrice}
+              onChange={e => this.update({ maxPrice: e.target.value })}
+            />
+          </>
+        )}
+        <span className="pc-toolbar-count" aria-live="polite">
+          {matches === total ? `${total} products` : `${matches} of ${total}`}
+        </span>
+        {/* Enter submits a form only if it has a submit button. */}
+        <button type="submit" hidden />
+      </form>
+    );
+  }
+}
+
+export default CatalogToolbar;
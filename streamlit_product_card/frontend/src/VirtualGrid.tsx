@@ -0,0 +1,149 @@
+import React, { ReactNode } from "react";
+
+const MOBILE_BREAKPOINT_PX = 600;
+
+const isNarrowViewport = (): boolean =>
+  typeof window !== "undefined" && window.innerWidth <= MOBILE_BREAKPOINT_PX;
+
+interface VirtualGridProps {
+  itemCount: number;
+  columns: number;
+  gap: number;
+  rowHeight: number;
+  height: number;
+  overscanRows: number;
+  renderItem: (index: number) => ReactNode;
+  // Called while the end of the content is within `endMargin` pixels of
+  // the bottom of the viewport, e.g. to load more items.
+  onNearEnd?: () => void;
+  endMargin?: number;
+}
+
+interface VirtualGridState {
+  firstVisibleRow: number;
+  narrow: boolean;
+}
+
+/**
+ * Windowed grid: only the rows inside the scroll viewport (plus
+ * `overscanRows` above and below) are mounted. Rows are keyed by their slot
+ * in the window rather than by their index, so scrolling re-uses the same
+ * DOM nodes with new card contents instead of mounting fresh ones. Items
+ * are only requested, through `renderItem`, for the mounted rows.
+ */
+class VirtualGrid extends React.Component<VirtualGridProps, VirtualGridState> {
+  state: VirtualGridState = { firstVisibleRow: 0, narrow: isNarrowViewport() };
+
+  private scrollTop = 0;
+  private pendingFrame: number | null = null;
+
+  componentDidMount(): void {
+    window.addEventListener("resize", this.onResize);
+    this.checkNearEnd();
+  }
+
+  componentDidUpdate(): void {
+    this.checkNearEnd();
+  }
+
+  componentWillUnmount(): void {
+    window.removeEventListener("resize", this.onResize);
+    if (this.pendingFrame !== null) {
+      window.cancelAnimationFrame(this.pendingFrame);
+    }
+  }
+
+  private onResize = (): void => {
+    const narrow = isNarrowViewport();
+    if (narrow !== this.state.narrow) {
+      this.setState({ narrow });
+    }
+  };
+
+  private checkNearEnd(): void {
+    const { onNearEnd, endMargin = 0, itemCount, rowHeight, gap, height } = this.props;
+    if (!onNearEnd) return;
+    const columns = this.state.narrow ? 1 : Math.max(1, this.props.columns);
+    const contentHeight = Math.ceil(itemCount / columns) * (rowHeight + gap) - gap;
+    if (contentHeight - (this.scrollTop + height) <= endMargin) onNearEnd();
+  }
+
+  private onScroll = (e: React.UIEvent<HTMLDivElement>): void => {
+    this.scrollTop = e.currentTarget.scrollTop;
+    if (this.pendingFrame !== null) return;
+    // Coalesce scroll events into at most one state update per frame.
+    this.pendingFrame = window.requestAnimationFrame(() => {
+      this.pendingFrame = null;
+      const rowStride = this.props.rowHeight + this.props.gap;
+      const firstVisibleRow = Math.floor(this.scrollTop / rowStride);
+      if (firstVisibleRow !== this.state.firstVisibleRow) {
+        this.setState({ firstVisibleRow });
+      } else {
+        this.checkNearEnd();
+      }
+    });
+  };
+
+  render(): ReactNode {
+    const { itemCount, gap, rowHeight, height, overscanRows, renderItem } = this.props;
+    const columns = this.state.narrow ? 1 : Math.max(1, this.props.columns);
+    const rowStride = rowHeight + gap;
+    const rowCount = Math.ceil(itemCount / columns);
+    const slotCount = Math.ceil(height / rowStride) + 1 + 2 * overscanRows;
+
+    const startRow = Math.max(
+      0,
+      Math.min(this.state.firstVisibleRow - overscanRows, rowCount - slotCount)
+    );
+    const endRow = Math.min(rowCount, startRow + slotCount);
+
+    const rows: ReactNode[] = [];
+    for (let row = startRow; row < endRow; row++) {
+      const first = row * columns;
+      const rowItemCount = Math.min(columns, itemCount - first);
+      const cells: ReactNode[] = [];
+      for (let column = 0; column < rowItemCount; column++) {
+        cells.push(
+          <div key={column} style={{ height: rowHeight, overflow: "hidden" }}>
+            {renderItem(first + column)}
+          </div>
+        );
+      }
+      rows.push(
+        <div
+          key={row % slotCount}
+          style={{
+            position: "absolute",
+            top: row * rowStride,
+            left: 0,
+            right: 0,
+            height: rowHeight,
+            display: "grid",
+            gridTemplateColumns: `repeat(${columns}, minmax(0, 1fr))`,
+            gap: `${gap}px`,
+          }}
+        >
+          {cells}
+        </div>
+      );
+    }
+
+    return (
+      <div
+        style={{ height, overflowY: "auto", position: "relative" }}
+        onScroll={this.onScroll}
+      >
+        <div
+          style={{
+            position: "relative",
+            height: Math.max(0, rowCount * rowStride - gap),
+          }}
+        >
+          {rows}
+        </div>
+      </div>
+    );
+  }
+}
+
+export default VirtualGrid;
@@ -0,0 +1,139 @@
+import { ArrowTable } from "streamlit-component-lib";
+import { CardArgs, ImageSource } from "./types";
+
+/**
+ * The cards of a grid, read by index so a batch never has to exist as one
+ * array of objects.
+ */
+export interface CardList {
+  length: number;
+  get(index: number): CardArgs;
+  // What a search matches: the name and description lines.
+  searchText(index: number): string;
+  // Numeric price, for sorting and price ranges (`searchable` grids).
+  priceValue(index: number): number | undefined;
+}
+
+const cardText = (name: string, description?: Iterable<string> | null): string =>
+  description ? [name].concat(Array.from(description)).join("\n") : name;
+
+export const arrayCardList = (cards: CardArgs[]): CardList => ({
+  length: cards.length,
+  get: (index: number) => cards[index],
+  searchText: (index: number) => cardText(cards[index].productName, cards[index].description),
+  priceValue: (index: number) => {
+    const value = cards[index].priceValue;
+    return value === null ? undefined : value;
+  },
+});
+
+/**
+ * Cards of `product_cards_from_dataframe` sent as JSON: one array per field
+ * that varies per card, and the `look` every card shares. As with the Arrow
+ * list, a card object is only built the first time its index is read, and
+ * then kept so it has a stable identity.
+ */
+export class ColumnCardList implements CardList {
+  readonly length: number;
+  private fields: string[];
+  private rows: Array<CardArgs | undefined>;
+
+  constructor(private columns: { [field: string]: any[] }, private look: Partial<CardArgs>) {
+    this.fields = Object.keys(columns);
+    this.length = columns.productName.length;
+    this.rows = new Array(this.length);
+  }
+
+  get(index: number): CardArgs {
+    let row = this.rows[index];
+    if (!row) {
+      const card: { [field: string]: any } = { ...this.look };
+      this.fields.forEach(field => {
+        card[field] = this.columns[field][index];
+      });
+      row = card as CardArgs;
+      this.rows[index] = row;
+    }
+    return row;
+  }
+
+  searchText(index: number): string {
+    const { productName, description } = this.columns;
+    return cardText(productName[index], description && description[index]);
+  }
+
+  priceValue(index: number): number | undefined {
+    const values = this.columns.priceValue;
+    const value = values ? values[index] : null;
+    return value === null ? undefined : value;
+  }
+}
+
+/**
+ * Cards sent with `transport="arrow"`: one Arrow table holding the fields
+ * that vary per card, plus a `styleId` column indexing into `looks`, the
+ * distinct combinations of every other field. A card object is only built
+ * the first time its index is read, and then kept so it has a stable
+ * identity for the memoized card components.
+ */
+export class ArrowCardList implements CardList {
+  readonly length: number;
+  private columns: { [field: string]: any } = {};
+  private rows: Array<CardArgs | undefined>;
+
+  constructor(catalog: ArrowTable, private looks: Array<Partial<CardArgs>>) {
+    const table: any = catalog.table;
+    this.length = table.length;
+    table.schema.fields.forEach((field: { name: string }) => {
+      this.columns[field.name] = table.getColumn(field.name);
+    });
+    this.rows = new Array(this.length);
+  }
+
+  get(index: number): CardArgs {
+    let row = this.rows[index];
+    if (!row) {
+      row = this.readRow(index);
+      this.rows[index] = row;
+    }
+    return row;
+  }
+
+  // Read from the columns, so indexing a catalog builds no card objects.
+  searchText(index: number): string {
+    return cardText(this.cell("productName", index) || "", this.cell("description", index));
+  }
+
+  priceValue(index: number): number | undefined {
+    return this.cell("priceValue", index);
+  }
+
+  private cell(field: string, index: number): any {
+    const column = this.columns[field];
+    const value = column ? column.get(index) : null;
+    return value === null ? undefined : value;
+  }
+
+  private readRow(index: number): CardArgs {
+    const look = this.looks[this.cell("styleId", index) || 0] || {};
+    const description = this.cell("description", index);
+    const sources = this.cell("productImageSources", index);
+    return {
+      ...look,
+      productName: this.cell("productName", index) || "",
+      description: description ? Array.from(description as Iterable<string>) : [],
+      price: this.cell("price", index),
+      productImage: this.cell("productImage", index),
+      productImageSrcSet: this.cell("productImageSrcSet", index),
+      productImageSizes: this.cell("productImageSizes", index),
+      productImageSources: sources ? (JSON.parse(sources) as ImageSource[]) : undefined,
+      productImagePlaceholder: this.cell("productImagePlaceholder", index),
+      productImageWidth: this.cell("productImageWidth", index),
+      productImageHeight: this.cell("productImageHeight", index),
+      buttonText: this.cell("buttonText", index) || "",
+      stock: this.cell("stock", index),
+      priceValue: this.cell("priceValue", index),
+      liveKey: this.cell("liveKey", index),
+    } as CardArgs;
+  }
+}
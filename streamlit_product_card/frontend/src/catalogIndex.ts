@@ -0,0 +1,160 @@
+import { CardList } from "./catalog";
+import { CatalogView } from "./types";
+
+// Whitespace, ASCII and Latin-1 punctuation, general punctuation and
+// currency symbols.
+const SEPARATORS = /[\s!-\/:-@\[-`{-~\u00a0-\u00bf\u2000-\u206f\u20a0-\u20cf]+/;
+const DIACRITICS = /[\u0300-\u036f]/g;
+// Query tokens beyond this are ignored.
+const MAX_QUERY_TOKENS = 16;
+
+/** Lowercased words of `text`, without accents: "Crème Brûlée" -> creme, brulee. */
+export const tokenize = (text: string): string[] => {
+  const folded = text.normalize ? text.normalize("NFD").replace(DIACRITICS, "") : text;
+  return folded.toLowerCase().split(SEPARATORS).filter(Boolean);
+};
+
+const startsWith = (text: string, prefix: string): boolean =>
+  text.lastIndexOf(prefix, 0) === 0;
+
+// First position of a sorted sequence whose value is not below `target`.
+const lowerBound = <T>(length: number, valueAt: (i: number) => T, target: T): number => {
+  let lo = 0;
+  let hi = length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (valueAt(mid) < target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+const parsePrice = (text: string): number | undefined => {
+  if (text.trim() === "") return undefined;
+  const value = Number(text);
+  return isNaN(value) ? undefined : value;
+};
+
+/**
+ * Search, price filter and sort orders over the cards of a grid, built once
+ * per card list so every keystroke is answered in the browser:
+ *
+ * - an inverted index from each word of the names and descriptions to the
+ *   cards containing it, with the words kept sorted so a query word matches
+ *   every word it is a prefix of ("jack" finds "jacket"),
+ * - the cards with a price, presorted by price, so a price range is two
+ *   binary searches and sorting by price is a walk over that order,
+ * - the cards sorted by name, built the first time that sort is used.
+ */
+export class CatalogIndex {
+  private postings = new Map<string, number[]>();
+  private words: string[];
+  private byPrice: Int32Array;
+  private prices: Float64Array;
+  private unpriced: Int32Array;
+  private byName?: Int32Array;
+
+  constructor(private cards: CardList) {
+    const prices = new Float64Array(cards.length);
+    const priced: number[] = [];
+    const unpriced: number[] = [];
+    for (let i = 0; i < cards.length; i++) {
+      tokenize(cards.searchText(i)).forEach(word => {
+        const list = this.postings.get(word);
+        if (!list) this.postings.set(word, [i]);
+        else if (list[list.length - 1] !== i) list.push(i);
+      });
+      const price = cards.priceValue(i);
+      if (price === undefined || isNaN(price)) {
+        unpriced.push(i);
+      } else {
+        prices[i] = price;
+        priced.push(i);
+      }
+    }
+    const words: string[] = [];
+    this.postings.forEach((_, word) => words.push(word));
+    this.words = words.sort();
+
+    // Ties keep the catalog order, reversed when sorting by price descending.
+    priced.sort((a, b) => prices[a] - prices[b] || a - b);
+    this.byPrice = Int32Array.from(priced);
+    this.prices = Float64Array.from(priced, i => prices[i]);
+    this.unpriced = Int32Array.from(unpriced);
+  }
+
+  /** Indices of the cards `view` selects, in its sort order. */
+  select(view: CatalogView): number[] {
+    const tokens = tokenize(view.query).slice(0, MAX_QUERY_TOKENS);
+    const matched = tokens.length > 0 ? this.matchWords(tokens) : undefined;
+    const minPrice = parsePrice(view.minPrice);
+    const maxPrice = parsePrice(view.maxPrice);
+    const priceFiltered = minPrice !== undefined || maxPrice !== undefined;
+
+    // The cards in the price range are one slice of `byPrice`.
+    const priceAt = (k: number): number => this.prices[k];
+    const first = minPrice === undefined ? 0 : lowerBound(this.prices.length, priceAt, minPrice);
+    let last = this.prices.length;
+    if (maxPrice !== undefined) {
+      last = lowerBound(this.prices.length, priceAt, maxPrice);
+      while (last < this.prices.length && this.prices[last] === maxPrice) last++;
+    }
+
+    const selected: number[] = [];
+    const isMatch = (i: number): boolean => !matched || matched[i] === tokens.length;
+    if (view.sort === "price_asc" || view.sort === "price_desc") {
+      const ascending = view.sort === "price_asc";
+      for (let k = first; k < last; k++) {
+        const i = this.byPrice[ascending ? k : first + last - 1 - k];
+        if (isMatch(i)) selected.push(i);
+      }
+      // Cards without a price come last either way, unless filtered out.
+      if (!priceFiltered) this.unpriced.forEach(i => isMatch(i) && selected.push(i));
+      return selected;
+    }
+
+    let inRange: Uint8Array | undefined;
+    if (priceFiltered) {
+      inRange = new Uint8Array(this.cards.length);
+      for (let k = first; k < last; k++) inRange[this.byPrice[k]] = 1;
+    }
+    const isSelected = (i: number): boolean => (!inRange || inRange[i] === 1) && isMatch(i);
+    if (view.sort === "name") {
+      this.nameOrder().forEach(i => isSelected(i) && selected.push(i));
+    } else {
+      for (let i = 0; i < this.cards.length; i++) {
+        if (isSelected(i)) selected.push(i);
+      }
+    }
+    return selected;
+  }
+
+  // Per card, how many of `tokens` in a row it matched: a card matches the
+  // query if the count reaches `tokens.length`.
+  private matchWords(tokens: string[]): Uint16Array {
+    const matched = new Uint16Array(this.cards.length);
+    tokens.forEach((token, k) => {
+      const start = lowerBound(this.words.length, i => this.words[i], token);
+      for (let w = start; w < this.words.length && startsWith(this.words[w], token); w++) {
+        const list = this.postings.get(this.words[w]) as number[];
+        for (let p = 0; p < list.length; p++) {
+          if (matched[list[p]] === k) matched[list[p]] = k + 1;
+        }
+      }
+    });
+    return matched;
+  }
+
+  private nameOrder(): Int32Array {
+    if (!this.byName) {
+      const collator = new Intl.Collator(undefined, { numeric: true, sensitivity: "base" });
+      const names = Array.from({ length: this.cards.length }, (_, i) =>
+        this.cards.searchText(i).split("\n", 1)[0]
+      );
+      const order = names.map((_, i) => i);
+      order.sort((a, b) => collator.compare(names[a], names[b]) || a - b);
+      this.byName = Int32Array.from(order);
+    }
+    return this.byName;
+  }
+}
@@ -0,0 +1,21 @@
+/**
+ * Counters for checking rendering cost from the browser devtools console,
+ * e.g. `window.__productCardStats` inside a component iframe.
+ */
+export interface DebugStats {
+  renders: number;
+  styleCacheHits: number;
+  styleCacheMisses: number;
+  heightMessages: number;
+}
+
+export const debugStats: DebugStats = {
+  renders: 0,
+  styleCacheHits: 0,
+  styleCacheMisses: 0,
+  heightMessages: 0,
+};
+
+if (typeof window !== "undefined") {
+  (window as any).__productCardStats = debugStats;
+}
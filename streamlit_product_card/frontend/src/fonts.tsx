@@ -0,0 +1,44 @@
+import React from "react";
+import { resolveMediaUrl } from "./media";
+import { FontSpec } from "./types";
+
+// URLs this frame has already added to its <head>.
+const added = new Set<string>();
+
+const addLink = (rel: string, href: string, asFont?: boolean): void => {
+  if (added.has(href)) return;
+  added.add(href);
+  const link = document.createElement("link");
+  link.rel = rel;
+  link.href = href;
+  if (asFont) {
+    link.setAttribute("as", "font");
+    // Fonts are always fetched in CORS mode; the preload must match.
+    link.crossOrigin = "anonymous";
+  }
+  document.head.appendChild(link);
+};
+
+const loadFont = (font: FontSpec): void => {
+  (font.preload || []).forEach(url => addLink("preload", resolveMediaUrl(url) || url, true));
+  addLink("stylesheet", resolveMediaUrl(font.url) || font.url);
+};
+
+interface FontStylesProps {
+  fonts: FontSpec[];
+}
+
+/**
+ * Adds the cards' font stylesheets to the frame's <head>, once each, after
+ * preloading the font files Python listed for them. Most cards use the
+ * Streamlit theme font, so this is loaded as a separate chunk only when a
+ * card actually sets one.
+ */
+const FontStyles = ({ fonts }: FontStylesProps) => {
+  React.useLayoutEffect(() => {
+    fonts.forEach(loadFont);
+  });
+  return null;
+};
+
+export default FontStyles;
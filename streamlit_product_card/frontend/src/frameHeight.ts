@@ -0,0 +1,70 @@
+import { Streamlit } from "streamlit-component-lib";
+import { debugStats } from "./debugStats";
+
+// Not in the TypeScript DOM typings this project builds with.
+interface ResizeObserverLike {
+  observe(target: Element): void;
+  disconnect(): void;
+}
+type ResizeObserverConstructor = new (callback: () => void) => ResizeObserverLike;
+
+/**
+ * Keeps the iframe height in sync with the rendered content. Size changes
+ * are picked up by a `ResizeObserver`, so images finishing loading and
+ * fonts swapping in are reported too, and are coalesced into one
+ * measurement per animation frame. A message is only posted to Streamlit
+ * when the height actually changed.
+ */
+export class FrameHeightReporter {
+  private observer?: ResizeObserverLike;
+  private pendingFrame: number | null = null;
+  private lastHeight = -1;
+  private fixedHeight?: number;
+
+  start(target: Element): void {
+    const ResizeObserverImpl = (window as any).ResizeObserver as
+      | ResizeObserverConstructor
+      | undefined;
+    if (ResizeObserverImpl) {
+      this.observer = new ResizeObserverImpl(this.schedule);
+      this.observer.observe(target);
+    } else {
+      // Older browsers: re-measure on the events that usually change height.
+      window.addEventListener("resize", this.schedule);
+      document.addEventListener("load", this.schedule, true);
+      const fonts = (document as any).fonts;
+      if (fonts && fonts.ready) fonts.ready.then(this.schedule);
+    }
+    this.schedule();
+  }
+
+  stop(): void {
+    if (this.observer) this.observer.disconnect();
+    window.removeEventListener("resize", this.schedule);
+    document.removeEventListener("load", this.schedule, true);
+    if (this.pendingFrame !== null) window.cancelAnimationFrame(this.pendingFrame);
+    this.pendingFrame = null;
+  }
+
+  /** Pins the frame to `height` pixels, or follows the content if undefined. */
+  setFixedHeight(height?: number): void {
+    if (height !== this.fixedHeight) {
+      this.fixedHeight = height;
+      this.schedule();
+    }
+  }
+
+  schedule = (): void => {
+    if (this.pendingFrame !== null) return;
+    this.pendingFrame = window.requestAnimationFrame(() => {
+      this.pendingFrame = null;
+      const height =
+        this.fixedHeight !== undefined ? this.fixedHeight : document.body.scrollHeight;
+      if (height !== this.lastHeight) {
+        this.lastHeight = height;
+        debugStats.heightMessages++;
+        Streamlit.setFrameHeight(height);
+      }
+    });
+  };
+}
@@ -0,0 +1,52 @@
+/**
+ * Deferred image loading. Each card image waits until it comes within its
+ * card's `imageLoadMargin` of the viewport; one IntersectionObserver per
+ * margin watches every waiting image of the frame. Card frames are
+ * same-origin, so the margin applies to the page's viewport, not just the
+ * frame's.
+ */
+const observers = new Map<number, IntersectionObserver>();
+const callbacks = new WeakMap<Element, () => void>();
+
+const observerFor = (marginPx: number): IntersectionObserver => {
+  let observer = observers.get(marginPx);
+  if (!observer) {
+    const created = new IntersectionObserver(
+      entries =>
+        entries.forEach(entry => {
+          if (!entry.isIntersecting) return;
+          const callback = callbacks.get(entry.target);
+          callbacks.delete(entry.target);
+          created.unobserve(entry.target);
+          if (callback) callback();
+        }),
+      { rootMargin: `${marginPx}px` }
+    );
+    observers.set(marginPx, created);
+    observer = created;
+  }
+  return observer;
+};
+
+/**
+ * Calls `callback` once `element` is within `marginPx` of the viewport, or
+ * right away where IntersectionObserver is missing. Returns a function
+ * that stops waiting.
+ */
+export const whenNearViewport = (
+  element: Element,
+  marginPx: number,
+  callback: () => void
+): (() => void) => {
+  if (typeof IntersectionObserver === "undefined") {
+    callback();
+    return () => undefined;
+  }
+  const observer = observerFor(marginPx);
+  callbacks.set(element, callback);
+  observer.observe(element);
+  return () => {
+    callbacks.delete(element);
+    observer.unobserve(element);
+  };
+};
@@ -0,0 +1,76 @@
+import { CardArgs } from "./types";
+
+/**
+ * Live updates pushed with `push_card_updates`. Python renders a
+ * zero-height channel frame for them, which posts each batch to every
+ * frame of the page; card frames keep the fields pushed to their cards as
+ * overrides of their args, so an update never waits for a rerun.
+ */
+export interface LiveBatch {
+  // Card key -> props to override; null stops overriding a prop.
+  [cardKey: string]: { [prop: string]: string | null };
+}
+
+const MESSAGE_TYPE = "streamlit_product_card.live";
+
+/** Posts `batch` to the other frames of the page. */
+export const publishLiveUpdates = (batch: LiveBatch): void => {
+  const frames = window.parent.frames;
+  for (let i = 0; i < frames.length; i++) {
+    if (frames[i] !== window) frames[i].postMessage({ type: MESSAGE_TYPE, batch }, "*");
+  }
+};
+
+/** Calls `listener` with every batch another frame publishes. */
+export const subscribeToLiveUpdates = (
+  listener: (batch: LiveBatch) => void
+): (() => void) => {
+  const onMessage = (e: MessageEvent): void => {
+    if (e.data && e.data.type === MESSAGE_TYPE) listener(e.data.batch);
+  };
+  window.addEventListener("message", onMessage);
+  return () => window.removeEventListener("message", onMessage);
+};
+
+/**
+ * The overrides a frame received, by card key. An update replaces only the
+ * override objects of the keys it names, and a card keeps its identity
+ * until its own overrides change, so the memoized card components of every
+ * other card skip rendering.
+ */
+export class LiveOverrides {
+  private values = new Map<string, Partial<CardArgs>>();
+  private applied = new WeakMap<CardArgs, { overrides: Partial<CardArgs>; card: CardArgs }>();
+
+  /** Merges `batch`; returns whether it named any of `cardKeys`, if given. */
+  update(batch: LiveBatch, cardKeys?: Array<string | undefined>): boolean {
+    Object.keys(batch).forEach(cardKey => {
+      const props = batch[cardKey];
+      const overrides: { [prop: string]: any } = { ...this.values.get(cardKey) };
+      Object.keys(props).forEach(prop => {
+        if (props[prop] === null) {
+          delete overrides[prop];
+        } else {
+          overrides[prop] = props[prop];
+        }
+      });
+      if (Object.keys(overrides).length > 0) {
+        this.values.set(cardKey, overrides as Partial<CardArgs>);
+      } else {
+        this.values.delete(cardKey);
+      }
+    });
+    return !cardKeys || cardKeys.some(cardKey => cardKey !== undefined && cardKey in batch);
+  }
+
+  /** `card` with the overrides of its key, the same object until they change. */
+  apply = (card: CardArgs): CardArgs => {
+    const overrides = card.liveKey ? this.values.get(card.liveKey) : undefined;
+    if (!overrides) return card;
+    const cached = this.applied.get(card);
+    if (cached && cached.overrides === overrides) return cached.card;
+    const merged = { ...card, ...overrides };
+    this.applied.set(card, { overrides, card: merged });
+    return merged;
+  };
+}
@@ -0,0 +1,14 @@
+// Streamlit media files are served at `<base path>/media/...`, while this
+// frame lives at `<base path>/component/<name>/index.html`, so root-relative
+// media URLs are prefixed with the base path the app is served under.
+const BASE_PATH = window.location.pathname.split("/component/")[0];
+
+export const resolveMediaUrl = (url?: string): string | undefined =>
+  url && url.startsWith("/media/") ? `${BASE_PATH}${url}` : url;
+
+export const resolveSrcSet = (srcSet?: string): string | undefined =>
+  srcSet &&
+  srcSet
+    .split(", ")
+    .map(candidate => resolveMediaUrl(candidate))
+    .join(", ");
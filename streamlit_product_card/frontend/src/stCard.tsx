@@ -1,104 +1,596 @@
 import {
+  ArrowTable,
   Streamlit,
   StreamlitComponentBase,
   withStreamlitConnection,
 } from "streamlit-component-lib";
 import React, { ReactNode } from "react";
-import styled from "@emotion/styled";
-import { Global, css } from '@emotion/react'; 
-import * as CSS from 'csstype'; 
-
-const kebabToCamel = (str: string): string => {
-  return str.replace(/-([a-z0-9])/g, (match, char) => char.toUpperCase());
-};
-
-const transformKebabCaseStyles = (styleObj?: { [key: string]: any }): React.CSSProperties => {
-  if (!styleObj) return {};
-  const newStyles: { [key: string]: any } = {}; 
-  for (const key in styleObj) {
-    if (Object.prototype.hasOwnProperty.call(styleObj, key)) {
-      newStyles[kebabToCamel(key)] = styleObj[key];
+import { ClassNames } from "@emotion/react";
+import { ArrowCardList, CardList, ColumnCardList, arrayCardList } from "./catalog";
+import { CatalogIndex } from "./catalogIndex";
+import CatalogToolbar from "./CatalogToolbar";
+import { debugStats } from "./debugStats";
+import { FrameHeightReporter } from "./frameHeight";
+import {
+  LiveBatch,
+  LiveOverrides,
+  publishLiveUpdates,
+  subscribeToLiveUpdates,
+} from "./live";
+import { whenNearViewport } from "./lazyImages";
+import { resolveMediaUrl, resolveSrcSet } from "./media";
+import { CardSlot, getCardOverrides } from "./styleCache";
+import {
+  CardTheme,
+  getTheme,
+  mergeThemeStyles,
+  storeTheme,
+  subscribeToThemes,
+} from "./themeStore";
+import {
+  CardArgs,
+  CatalogView,
+  FeedArgs,
+  FontSpec,
+  ImageSource,
+  MobileBreakpointBehavior,
+  StreamlitTheme,
+} from "./types";
+import "./card.css";
+
+// Only virtualized grids and cards with a `font_url` need these, so they are
+// split into chunks loaded on first use instead of growing every frame's
+// initial bundle.
+const VirtualGrid = React.lazy(() => import("./VirtualGrid"));
+const FontStyles = React.lazy(() => import("./fonts"));
+
+const renderFonts = (fonts: FontSpec[]): ReactNode =>
+  fonts.length > 0 && (
+    <React.Suspense fallback={null}>
+      <FontStyles fonts={fonts} />
+    </React.Suspense>
+  );
+
+// The distinct fonts of `cards`, in order of first use.
+const cardFonts = (cards: Array<Partial<CardArgs>>): FontSpec[] => {
+  const fonts = new Map<string, FontSpec>();
+  cards.forEach(({ fontUrl, fontPreload }) => {
+    if (fontUrl && !fonts.has(fontUrl)) {
+      fonts.set(fontUrl, { url: fontUrl, preload: fontPreload });
     }
-  }
-  return newStyles as React.CSSProperties; 
+  });
+  return Array.from(fonts.values());
 };
 
-type PicturePosition = "top" | "bottom" | "left" | "right";
-type MobileBreakpointBehavior = "stack top" | "stack bottom" | "shrink" | "none";
-type EmotionCompatibleStyle = { [key: string]: any };
+interface ClickEvent {
+  seq: number;
+  timestamp: number;
+  cardIndex?: number;
+  productKey?: string | number;
+}
 
+// A single card is sent as `card`, JSON-encoded; `product_grid` sends a
+// `cards` list, or a `catalog` table with its `looks`;
+// `product_cards_from_dataframe` sends `cardColumns` with one look, or a
+// `catalog`.
 interface ProductCardArgs {
-  productName: string;
-  description?: string[];
-  price?: string;
-  productImage?: string;
-  buttonText: string; 
-  picturePosition: PicturePosition;
-  enableAnimation: boolean;
-  imageWidthPercent: number;
-  imageAspectRatio: string; 
-  imageObjectFit: CSS.Property.ObjectFit; 
-  mobileBreakpointBehavior: MobileBreakpointBehavior;
-  fontUrl?: string;
-  styles: { 
-    card?: EmotionCompatibleStyle; 
-    title?: EmotionCompatibleStyle;
-    text?: EmotionCompatibleStyle;
-    price?: EmotionCompatibleStyle;
-    button?: EmotionCompatibleStyle;
-    image?: EmotionCompatibleStyle; 
-  };
+  card?: string;
+  // Last click sequence Python has handled, per frame instance, so
+  // acknowledged events can be dropped from the queue. JSON-encoded.
+  acks?: string;
+  // Body of the card's `themeId`, sent with the first card of a session
+  // using it.
+  themeBody?: CardTheme;
+  cards?: CardArgs[];
+  // The per-card fields of a DataFrame grid, one array per field, and its
+  // shared fields as the only entry of `looks`.
+  cardColumns?: { [field: string]: any[] };
+  // `transport="arrow"`: per-card fields as columns, plus a `styleId`
+  // column indexing into `looks`.
+  catalog?: ArrowTable;
+  looks?: Array<Partial<CardArgs>>;
+  // Set for `background=True`: whether the card's callback is still
+  // running, or which of the grid's cards have one running. Clicked cards
+  // are pending until Python acknowledges the click, and a frame with
+  // pending cards asks for a rerun every `pollMs`.
+  pending?: boolean | number[];
+  pollMs?: number;
+  // Set for the channel element of `push_card_updates`, which renders
+  // nothing and forwards the batch to the card frames.
+  liveUpdates?: LiveBatch;
+  // Set while a metrics hook is installed in Python: attach timing reports
+  // to the values this frame sends.
+  reportTimings?: boolean;
+  // Set for `searchable=True`: show a toolbar that searches, filters and
+  // sorts the cards in the browser, with a price range if cards have prices.
+  search?: { priceRange: boolean };
+  // Set for `product_feed`: `cards` is one chunk of the feed, to be added
+  // to the chunks received before.
+  feed?: FeedArgs;
+  // Bodies of every theme the grid's cards reference.
+  themes?: { [themeId: string]: CardTheme };
+  columns?: number;
+  gap?: number;
+  virtualized?: boolean;
+  height?: number;
+  rowHeight?: number;
+  overscanRows?: number;
 }
 
 interface ProductCardProps {
   args: ProductCardArgs;
-  theme?: {
-    font?: string;
-    secondaryBackgroundColor?: string;
-    textColor?: string;
-    primaryColor?: string;
-  };
+  theme?: StreamlitTheme;
 }
 
-const globalStyles = css`
-  body {
-    margin: 0; 
-    padding: 10px; 
-    box-sizing: border-box;
-  }
-  #root { 
-    width: 100%;
-    height: 100%;
-  }
-`;
+// Matches the body padding in card.css.
+const BODY_PADDING_PX = 10;
+// Matches the height plus bottom margin of .pc-toolbar in card.css.
+const TOOLBAR_HEIGHT_PX = 48;
+// Upper bound on unacknowledged clicks kept for resending.
+const MAX_QUEUED_CLICKS = 100;
+// How long a card waits for another frame to share a theme body before
+// asking Python to send it again.
+const MISSING_THEME_TIMEOUT_MS = 1500;
+
+// The toolbar selection of a searchable grid that shows every card.
+const ALL_CARDS: CatalogView = { query: "", sort: "default", minPrice: "", maxPrice: "" };
+
+const isAllCards = (view: CatalogView): boolean =>
+  view.query.trim() === "" &&
+  view.sort === "default" &&
+  view.minPrice === "" &&
+  view.maxPrice === "";
+
+// The Streamlit theme reaches card.css as custom properties on the root
+// element; they are set after each render, before the browser paints.
+const setThemeVariables = (theme?: StreamlitTheme): void => {
+  if (!theme) return;
+  const variables: { [name: string]: string | undefined } = {
+    "--pc-font": theme.font && `${theme.font}, sans-serif`,
+    "--pc-bg": theme.secondaryBackgroundColor,
+    "--pc-text-color": theme.textColor,
+    "--pc-primary-color": theme.primaryColor,
+  };
+  const rootStyle = document.documentElement.style;
+  Object.keys(variables).forEach(name => {
+    const value = variables[name];
+    if (value) {
+      rootStyle.setProperty(name, value);
+    } else {
+      rootStyle.removeProperty(name);
+    }
+  });
+};
 
 class ProductCardComponent extends StreamlitComponentBase<ProductCardProps> {
+  private value: { [key: string]: any } = {};
+  // Identifies this mounted frame, so Python can tell instances apart even
+  // when several cards share a name or have no key.
+  private instanceId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+  private lastSeq = 0;
+  private clickQueue: ClickEvent[] = [];
+  private frameHeight = new FrameHeightReporter();
+  private unsubscribeFromThemes?: () => void;
+  private missingThemeTimer?: number;
+  private themedCards = new WeakMap<CardArgs, CardArgs>();
+  // The decoded `card`, kept while Python sends the same text, so an
+  // unchanged card keeps its identity and doesn't render again.
+  private decodedCard?: { source: string; card: CardArgs };
+  private decodedAcks?: { source: string; acks: { [instanceId: string]: number } };
+  private cardList?: { source: object; list: CardList };
+  // Card index (-1 for a single card) -> sequence of its last click, while
+  // Python hasn't acknowledged it.
+  private clickedPending = new Map<number, number>();
+  private pendingCards?: { source: number[]; cards: Set<number> };
+  private pollTimer?: number;
+  private live = new LiveOverrides();
+  private unsubscribeFromLive?: () => void;
+  private publishedBatch?: LiveBatch;
+  // Timing report: when the current args arrived, and how long they took
+  // to reach the screen.
+  private lastArgs?: ProductCardArgs;
+  private argsReceivedAt?: number;
+  private paintMs?: number;
+  private paintSeq = 0;
+  // Toolbar of a searchable grid: the shopper's selection, and the index
+  // answering it, built on first use for the current cards.
+  private catalogView = ALL_CARDS;
+  private viewVersion = 0;
+  private catalogIndex?: { list: CardList; index: CatalogIndex };
+  private selection?: { list: CardList; view: CatalogView; cards: number[] };
+  // Infinite-scroll feed: the cards of every chunk received so far, the
+  // current chunk starting at `start`, and the element whose approach to
+  // the viewport requests the next chunk.
+  private feed?: {
+    id: string;
+    chunk: number;
+    start: number;
+    source: CardArgs[];
+    cards: CardArgs[];
+    list: CardList;
+  };
+  private missedChunksOf?: string;
+  private feedEnd = React.createRef<HTMLDivElement>();
+  private watchedChunk?: string;
+  private stopWatchingFeedEnd?: () => void;
+
   componentDidMount(): void {
+    setThemeVariables(this.props.theme);
     Streamlit.setComponentReady();
-    Streamlit.setFrameHeight();
+    this.unsubscribeFromThemes = subscribeToThemes(() => this.forceUpdate());
+    this.unsubscribeFromLive = subscribeToLiveUpdates(this.onLiveUpdates);
+    this.publishLiveUpdates();
+    this.updateFrameHeight();
+    this.frameHeight.start(document.body);
+    this.checkMissingThemes();
+    this.measurePaint();
+    this.pollWhilePending();
+    this.watchFeedEnd();
   }
 
   componentDidUpdate(): void {
-    Streamlit.setFrameHeight();
+    setThemeVariables(this.props.theme);
+    this.dropAcknowledgedClicks();
+    this.updateFrameHeight();
+    this.checkMissingThemes();
+    this.measurePaint();
+    this.pollWhilePending();
+    this.publishLiveUpdates();
+    this.watchFeedEnd();
+    this.requestFeedRestart();
   }
 
-  private sendClickEvent = (): void => {
-    Streamlit.setComponentValue({ clickEventId: Date.now() });
+  componentWillUnmount(): void {
+    if (this.unsubscribeFromThemes) this.unsubscribeFromThemes();
+    if (this.unsubscribeFromLive) this.unsubscribeFromLive();
+    window.clearTimeout(this.missingThemeTimer);
+    window.clearTimeout(this.pollTimer);
+    if (this.stopWatchingFeedEnd) this.stopWatchingFeedEnd();
+    this.frameHeight.stop();
   }
 
-  private onCardClick = (): void => {
-    if (!this.props.args.buttonText || this.props.args.buttonText.trim() === "") {
-        this.sendClickEvent();
+  private sendValue(update: { [key: string]: any }): void {
+    // The component value replaces the previous one, so earlier fields
+    // (e.g. the last click) are carried along.
+    this.value = { ...this.value, ...update };
+    Streamlit.setComponentValue(this.value);
+  }
+
+  private publishLiveUpdates(): void {
+    const { liveUpdates } = this.props.args;
+    if (liveUpdates && liveUpdates !== this.publishedBatch) {
+      this.publishedBatch = liveUpdates;
+      publishLiveUpdates(liveUpdates);
+    }
+  }
+
+  // A single card only re-renders for batches naming it; a grid re-renders
+  // its root, and only cards whose overrides changed render again.
+  private onLiveUpdates = (batch: LiveBatch): void => {
+    const { args } = this.props;
+    if (args.liveUpdates) return;
+    const card = this.singleCard();
+    if (this.live.update(batch, card ? [card.liveKey] : undefined)) {
+      this.forceUpdate();
     }
   };
 
-  private onButtonClick = (
-    e: React.MouseEvent<HTMLButtonElement>
-  ): void => {
-    e.stopPropagation(); 
-    this.sendClickEvent();
+  // The grid's cards, or undefined for a single card. Rebuilt only when
+  // Python sends new ones, so rows already read keep their identity.
+  private getCardList(): CardList | undefined {
+    const { cards, cardColumns, catalog, looks, feed } = this.props.args;
+    if (feed && cards) return this.feedCards(feed, cards);
+    const source = catalog || cardColumns || cards;
+    if (!source) return undefined;
+    if (!this.cardList || this.cardList.source !== source) {
+      const list = catalog
+        ? new ArrowCardList(catalog, looks || [])
+        : cardColumns
+        ? new ColumnCardList(cardColumns, (looks || [])[0] || {})
+        : arrayCardList(cards || []);
+      this.cardList = { source, list };
+    }
+    return this.cardList.list;
+  }
+
+  // The chunks of a feed received so far, as one list. A chunk sent again
+  // (on a rerun for a click, say) replaces the current one; the next one
+  // is appended. Earlier cards keep their identity, so they don't render
+  // again.
+  private feedCards(feed: FeedArgs, chunk: CardArgs[]): CardList {
+    const current = this.feed;
+    if (current && current.source === chunk) return current.list;
+    let earlier: CardArgs[] = [];
+    if (current && current.id === feed.id && feed.chunk === current.chunk) {
+      earlier = current.cards.slice(0, current.start);
+    } else if (current && current.id === feed.id && feed.chunk === current.chunk + 1) {
+      earlier = current.cards;
+    } else if (feed.chunk > 0) {
+      // Chunks were missed, e.g. the frame was remounted.
+      this.missedChunksOf = feed.id;
+    }
+    const cards = earlier.concat(chunk);
+    this.feed = {
+      id: feed.id,
+      chunk: feed.chunk,
+      start: earlier.length,
+      source: chunk,
+      cards,
+      list: arrayCardList(cards),
+    };
+    return this.feed.list;
+  }
+
+  // A frame that missed chunks can't show the feed in order; Python
+  // starts it over with a new id.
+  private requestFeedRestart(): void {
+    const { feed } = this.props.args;
+    if (feed && this.missedChunksOf === feed.id && this.value.restart !== feed.id) {
+      this.sendValue({ instanceId: this.instanceId, restart: feed.id });
+    }
+  }
+
+  // Waits, once per chunk, for the end of a feed to come near the viewport.
+  private watchFeedEnd(): void {
+    const { feed, virtualized } = this.props.args;
+    const element = this.feedEnd.current;
+    const chunk =
+      feed && !feed.done && !virtualized && element ? `${feed.id}:${feed.chunk}` : undefined;
+    if (chunk === this.watchedChunk) return;
+    if (this.stopWatchingFeedEnd) this.stopWatchingFeedEnd();
+    this.stopWatchingFeedEnd = undefined;
+    this.watchedChunk = chunk;
+    if (feed && chunk && element) {
+      this.stopWatchingFeedEnd = whenNearViewport(element, feed.loadMargin, this.requestMoreCards);
+    }
+  }
+
+  // Asks for the chunk after the current one, once.
+  private requestMoreCards = (): void => {
+    const { feed } = this.props.args;
+    if (!feed || feed.done) return;
+    const { more } = this.value;
+    if (more && more[0] === feed.id && more[1] === feed.chunk) return;
+    this.sendValue({ instanceId: this.instanceId, more: [feed.id, feed.chunk] });
   };
 
+  private singleCard(): CardArgs | undefined {
+    const { card } = this.props.args;
+    if (!card) return undefined;
+    if (!this.decodedCard || this.decodedCard.source !== card) {
+      this.decodedCard = { source: card, card: JSON.parse(card) };
+    }
+    return this.decodedCard.card;
+  }
+
+  // What sets themes and fonts: each distinct look of an Arrow catalog or
+  // DataFrame grid, otherwise every card.
+  private cardLooks(): Array<Partial<CardArgs>> {
+    const { args } = this.props;
+    if (args.feed && this.feed) return this.feed.cards;
+    const card = this.singleCard();
+    return args.looks || args.cards || (card ? [card] : []);
+  }
+
+  private missingThemeIds(): string[] {
+    const missing = new Set<string>();
+    this.cardLooks().forEach(card => {
+      if (card.themeId && !getTheme(card.themeId)) missing.add(card.themeId);
+    });
+    return Array.from(missing);
+  }
+
+  private checkMissingThemes(): void {
+    if (this.missingThemeTimer !== undefined) return;
+    if (this.missingThemeIds().length === 0) return;
+    this.missingThemeTimer = window.setTimeout(() => {
+      this.missingThemeTimer = undefined;
+      const missingThemeIds = this.missingThemeIds();
+      if (missingThemeIds.length > 0) {
+        this.sendValue({ missingThemeIds, themeRequestId: Date.now() });
+      }
+    }, MISSING_THEME_TIMEOUT_MS);
+  }
+
+  private storeThemes(): void {
+    const { args } = this.props;
+    const card = this.singleCard();
+    if (card && card.themeId && args.themeBody) storeTheme(card.themeId, args.themeBody);
+    if (args.themes) {
+      const themes = args.themes;
+      Object.keys(themes).forEach(themeId => storeTheme(themeId, themes[themeId]));
+    }
+  }
+
+  // Returns `card` with its theme's styles and font applied underneath its
+  // own. Results are cached per args object so cards keep their identity.
+  private applyTheme = (card: CardArgs): CardArgs => {
+    if (!card.themeId) return card;
+    const cached = this.themedCards.get(card);
+    if (cached) return cached;
+    const theme = getTheme(card.themeId);
+    if (!theme) return card;
+    const themed = {
+      ...card,
+      styles: mergeThemeStyles(theme, card.styles),
+      fontUrl: card.fontUrl || theme.fontUrl,
+      fontPreload: card.fontUrl ? card.fontPreload : theme.fontPreload,
+    };
+    this.themedCards.set(card, themed);
+    return themed;
+  };
+
+  // A virtualized grid scrolls inside a fixed viewport, so the frame is
+  // pinned to that height instead of growing with the content. Otherwise
+  // the reporter's ResizeObserver follows content changes on its own.
+  private updateFrameHeight(): void {
+    const { virtualized, height, liveUpdates, search } = this.props.args;
+    if (liveUpdates) {
+      this.frameHeight.setFixedHeight(0);
+      return;
+    }
+    const toolbarHeight = search ? TOOLBAR_HEIGHT_PX : 0;
+    this.frameHeight.setFixedHeight(
+      virtualized && height ? height + toolbarHeight + 2 * BODY_PADDING_PX : undefined
+    );
+  }
+
+  // Every click gets the next sequence number and is queued until Python
+  // acknowledges it; each value sent carries the whole queue, so clicks
+  // arriving between two reruns are delivered together instead of the
+  // later one replacing the earlier.
+  private sendClickEvent = (cardIndex?: number): void => {
+    this.dropAcknowledgedClicks();
+    this.lastSeq += 1;
+    const productKey =
+      this.feed && cardIndex !== undefined ? this.feed.cards[cardIndex].productKey : undefined;
+    this.clickQueue.push({ seq: this.lastSeq, timestamp: Date.now(), cardIndex, productKey });
+    if (this.clickQueue.length > MAX_QUEUED_CLICKS) {
+      this.clickQueue = this.clickQueue.slice(-MAX_QUEUED_CLICKS);
+    }
+    this.sendValue({
+      instanceId: this.instanceId,
+      events: this.clickQueue.slice(),
+      timings: this.timingReport(),
+      view: this.viewReport(),
+    });
+    if (this.props.args.pollMs) {
+      this.clickedPending.set(cardIndex === undefined ? -1 : cardIndex, this.lastSeq);
+      this.forceUpdate();
+    }
+  }
+
+  // The cards the toolbar selects, in order, or undefined for all of them.
+  private selectedCards(list: CardList): number[] | undefined {
+    const view = this.catalogView;
+    if (isAllCards(view)) return undefined;
+    const { selection } = this;
+    if (selection && selection.list === list && selection.view === view) return selection.cards;
+    if (!this.catalogIndex || this.catalogIndex.list !== list) {
+      this.catalogIndex = { list, index: new CatalogIndex(list) };
+    }
+    const cards = this.catalogIndex.index.select(view);
+    this.selection = { list, view, cards };
+    return cards;
+  }
+
+  private onViewChange = (view: CatalogView): void => {
+    this.catalogView = view;
+    this.viewVersion += 1;
+    this.forceUpdate();
+  };
+
+  private onViewSubmit = (): void => {
+    this.sendValue({ view: this.viewReport() });
+  };
+
+  // Sent along with clicks, so Python knows what the shopper was looking at.
+  private viewReport(): { [name: string]: string | number | null } | undefined {
+    const list = this.getCardList();
+    if (!this.props.args.search || !list) return undefined;
+    const { query, sort, minPrice, maxPrice } = this.catalogView;
+    const selected = this.selectedCards(list);
+    const price = (text: string): number | null =>
+      text.trim() === "" || isNaN(Number(text)) ? null : Number(text);
+    return {
+      query,
+      sort,
+      minPrice: price(minPrice),
+      maxPrice: price(maxPrice),
+      matches: selected ? selected.length : list.length,
+    };
+  }
+
+  // The last sequence of this frame Python has handled, if it said.
+  private acknowledgedSeq(): number | undefined {
+    const { acks } = this.props.args;
+    if (!acks) return undefined;
+    if (!this.decodedAcks || this.decodedAcks.source !== acks) {
+      this.decodedAcks = { source: acks, acks: JSON.parse(acks) };
+    }
+    return this.decodedAcks.acks[this.instanceId];
+  }
+
+  private ackedSeq(): number {
+    return this.acknowledgedSeq() || 0;
+  }
+
+  private isPending = (cardIndex?: number): boolean => {
+    const { pending } = this.props.args;
+    if (cardIndex === undefined) {
+      if (pending === true) return true;
+    } else if (Array.isArray(pending) && pending.length > 0) {
+      if (!this.pendingCards || this.pendingCards.source !== pending) {
+        this.pendingCards = { source: pending, cards: new Set(pending) };
+      }
+      if (this.pendingCards.cards.has(cardIndex)) return true;
+    }
+    const clickedSeq = this.clickedPending.get(cardIndex === undefined ? -1 : cardIndex);
+    return clickedSeq !== undefined && clickedSeq > this.ackedSeq();
+  };
+
+  private anyPending(): boolean {
+    const { pending } = this.props.args;
+    if (pending === true || (Array.isArray(pending) && pending.length > 0)) return true;
+    const ackedSeq = this.ackedSeq();
+    let clicked = false;
+    this.clickedPending.forEach(seq => {
+      if (seq > ackedSeq) clicked = true;
+    });
+    return clicked;
+  }
+
+  // Python only learns that a background callback finished on a rerun.
+  private pollWhilePending(): void {
+    const { pollMs } = this.props.args;
+    if (!pollMs || this.pollTimer !== undefined || !this.anyPending()) return;
+    this.pollTimer = window.setTimeout(() => {
+      this.pollTimer = undefined;
+      if (!this.anyPending()) return;
+      this.sendValue({ poll: Date.now() });
+      this.pollWhilePending();
+    }, pollMs);
+  }
+
+  // The second animation frame after a commit starts once the first one,
+  // which includes the committed DOM, has been painted.
+  private measurePaint(): void {
+    const start = this.argsReceivedAt;
+    if (start === undefined) return;
+    this.argsReceivedAt = undefined;
+    window.requestAnimationFrame(() =>
+      window.requestAnimationFrame(() => {
+        this.paintMs = performance.now() - start;
+        this.paintSeq += 1;
+      })
+    );
+  }
+
+  private timingReport(): { [name: string]: number | string } | undefined {
+    if (!this.props.args.reportTimings || this.paintMs === undefined) return undefined;
+    const images = performance
+      .getEntriesByType("resource")
+      .filter(entry => (entry as PerformanceResourceTiming).initiatorType === "img");
+    return {
+      id: `${this.paintSeq}:${images.length}`,
+      argsToPaintMs: Math.round(this.paintMs),
+      images: images.length,
+      imageLoadMs: Math.round(
+        images.reduce((slowest, entry) => Math.max(slowest, entry.duration), 0)
+      ),
+    };
+  }
+
+  private dropAcknowledgedClicks(): void {
+    const ackedSeq = this.acknowledgedSeq();
+    if (ackedSeq !== undefined) {
+      this.clickQueue = this.clickQueue.filter(event => event.seq > ackedSeq);
+      this.clickedPending.forEach((seq, cardIndex) => {
+        if (seq <= ackedSeq) this.clickedPending.delete(cardIndex);
+      });
+    }
+  }
+
   render(): ReactNode {
     const { args, theme } = this.props;
     if (!theme) {
@@ -109,80 +601,312 @@ class ProductCardComponent extends StreamlitComponentBase<ProductCardProps> {
       );
     }
 
+    if (args.liveUpdates) return null;
+
+    if (args.reportTimings && args !== this.lastArgs) {
+      this.argsReceivedAt = performance.now();
+    }
+    this.lastArgs = args;
+    this.storeThemes();
+
+    const cards = this.getCardList();
+    if (cards) {
+      const { columns = 3, gap = 16 } = args;
+      const renderCard = (i: number): ReactNode => (
+        <ProductCard
+          card={this.live.apply(this.applyTheme(cards.get(i)))}
+          index={i}
+          pending={this.isPending(i)}
+          onClick={this.sendClickEvent}
+        />
+      );
+      const fonts = cardFonts(
+        this.cardLooks().map(look => this.applyTheme(look as CardArgs))
+      );
+      // Positions in the grid -> card indices, when the toolbar selects.
+      const selected = args.search ? this.selectedCards(cards) : undefined;
+      const itemCount = selected ? selected.length : cards.length;
+      const cardAt = (position: number): number => (selected ? selected[position] : position);
+      return (
+        <>
+          {renderFonts(fonts)}
+          {args.search && (
+            <CatalogToolbar
+              view={this.catalogView}
+              priceRange={args.search.priceRange}
+              matches={itemCount}
+              total={cards.length}
+              onChange={this.onViewChange}
+              onSubmit={this.onViewSubmit}
+            />
+          )}
+          {args.virtualized ? (
+            <React.Suspense fallback={null}>
+              <VirtualGrid
+                // A new selection starts scrolled to the top.
+                key={this.viewVersion}
+                itemCount={itemCount}
+                columns={columns}
+                gap={gap}
+                rowHeight={args.rowHeight || 420}
+                height={args.height || 600}
+                overscanRows={args.overscanRows === undefined ? 2 : args.overscanRows}
+                renderItem={position => renderCard(cardAt(position))}
+                onNearEnd={args.feed && !args.feed.done ? this.requestMoreCards : undefined}
+                endMargin={args.feed && args.feed.loadMargin}
+              />
+            </React.Suspense>
+          ) : (
+            <div
+              className="pc-grid"
+              style={{ "--pc-columns": Math.max(1, columns), "--pc-gap": `${gap}px` } as React.CSSProperties}
+            >
+              {Array.from({ length: itemCount }, (_, position) => {
+                const i = cardAt(position);
+                return <React.Fragment key={i}>{renderCard(i)}</React.Fragment>;
+              })}
+            </div>
+          )}
+          {args.feed && !args.feed.done && !args.virtualized && (
+            <div ref={this.feedEnd} className="pc-feed-end" aria-hidden />
+          )}
+        </>
+      );
+    }
+
+    const single = this.singleCard();
+    if (!single) return null;
+    const card = this.live.apply(this.applyTheme(single));
+    return (
+      <>
+        {renderFonts(cardFonts([card]))}
+        <ProductCard card={card} pending={this.isPending()} onClick={this.sendClickEvent} />
+      </>
+    );
+  }
+}
+
+interface ProductCardViewProps {
+  card: CardArgs;
+  index?: number;
+  pending?: boolean;
+  onClick: (index?: number) => void;
+}
+
+type SlotClass = (slot: CardSlot) => string | undefined;
+
+const noOverrides: SlotClass = () => undefined;
+
+const classes = (...names: Array<string | false | undefined>): string =>
+  names.filter(Boolean).join(" ");
+
+// Layout classes of `card.css` for each mobile breakpoint behavior.
+const MOBILE_CLASSES: { [behavior in MobileBreakpointBehavior]: string | undefined } = {
+  "stack top": "pc-card--stack-top",
+  "stack bottom": "pc-card--stack-bottom",
+  shrink: undefined,
+  none: undefined,
+};
+
+interface CardImageProps {
+  productName: string;
+  productImage?: string;
+  productImageSrcSet?: string;
+  productImageSizes?: string;
+  productImageSources?: ImageSource[];
+  productImagePlaceholder?: string;
+  productImageWidth?: number;
+  productImageHeight?: number;
+  imageAspectRatio: string;
+  loadMargin?: number | null;
+  className?: string;
+}
+
+interface CardImageState {
+  // Close enough to the viewport to be fetched.
+  near: boolean;
+  loaded: boolean;
+}
+
+// Its own memoized component, so cards re-rendering for a new price or
+// stock badge leave the image alone. The image is only fetched near the
+// viewport; until it has loaded, its placeholder (a color or a blurred
+// thumbnail) fills the space reserved for it.
+class CardImage extends React.PureComponent<CardImageProps, CardImageState> {
+  state: CardImageState = { near: !this.isLazy(), loaded: false };
+
+  private container = React.createRef<HTMLDivElement>();
+  private stopWaiting?: () => void;
+
+  componentDidMount(): void {
+    const element = this.container.current;
+    if (!this.state.near && element) {
+      this.stopWaiting = whenNearViewport(
+        element,
+        this.props.loadMargin as number,
+        () => this.setState({ near: true })
+      );
+    }
+  }
+
+  componentDidUpdate(prevProps: CardImageProps): void {
+    // A virtualized grid reuses the component for another card.
+    if (prevProps.productImage !== this.props.productImage && this.state.loaded) {
+      this.setState({ loaded: false });
+    }
+  }
+
+  componentWillUnmount(): void {
+    if (this.stopWaiting) this.stopWaiting();
+  }
+
+  private isLazy(): boolean {
+    const { loadMargin } = this.props;
+    return loadMargin !== null && loadMargin !== undefined;
+  }
+
+  // Also called on errors, so a broken image shows as it used to.
+  private onLoad = (): void => this.setState({ loaded: true });
+
+  render(): ReactNode {
+    const {
+      productName,
+      productImage,
+      productImageSrcSet,
+      productImageSizes,
+      productImageSources = [],
+      productImagePlaceholder: placeholder,
+      productImageWidth: width,
+      productImageHeight: height,
+      imageAspectRatio,
+      className,
+    } = this.props;
+    const { near, loaded } = this.state;
+    const isNativeRatio = imageAspectRatio === "native";
+    const isThumbnail = !!placeholder && placeholder.lastIndexOf("data:", 0) === 0;
+
+    const img = (
+      <img
+        className={classes(
+          "pc-img",
+          isNativeRatio && "pc-img--native",
+          !loaded && "pc-img--loading",
+          className
+        )}
+        // The image's own ratio, known from Python, reserves its height
+        // before it loads.
+        style={
+          isNativeRatio && width && height
+            ? ({ "--pc-image-ratio": `${width} / ${height}` } as React.CSSProperties)
+            : undefined
+        }
+        src={near ? resolveMediaUrl(productImage) : undefined}
+        srcSet={near ? resolveSrcSet(productImageSrcSet) : undefined}
+        sizes={productImageSizes}
+        width={width}
+        height={height}
+        alt={productName}
+        decoding="async"
+        onLoad={this.onLoad}
+        onError={this.onLoad}
+      />
+    );
+
+    return (
+      <div
+        ref={this.container}
+        className={classes("pc-image", !isNativeRatio && "pc-image--ratio")}
+        style={placeholder && !isThumbnail && !loaded ? { backgroundColor: placeholder } : undefined}
+      >
+        {isThumbnail && !loaded && (
+          <div className="pc-placeholder" style={{ backgroundImage: `url(${placeholder})` }} />
+        )}
+        {productImageSources.length > 0 ? (
+          // `display: contents` keeps the <img> as the flex item.
+          <picture style={{ display: "contents" }}>
+            {productImageSources.map(source => (
+              <source
+                key={source.type}
+                type={source.type}
+                srcSet={near ? resolveSrcSet(source.srcSet) : undefined}
+                sizes={productImageSizes}
+              />
+            ))}
+            {img}
+          </picture>
+        ) : (
+          img
+        )}
+      </div>
+    );
+  }
+}
+
+class ProductCard extends React.PureComponent<ProductCardViewProps> {
+  private onCardClick = (): void => {
+    if (this.props.pending) return;
+    if (!this.props.card.buttonText || this.props.card.buttonText.trim() === "") {
+        this.props.onClick(this.props.index);
+    }
+  };
+
+  private onButtonClick = (
+    e: React.MouseEvent<HTMLButtonElement>
+  ): void => {
+    e.stopPropagation(); 
+    this.props.onClick(this.props.index);
+  };
+
+  private renderImage(slotClass: SlotClass): ReactNode {
+    const { card } = this.props;
+    return (
+      <CardImage
+        productName={card.productName}
+        productImage={card.productImage}
+        productImageSrcSet={card.productImageSrcSet}
+        productImageSizes={card.productImageSizes}
+        productImageSources={card.productImageSources}
+        productImagePlaceholder={card.productImagePlaceholder}
+        productImageWidth={card.productImageWidth}
+        productImageHeight={card.productImageHeight}
+        imageAspectRatio={card.imageAspectRatio}
+        loadMargin={card.imageLoadMargin}
+        className={slotClass("image")}
+      />
+    );
+  }
+
+  private renderCard(slotClass: SlotClass, cardRadius?: string): ReactNode {
+    const { card } = this.props;
     const {
       productName,
       description = [],
       price,
+      stock,
       productImage,
       buttonText, 
       picturePosition,
       enableAnimation,
-      styles, 
-      fontUrl,
+      mobileBreakpointBehavior,
       imageWidthPercent,
       imageAspectRatio,
       imageObjectFit,
-      mobileBreakpointBehavior,
-    } = args;
-
-    // Transform kebab-case keys from Python styles to camelCase for React/Emotion
-    const userCardStyles = transformKebabCaseStyles(styles.card);
-    const userImageStyles = transformKebabCaseStyles(styles.image);
-    const userTextStyles = transformKebabCaseStyles(styles.text);
-    const userTitleStyles = transformKebabCaseStyles(styles.title);
-    const userPriceStyles = transformKebabCaseStyles(styles.price);
-    const userButtonStyles = transformKebabCaseStyles(styles.button);
+    } = card;
 
     const isHorizontalLayout =
       picturePosition === "left" || picturePosition === "right";
-    
-    const showButton = buttonText && buttonText.trim() !== "";
-
-    const defaultRadius = 12;
-    const rawBorderRadius = userCardStyles.borderRadius; 
-    const cardRadius =
-      typeof rawBorderRadius === "string"
-        ? rawBorderRadius
-        : typeof rawBorderRadius === "number"
-        ? `${rawBorderRadius}px`
-        : `${defaultRadius}px`;
-
-    // Define styled components by merging defaults and user styles into a single object
-    const Title = styled.h3({ 
-      margin: 0,
-      fontSize: "clamp(0.9rem, 0.5vw + 0.8rem, 1.2rem)",
-      color: theme.textColor, 
-      fontWeight: 600,
-      ...userTitleStyles, // User styles spread last to override defaults
-    });
-
-    const Text = styled.div({
-      fontSize: "clamp(0.8rem, 0.4vw + 0.7rem, 1rem)",
-      color: theme.textColor,
-      margin: "8px 0 12px",
-      lineHeight: 1.5,
-      ...userTextStyles,
-    });
+    const showButton = !!buttonText && buttonText.trim() !== "";
 
-    const PriceTag = styled.div({
-      fontSize: "clamp(1rem, 0.6vw + 0.8rem, 1.5rem)",
-      fontWeight: 600,
-      color: theme.primaryColor,
-      ...userPriceStyles,
-    });
-
-    const Button = styled.button({
-      backgroundColor: theme.primaryColor,
-      color: "#fff",
-      border: "none",
-      padding: "10px 16px",
-      borderRadius: 6,
-      cursor: "pointer",
-      fontSize: "clamp(0.8rem, 0.5vw + 0.7rem, 1rem)",
-      alignSelf: isHorizontalLayout ? "flex-start" : "center",
-      marginTop: "auto",
-      ...userButtonStyles,
-    });
+    // Per-card values the stylesheet reads; everything else is static.
+    const variables: { [name: string]: string } = {
+      "--pc-object-fit": imageObjectFit,
+    };
+    if (cardRadius) variables["--pc-radius"] = cardRadius;
+    if (isHorizontalLayout) variables["--pc-image-width"] = `${imageWidthPercent}%`;
+    if (imageAspectRatio !== "native") {
+      variables["--pc-aspect-ratio"] =
+        imageAspectRatio === "1/1" ? "1 / 1" : imageAspectRatio;
+    }
 
     const descContent: ReactNode[] = description.map(
       (line: string, i: number) => (
@@ -192,293 +916,63 @@ class ProductCardComponent extends StreamlitComponentBase<ProductCardProps> {
         </span>
       )
     );
-    
+    const image = productImage ? this.renderImage(slotClass) : null;
+
     return (
-      <>
-        <Global styles={globalStyles} /> 
-        {fontUrl && (
-          <style dangerouslySetInnerHTML={{ __html: `@import url('${fontUrl}');` }} />
+      <div
+        className={classes(
+          "pc-card",
+          `pc-card--${picturePosition}`,
+          isHorizontalLayout && MOBILE_CLASSES[mobileBreakpointBehavior],
+          enableAnimation && "pc-card--animated",
+          !showButton && "pc-card--clickable",
+          this.props.pending && "pc-card--pending",
+          slotClass("card")
         )}
-        <StyledCard
-          userCardStyleProps={userCardStyles} 
-          isHorizontalProp={isHorizontalLayout}
-          cardBorderRadiusProp={cardRadius}
-          enableAnimationProp={enableAnimation}
-          themeFont={theme.font}
-          themeSecondaryBackgroundColor={theme.secondaryBackgroundColor}
-          onClick={this.onCardClick} 
-          picturePositionProp={picturePosition} 
-          mobileBreakpointBehaviorProp={mobileBreakpointBehavior}
-          hasButton={showButton} 
-        >
-          {(picturePosition === "top" || picturePosition === "left") && productImage && (
-              <StyledImageContainer
-                isHorizontalProp={isHorizontalLayout}
-                imageWidthPercentProp={imageWidthPercent}
-                picturePositionProp={picturePosition}
-                mobileBreakpointBehaviorProp={mobileBreakpointBehavior}
-                imageAspectRatioProp={imageAspectRatio} 
-                cardBorderRadiusProp={cardRadius} 
-              >
-                <ImgComponent
-                  src={productImage}
-                  alt={productName}
-                  userImageStyleProps={userImageStyles} 
-                  imageAspectRatioProp={imageAspectRatio} 
-                  imageObjectFitProp={imageObjectFit}
-                />
-              </StyledImageContainer>
-            )}
-
-          <StyledContent
-            isHorizontalProp={isHorizontalLayout}
-            userContentStyleProps={userTextStyles} 
-            mobileBreakpointBehaviorProp={mobileBreakpointBehavior}
-            picturePositionProp={picturePosition} 
-          >
-            <Title>{productName}</Title>
-            {description.length > 0 && <Text>{descContent}</Text>}
-            {price && <PriceTag>{price}</PriceTag>}
-            {showButton && ( 
-              <Button onClick={this.onButtonClick}>{buttonText}</Button>
-            )}
-          </StyledContent>
-
-          {(picturePosition === "bottom" || picturePosition === "right") && productImage && (
-               <StyledImageContainer
-                isHorizontalProp={isHorizontalLayout}
-                imageWidthPercentProp={imageWidthPercent}
-                picturePositionProp={picturePosition}
-                mobileBreakpointBehaviorProp={mobileBreakpointBehavior}
-                imageAspectRatioProp={imageAspectRatio}
-                cardBorderRadiusProp={cardRadius} 
-              >
-                <ImgComponent
-                  src={productImage}
-                  alt={productName}
-                  userImageStyleProps={userImageStyles} 
-                  imageAspectRatioProp={imageAspectRatio}
-                  imageObjectFitProp={imageObjectFit}
-                />
-              </StyledImageContainer>
-            )}
-        </StyledCard>
-      </>
-    );
-  }
-}
-
-interface StyledCardProps {
-  userCardStyleProps: React.CSSProperties; 
-  isHorizontalProp: boolean;
-  cardBorderRadiusProp: string;
-  enableAnimationProp: boolean;
-  themeFont?: string;
-  themeSecondaryBackgroundColor?: string;
-  onClick?: (event: React.MouseEvent<HTMLDivElement, MouseEvent>) => void;
-  picturePositionProp: PicturePosition; 
-  mobileBreakpointBehaviorProp: MobileBreakpointBehavior; 
-  hasButton: boolean; 
-}
-
-interface StyledImageContainerProps {
-  isHorizontalProp: boolean;
-  imageWidthPercentProp: number;
-  picturePositionProp: PicturePosition;
-  mobileBreakpointBehaviorProp: MobileBreakpointBehavior; 
-  imageAspectRatioProp: string; 
-  cardBorderRadiusProp: string; 
-}
-
-interface ImgComponentProps {
-  userImageStyleProps: React.CSSProperties; 
-  imageAspectRatioProp: string;
-  imageObjectFitProp: CSS.Property.ObjectFit; 
-}
-
-interface StyledContentProps {
-  isHorizontalProp: boolean;
-  userContentStyleProps: React.CSSProperties; 
-  mobileBreakpointBehaviorProp: MobileBreakpointBehavior; 
-  picturePositionProp: PicturePosition;
-}
-
-const ImgComponent = styled.img<ImgComponentProps>(props => {
-  let imageSpecificAspectRatio: CSS.Property.AspectRatio;
-  switch (props.imageAspectRatioProp) {
-    case "native":
-      imageSpecificAspectRatio = "auto";
-      break;
-    default:
-      imageSpecificAspectRatio = props.imageAspectRatioProp === "1/1" ? "1 / 1" : props.imageAspectRatioProp;
-  }
-
-  const baseImageStyles: React.CSSProperties = {
-    display: "block",
-    width: "100%", 
-    height: imageSpecificAspectRatio === "auto" && props.imageAspectRatioProp === "native" ? "auto" : "100%",
-    objectFit: props.userImageStyleProps.objectFit || props.imageObjectFitProp,
-  };
-  if (props.imageAspectRatioProp === "native") { 
-    baseImageStyles.aspectRatio = imageSpecificAspectRatio;
-  }
+        style={variables as React.CSSProperties}
+        onClick={this.onCardClick}
+      >
+        {(picturePosition === "top" || picturePosition === "left") && image}
+
+        <div className={classes("pc-content", slotClass("content"))}>
+          <h3 className={classes("pc-title", slotClass("title"))}>{productName}</h3>
+          {description.length > 0 && (
+            <div className={classes("pc-text", slotClass("text"))}>{descContent}</div>
+          )}
+          {price && <div className={classes("pc-price", slotClass("price"))}>{price}</div>}
+          {stock && <div className={classes("pc-stock", slotClass("stock"))}>{stock}</div>}
+          {showButton && ( 
+            <button
+              className={classes("pc-button", slotClass("button"))}
+              disabled={this.props.pending}
+              aria-busy={this.props.pending}
+              onClick={this.onButtonClick}
+            >
+              {buttonText}
+            </button>
+          )}
+        </div>
 
-  return {
-    ...baseImageStyles,
-    ...props.userImageStyleProps, 
-    objectFit: props.userImageStyleProps.objectFit || props.imageObjectFitProp,
-    ...( (props.imageAspectRatioProp === "native" && !props.userImageStyleProps.aspectRatio) && 
-        { aspectRatio: imageSpecificAspectRatio } )
-  };
-});
-
-const StyledImageContainer = styled.div<StyledImageContainerProps>(props => {
-  const isCurrentlyHorizontal = props.isHorizontalProp &&
-    !( (props.mobileBreakpointBehaviorProp === 'stack top' || props.mobileBreakpointBehaviorProp === 'stack bottom') && 
-        typeof window !== 'undefined' && window.innerWidth <= 600);
-
-  const baseStyles: CSS.Properties<string | number> & { [key: string]: any } = { 
-    display: 'flex', 
-    justifyContent: 'center',
-    alignItems: 'center',
-    overflow: 'hidden', 
-    flexShrink: isCurrentlyHorizontal ? 0 : undefined, 
-    width: isCurrentlyHorizontal ? `${props.imageWidthPercentProp}%` : "100%",
-    marginLeft: isCurrentlyHorizontal && props.picturePositionProp === "right" ? "12px" : "0",
-    marginRight: isCurrentlyHorizontal && props.picturePositionProp === "left" ? "12px" : "0",
-    marginTop: !isCurrentlyHorizontal && props.picturePositionProp === "bottom" ? "12px" : "0",
-    marginBottom: !isCurrentlyHorizontal && props.picturePositionProp === "top" ? "12px" : "0",
-    borderRadius: props.isHorizontalProp
-      ? props.picturePositionProp === "left"
-        ? `${props.cardBorderRadiusProp} 0 0 ${props.cardBorderRadiusProp}`
-        : `0 ${props.cardBorderRadiusProp} ${props.cardBorderRadiusProp} 0`
-      : props.picturePositionProp === "top"
-      ? `${props.cardBorderRadiusProp} ${props.cardBorderRadiusProp} 0 0`
-      : `0 0 ${props.cardBorderRadiusProp} ${props.cardBorderRadiusProp}`,
-  };
-  
-  const propAspectRatio = props.imageAspectRatioProp;
-  if (propAspectRatio !== "native") { 
-      baseStyles.aspectRatio = propAspectRatio === "1/1" ? "1 / 1" : propAspectRatio;
-  }
-
-  let responsiveStyles = {};
-  if (props.isHorizontalProp && (props.mobileBreakpointBehaviorProp === 'stack top' || props.mobileBreakpointBehaviorProp === 'stack bottom')) {
-    const mobileSpecificStyles: CSS.Properties<string | number> = {
-        width: "100%", 
-        flexBasis: "auto", 
-        flexShrink: undefined,
-        marginLeft: "0",
-        marginRight: "0",
-        marginTop: "0", 
-        marginBottom: "0",
-        borderRadius: props.mobileBreakpointBehaviorProp === 'stack top' 
-            ? `${props.cardBorderRadiusProp} ${props.cardBorderRadiusProp} 0 0` 
-            : `0 0 ${props.cardBorderRadiusProp} ${props.cardBorderRadiusProp}`,
-    };
-    if (props.mobileBreakpointBehaviorProp === 'stack top') { 
-        mobileSpecificStyles.marginBottom = "12px";
-    } else { 
-        mobileSpecificStyles.marginTop = "12px";
-    }
-    responsiveStyles = {
-        "@media (max-width: 600px)": mobileSpecificStyles
-    };
+        {(picturePosition === "bottom" || picturePosition === "right") && image}
+      </div>
+    );
   }
-  return {
-    ...baseStyles,
-    ...responsiveStyles, 
-  };
-});
-
-const StyledCard = styled.div<StyledCardProps>(props => {
-  const baseStyles: React.CSSProperties = {
-    display: "flex",
-    width: "100%", 
-    height: "auto",
-    fontFamily: `${props.themeFont}, sans-serif`,
-    backgroundColor: props.themeSecondaryBackgroundColor,
-    borderRadius: props.cardBorderRadiusProp,
-    boxShadow: "0 6px 20px rgba(0,0,0,0.08)", 
-    overflow: "hidden", 
-    position: "relative",
-    cursor: props.hasButton ? "default" : (props.onClick ? "pointer" : "default"),
-    flexDirection: props.isHorizontalProp ? "row" : "column",
-  };
 
-  const conditionalStyles: { [key: string]: any } = {}; 
-
-  if (props.enableAnimationProp) {
-    conditionalStyles.willChange = "transform, box-shadow"; 
-    conditionalStyles.transition = "transform 0.2s ease-in-out, box-shadow 0.2s ease-in-out"; 
-    conditionalStyles["&:hover"] = { 
-      transform: "scale(1.03)",
-      boxShadow: "0 8px 25px rgba(0,0,0,0.12)",
-    };
-    conditionalStyles["&:active"] = { 
-      transform: "scale(0.98)",
-    };
+  render(): ReactNode {
+    debugStats.renders++;
+    const overrides = getCardOverrides(this.props.card.styles);
+    if (!overrides) return this.renderCard(noOverrides);
+    return (
+      <ClassNames>
+        {({ css }) =>
+          this.renderCard(slot => {
+            const styles = overrides.slots[slot];
+            return styles ? css(styles) : undefined;
+          }, overrides.cardRadius)
+        }
+      </ClassNames>
+    );
   }
-  
-  if (props.isHorizontalProp) { 
-    let mobileFlexDirection: CSS.Property.FlexDirection = "column"; 
-
-    if (props.mobileBreakpointBehaviorProp === "stack top") {
-        mobileFlexDirection = props.picturePositionProp === "right" ? "column-reverse" : "column";
-    } else if (props.mobileBreakpointBehaviorProp === "stack bottom") {
-        mobileFlexDirection = props.picturePositionProp === "left" ? "column-reverse" : "column";
-    }
-     if (props.mobileBreakpointBehaviorProp === "stack top" || props.mobileBreakpointBehaviorProp === "stack bottom") {
-        conditionalStyles["@media (max-width: 600px)"] = {
-          ...(conditionalStyles["@media (max-width: 600px)"] as object), 
-          flexDirection: mobileFlexDirection, 
-        };
-     }
-  }
-  
-  return {
-    ...baseStyles,
-    ...conditionalStyles,
-    ...props.userCardStyleProps, 
-  };
-});
-
-const StyledContent = styled.div<StyledContentProps>(props => {
-  const baseStyles: React.CSSProperties = {
-    display: "flex",
-    flexDirection: "column",
-    justifyContent: "center", 
-    padding: "20px",
-    minWidth: 0, 
-    boxSizing: "border-box",
-    flexGrow: props.isHorizontalProp ? 1 : undefined, 
-    flexBasis: props.isHorizontalProp ? "0px" : "auto",  
-    width: "100%", 
-  };
-  
-  const responsiveStyles: { [key: string]: any } = {}; 
-  if (props.isHorizontalProp && (props.mobileBreakpointBehaviorProp === 'stack top' || props.mobileBreakpointBehaviorProp === 'stack bottom')) {
-     const mobileSpecificContentStyles: React.CSSProperties = {
-        flexGrow: 0, 
-        flexBasis: "auto",
-        width: "100%", 
-        padding: "20px", 
-     };
-     if (props.mobileBreakpointBehaviorProp === 'stack top'){ 
-        mobileSpecificContentStyles.paddingTop = (props.picturePositionProp === "left" || props.picturePositionProp === "right") ? "0px" : "20px";
-     }
-     if (props.mobileBreakpointBehaviorProp === 'stack bottom'){ 
-        mobileSpecificContentStyles.paddingBottom = (props.picturePositionProp === "left" || props.picturePositionProp === "right") ? "0px" : "20px";
-     }
-     responsiveStyles["@media (max-width: 600px)"] = mobileSpecificContentStyles;
-  }
-
-  return {
-    ...baseStyles,
-    ...responsiveStyles,
-    ...props.userContentStyleProps, 
-  };
-});
+}
 
 export default withStreamlitConnection(ProductCardComponent);
-
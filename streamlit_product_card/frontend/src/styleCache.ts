@@ -0,0 +1,94 @@
+import React from "react";
+import { css, SerializedStyles } from "@emotion/react";
+import { debugStats } from "./debugStats";
+import { CardStyles } from "./types";
+
+const MAX_CACHED_STYLES = 256;
+
+const kebabToCamel = (str: string): string => {
+  return str.replace(/-([a-z0-9])/g, (match, char) => char.toUpperCase());
+};
+
+export const transformKebabCaseStyles = (styleObj?: { [key: string]: any }): React.CSSProperties => {
+  if (!styleObj) return {};
+  const newStyles: { [key: string]: any } = {};
+  for (const key in styleObj) {
+    if (Object.prototype.hasOwnProperty.call(styleObj, key)) {
+      newStyles[kebabToCamel(key)] = styleObj[key];
+    }
+  }
+  return newStyles as React.CSSProperties;
+};
+
+export type CardSlot = "card" | "image" | "content" | "title" | "text" | "price" | "stock" | "button";
+
+/**
+ * A card's `styles` overrides, compiled once per distinct `styles` value.
+ * The default layout comes from `card.css`; each overridden slot gets a
+ * serialized emotion style applied as an extra class. Emotion skips
+ * insertion for an already inserted style, so cards sharing a look add no
+ * new CSS.
+ */
+export interface CardOverrides {
+  slots: { [slot in CardSlot]?: SerializedStyles };
+  // The card's corner radius, also used for the image corners.
+  cardRadius?: string;
+}
+
+const cache = new Map<string, CardOverrides | null>();
+
+const compile = (styles: CardStyles): CardOverrides | null => {
+  // Transform kebab-case keys from Python styles to camelCase for Emotion
+  const slotStyles: { [slot in CardSlot]: React.CSSProperties } = {
+    card: transformKebabCaseStyles(styles.card),
+    image: transformKebabCaseStyles(styles.image),
+    // The "text" slot styles both the content column and the description.
+    content: transformKebabCaseStyles(styles.text),
+    title: transformKebabCaseStyles(styles.title),
+    text: transformKebabCaseStyles(styles.text),
+    price: transformKebabCaseStyles(styles.price),
+    stock: transformKebabCaseStyles(styles.stock),
+    button: transformKebabCaseStyles(styles.button),
+  };
+
+  const overrides: CardOverrides = { slots: {} };
+  let empty = true;
+  (Object.keys(slotStyles) as CardSlot[]).forEach(slot => {
+    if (Object.keys(slotStyles[slot]).length > 0) {
+      overrides.slots[slot] = css(slotStyles[slot]);
+      empty = false;
+    }
+  });
+
+  const rawBorderRadius = slotStyles.card.borderRadius;
+  if (typeof rawBorderRadius === "string") {
+    overrides.cardRadius = rawBorderRadius;
+  } else if (typeof rawBorderRadius === "number") {
+    overrides.cardRadius = `${rawBorderRadius}px`;
+  }
+  return empty ? null : overrides;
+};
+
+/**
+ * Returns the compiled overrides for a card's `styles`, or null if it has
+ * none, in which case the card renders with the static stylesheet only.
+ */
+export const getCardOverrides = (styles?: CardStyles): CardOverrides | null => {
+  if (!styles) return null;
+  const cacheKey = JSON.stringify(styles);
+  if (cacheKey === "{}") return null;
+  const cached = cache.get(cacheKey);
+  if (cached !== undefined) {
+    debugStats.styleCacheHits++;
+    return cached;
+  }
+
+  debugStats.styleCacheMisses++;
+  const compiled = compile(styles);
+  if (cache.size >= MAX_CACHED_STYLES) {
+    // Maps iterate in insertion order, so this evicts the oldest entry.
+    cache.delete(cache.keys().next().value);
+  }
+  cache.set(cacheKey, compiled);
+  return compiled;
+};
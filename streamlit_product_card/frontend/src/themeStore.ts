@@ -0,0 +1,74 @@
+import { CardStyles } from "./types";
+
+/**
+ * Card themes registered in Python with `register_card_theme`. A theme body
+ * is only sent with the first card of a session that uses it, so it is
+ * kept in `sessionStorage`, which every card frame of the page shares
+ * (they are all served from the Streamlit origin). Frames that mount before
+ * the body arrives subscribe and re-render once it is stored.
+ */
+export interface CardTheme {
+  styles: CardStyles;
+  fontUrl?: string;
+  fontPreload?: string[];
+}
+
+const STORAGE_PREFIX = "streamlit_product_card.theme.";
+
+const themes = new Map<string, CardTheme>();
+const listeners = new Set<() => void>();
+
+const notify = (): void => {
+  listeners.forEach(listener => listener());
+};
+
+const readStorage = (themeId: string): CardTheme | undefined => {
+  try {
+    const stored = window.sessionStorage.getItem(STORAGE_PREFIX + themeId);
+    return stored ? (JSON.parse(stored) as CardTheme) : undefined;
+  } catch (e) {
+    // Storage can be disabled, e.g. for third-party frames.
+    return undefined;
+  }
+};
+
+export const storeTheme = (themeId: string, theme: CardTheme): void => {
+  if (themes.has(themeId)) return;
+  themes.set(themeId, theme);
+  try {
+    window.sessionStorage.setItem(STORAGE_PREFIX + themeId, JSON.stringify(theme));
+  } catch (e) {
+    // Other frames will report the theme as missing and Python resends it.
+  }
+  notify();
+};
+
+export const getTheme = (themeId: string): CardTheme | undefined => {
+  let theme = themes.get(themeId);
+  if (!theme) {
+    theme = readStorage(themeId);
+    if (theme) themes.set(themeId, theme);
+  }
+  return theme;
+};
+
+/** Calls `listener` whenever a theme is stored by this or another frame. */
+export const subscribeToThemes = (listener: () => void): (() => void) => {
+  listeners.add(listener);
+  return () => {
+    listeners.delete(listener);
+  };
+};
+
+window.addEventListener("storage", (e: StorageEvent) => {
+  if (e.key && e.key.startsWith(STORAGE_PREFIX)) notify();
+});
+
+/** Theme styles with the card's own `styles` merged on top, slot by slot. */
+export const mergeThemeStyles = (theme: CardTheme, styles: CardStyles): CardStyles => {
+  const merged: { [slot: string]: any } = { ...theme.styles };
+  Object.keys(styles).forEach(slot => {
+    merged[slot] = { ...merged[slot], ...(styles as { [slot: string]: any })[slot] };
+  });
+  return merged as CardStyles;
+};
@@ -0,0 +1,98 @@
+import * as CSS from 'csstype'; 
+
+export type PicturePosition = "top" | "bottom" | "left" | "right";
+export type MobileBreakpointBehavior = "stack top" | "stack bottom" | "shrink" | "none";
+export type EmotionCompatibleStyle = { [key: string]: any };
+
+export interface CardStyles {
+  card?: EmotionCompatibleStyle; 
+  title?: EmotionCompatibleStyle;
+  text?: EmotionCompatibleStyle;
+  price?: EmotionCompatibleStyle;
+  stock?: EmotionCompatibleStyle;
+  button?: EmotionCompatibleStyle;
+  image?: EmotionCompatibleStyle; 
+}
+
+// A `<source>` of a `<picture>`, one per preferred image format.
+export interface ImageSource {
+  type: string;
+  srcSet: string;
+}
+
+export interface CardArgs {
+  productName: string;
+  description?: string[];
+  price?: string;
+  productImage?: string;
+  // Set when Python generated resized variants (`optimize_image=True`).
+  productImageSrcSet?: string;
+  productImageSizes?: string;
+  productImageSources?: ImageSource[];
+  // Set for `image_placeholder`: a color, or a data URI to show blurred,
+  // and the image's size, to reserve its space before it loads.
+  productImagePlaceholder?: string;
+  productImageWidth?: number;
+  productImageHeight?: number;
+  buttonText: string; 
+  // Text of the stock badge, e.g. "Only 3 left".
+  stock?: string;
+  // Key that `push_card_updates` addresses the card by.
+  liveKey?: string;
+  // Set for `product_feed`: the product's key, or its position in the
+  // feed, reported with clicks since cards are only sent once.
+  productKey?: string | number;
+  // Price as a number, sent for `searchable` grids; null if unparseable.
+  priceValue?: number | null;
+  picturePosition: PicturePosition;
+  enableAnimation: boolean;
+  imageWidthPercent: number;
+  imageAspectRatio: string; 
+  imageObjectFit: CSS.Property.ObjectFit; 
+  // Distance from the viewport, in pixels, at which the image starts
+  // loading; null loads it right away.
+  imageLoadMargin?: number | null;
+  mobileBreakpointBehavior: MobileBreakpointBehavior;
+  fontUrl?: string;
+  // Font files to preload, for a font registered with `register_card_font`.
+  fontPreload?: string[];
+  styles: CardStyles;
+  // Id of a theme registered with `register_card_theme`; its styles sit
+  // underneath `styles`.
+  themeId?: string;
+}
+
+// A font stylesheet a frame loads, with the font files it preloads.
+export interface FontSpec {
+  url: string;
+  preload?: string[];
+}
+
+export interface StreamlitTheme {
+  font?: string;
+  secondaryBackgroundColor?: string;
+  textColor?: string;
+  primaryColor?: string;
+}
+
+export type CatalogSort = "default" | "price_asc" | "price_desc" | "name";
+
+// What a shopper selected in the toolbar of a `searchable` grid. Prices
+// are kept as typed, so the inputs stay editable.
+export interface CatalogView {
+  query: string;
+  sort: CatalogSort;
+  minPrice: string;
+  maxPrice: string;
+}
+
+// Set for `product_feed`: which chunk of which feed the `cards` are. A
+// new `id` means the feed started over.
+export interface FeedArgs {
+  id: string;
+  chunk: number;
+  done: boolean;
+  // How close to the end of the grid, in pixels, scrolling gets before
+  // the next chunk is requested.
+  loadMargin: number;
+}
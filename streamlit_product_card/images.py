@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in server-side thumbnails for card images.
+
+Card images are usually far larger than the few hundred pixels a card shows.
+With `optimize_image=True`, `product_card` and `product_grid` hand the image
+to this module, which opens or downloads the source once, writes resized
+WebP and JPEG variants to a content-addressed disk cache and serves them
+through Streamlit's media file manager with a `srcset`/`sizes` pair, so the
+browser picks the smallest file that fits the card.
+
+With `image_placeholder`, the card also gets a low-quality placeholder,
+shown until the image loads: the image's average color, or a tiny
+thumbnail the browser blurs. Placeholders are inlined in the card's args,
+computed once per image content, and come with the image's size so the
+card reserves its space before the image arrives.
+
+Requires Pillow (`pip install streamlit-product-card[images]`).
+"""
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "streamlit_product_card", "images"
+)
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+DEFAULT_CARD_WIDTH_PX = 300
+
+# Variants are rendered for 1x and 2x pixel density displays.
+_DENSITIES = (1, 2)
+# (Pillow format, file extension, mimetype); the last one is the `src`
+# fallback for browsers that don't take the earlier formats.
+_FORMATS = (
+    ("WEBP", "webp", "image/webp"),
+    ("JPEG", "jpg", "image/jpeg"),
+)
+_QUALITY = 82
+# Eviction deletes down to this fraction of `max_bytes`, so the directory
+# is scanned once per many writes rather than after every one.
+_EVICT_TO = 0.9
+_DOWNLOAD_TIMEOUT_S = 30
+PLACEHOLDER_KINDS = ("color", "blur")
+# Longest side of a "blur" placeholder thumbnail, in pixels.
+_PLACEHOLDER_PX = 16
+_PLACEHOLDER_QUALITY = 40
+
+
+class ImageVariant(NamedTuple):
+    path: str
+    width: int
+    height: int
+    mimetype: str
+
+
+class ImagePlaceholder(NamedTuple):
+    width: int
+    """Width of the (cropped) image, in pixels."""
+    height: int
+    color: str
+    """Average color of the image, as `#rrggbb`."""
+    thumbnail: str
+    """Data URI of a WebP thumbnail at most 16 pixels wide or high."""
+
+
+def _require_pillow() -> Any:
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError(
+            "optimize_image=True and image_placeholder require Pillow. "
+            "Install it with "
+            "`pip install streamlit-product-card[images]`."
+        ) from e
+    return Image
+
+
+def _parse_aspect_ratio(aspect_ratio: str) -> Optional[float]:
+    """Parses "16/9", "1 / 1" or "1.5" into width / height; None if native."""
+    if not aspect_ratio or aspect_ratio == "native":
+        return None
+    try:
+        if "/" in aspect_ratio:
+            width, height = aspect_ratio.split("/", 1)
+            return float(width) / float(height)
+        return float(aspect_ratio)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+class ImageCache:
+    """Content-addressed store of resized images with LRU size eviction.
+
+    Files are named after a hash of the source content and the variant
+    parameters, so identical images shared by many products are stored once.
+    Every read refreshes the file's mtime, and when the directory grows past
+    `max_bytes` the least recently used files are deleted first. The size is
+    kept as a running total of the files written, so the directory is only
+    scanned when the total says it may have outgrown `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # (source, params) -> variants; avoids re-reading sources per rerun.
+        self._index: Dict[Tuple[Any, ...], List[ImageVariant]] = {}
+        self._placeholders: Dict[Tuple[Any, ...], ImagePlaceholder] = {}
+        # Bytes in the directory as of the last scan, plus those written
+        # since; None until the first scan.
+        self._bytes: Optional[int] = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name[:2], name)
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._bytes is not None:
+                # Overcounts a replaced file, which only brings the next
+                # scan forward.
+                self._bytes += len(data)
+
+    def _touch(self, path: str) -> bool:
+        try:
+            os.utime(path)
+            return True
+        except OSError:
+            return False
+
+    def _read_source(self, source: str) -> bytes:
+        if not _is_url(source):
+            with open(source, "rb") as f:
+                return f.read()
+
+        # Downloads are keyed by URL so each source is only fetched once.
+        url_digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        path = self._path(f"{url_digest}.src")
+        if self._touch(path):
+            with open(path, "rb") as f:
+                return f.read()
+        import urllib.request
+
+        with urllib.request.urlopen(
+            source, timeout=_DOWNLOAD_TIMEOUT_S
+        ) as response:
+            data = response.read()
+        self._write(path, data)
+        return data
+
+    def variants(
+        self,
+        source: str,
+        display_width: int,
+        aspect_ratio: Optional[float],
+        crop: bool,
+    ) -> List[ImageVariant]:
+        """Returns the resized variants of `source`, creating missing ones.
+
+        Args:
+            source: URL or local path of the original image.
+            display_width: Largest CSS width, in pixels, the image is shown at.
+            aspect_ratio: Width / height to crop to, or None to keep the
+                source proportions.
+            crop: Whether to center-crop to `aspect_ratio`. Only done for
+                `object-fit: cover`, where the browser would crop anyway.
+        """
+        index_key = (_source_id(source), display_width, aspect_ratio, crop)
+
+        with self._lock:
+            known = self._index.get(index_key)
+        if known and all(self._touch(v.path) for v in known):
+            return known
+
+        Image = _require_pillow()
+        data = self._read_source(source)
+        digest = hashlib.sha256(data).hexdigest()
+        image = Image.open(io.BytesIO(data))
+        image.load()
+
+        if crop and aspect_ratio:
+            image = _center_crop(image, aspect_ratio)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        widths = sorted(
+            {min(image.width, display_width * d) for d in _DENSITIES}
+        )
+        created: List[ImageVariant] = []
+        wrote = False
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = None
+            for pil_format, extension, mimetype in _FORMATS:
+                path = self._path(f"{digest}-{width}x{height}.{extension}")
+                if not self._touch(path):
+                    if resized is None:
+                        resized = image.resize((width, height), Image.LANCZOS)
+                    frame = resized
+                    if pil_format == "JPEG" and frame.mode == "RGBA":
+                        frame = frame.convert("RGB")
+                    buffer = io.BytesIO()
+                    frame.save(buffer, pil_format, quality=_QUALITY)
+                    self._write(path, buffer.getvalue())
+                    wrote = True
+                created.append(ImageVariant(path, width, height, mimetype))
+
+        with self._lock:
+            self._index[index_key] = created
+        if wrote:
+            self.evict(keep={v.path for v in created})
+        return created
+
+    def placeholder(
+        self, source: str, aspect_ratio: Optional[float], crop: bool
+    ) -> ImagePlaceholder:
+        """Returns the placeholder of `source`, computing it if needed.
+
+        Placeholders are stored next to the variants under the hash of the
+        source content, so an image shared by many products, or seen again
+        after a restart, is only decoded once. `aspect_ratio` and `crop` are
+        as for `variants`.
+        """
+        index_key = (_source_id(source), aspect_ratio, crop)
+        with self._lock:
+            known = self._placeholders.get(index_key)
+        if known:
+            return known
+
+        data = self._read_source(source)
+        digest = hashlib.sha256(data).hexdigest()
+        shape = f"{aspect_ratio:.4g}" if crop and aspect_ratio else "native"
+        path = self._path(f"{digest}-{shape}.placeholder.json")
+        placeholder = None
+        if self._touch(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    placeholder = ImagePlaceholder(**json.load(f))
+            except (OSError, ValueError, TypeError):
+                placeholder = None
+        if placeholder is None:
+            placeholder = _make_placeholder(
+                data, aspect_ratio if crop else None
+            )
+            self._write(
+                path, json.dumps(placeholder._asdict()).encode("utf-8")
+            )
+
+        with self._lock:
+            self._placeholders[index_key] = placeholder
+        return placeholder
+
+    def evict(self, keep: Iterable[str] = ()) -> None:
+        """Deletes least recently used files if over `max_bytes`, down to a
+        margin below it.
+
+        Paths in `keep` are never deleted, so variants that are about to be
+        served survive even a cache smaller than a single image.
+        """
+        with self._lock:
+            if self._bytes is not None and self._bytes <= self.max_bytes:
+                return
+        keep = set(keep)
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total > self.max_bytes:
+            target = int(self.max_bytes * _EVICT_TO)
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+        with self._lock:
+            self._bytes = total
+
+
+def _source_id(source: str) -> Any:
+    """Identifies a source; local files by path, mtime and size."""
+    if _is_url(source):
+        return source
+    stat = os.stat(source)
+    return (source, stat.st_mtime_ns, stat.st_size)
+
+
+def _make_placeholder(
+    data: bytes, aspect_ratio: Optional[float]
+) -> ImagePlaceholder:
+    Image = _require_pillow()
+    image = Image.open(io.BytesIO(data))
+    width, height = image.size
+    # Lets JPEGs decode at a fraction of their size.
+    image.draft("RGB", (_PLACEHOLDER_PX * 4, _PLACEHOLDER_PX * 4))
+    if aspect_ratio:
+        image = _center_crop(image, aspect_ratio)
+        if width / height > aspect_ratio:
+            width = round(height * aspect_ratio)
+        else:
+            height = round(width / aspect_ratio)
+    image = image.convert("RGB")
+    red, green, blue = image.resize((1, 1), Image.BOX).getpixel((0, 0))
+    image.thumbnail((_PLACEHOLDER_PX, _PLACEHOLDER_PX), Image.BOX)
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=_PLACEHOLDER_QUALITY)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return ImagePlaceholder(
+        width,
+        height,
+        f"#{red:02x}{green:02x}{blue:02x}",
+        f"data:image/webp;base64,{encoded}",
+    )
+
+
+def _center_crop(image: Any, aspect_ratio: float) -> Any:
+    width, height = image.size
+    if width / height > aspect_ratio:
+        new_width = round(height * aspect_ratio)
+        left = (width - new_width) // 2
+        return image.crop((left, 0, left + new_width, height))
+    new_height = round(width / aspect_ratio)
+    top = (height - new_height) // 2
+    return image.crop((0, top, width, top + new_height))
+
+
+_image_cache = ImageCache()
+
+
+def configure_image_cache(
+    directory: Optional[str] = None, max_bytes: Optional[int] = None
+) -> ImageCache:
+    """
+    Sets where card image variants are stored and how large the store may get.
+
+    Args:
+        directory: Cache directory. Defaults to
+            `~/.cache/streamlit_product_card/images`.
+        max_bytes: Size above which least recently used files are evicted.
+            Defaults to 512 MB.
+
+    Returns:
+        ImageCache: The cache now used by `optimize_image=True`.
+    """
+    global _image_cache
+    _image_cache = ImageCache(
+        directory or DEFAULT_CACHE_DIR,
+        DEFAULT_MAX_CACHE_BYTES if max_bytes is None else max_bytes,
+    )
+    return _image_cache
+
+
+def _serve(variant: ImageVariant) -> str:
+    """Returns a URL for `variant`, via Streamlit's media files if running."""
+    from streamlit import runtime
+
+    if runtime.exists():
+        return runtime.get_instance().media_file_mgr.add(
+            variant.path,
+            variant.mimetype,
+            f"product_card_image.{os.path.basename(variant.path)}",
+        )
+    with open(variant.path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode("ascii")
+    return f"data:{variant.mimetype};base64,{encoded}"
+
+
+def prepare_image_args(
+    product_image: str,
+    picture_position: str = "top",
+    image_width_percent: int = 30,
+    image_aspect_ratio: str = "native",
+    image_object_fit: str = "cover",
+    columns: int = 1,
+    card_width: int = DEFAULT_CARD_WIDTH_PX,
+) -> Dict[str, Any]:
+    """
+    Builds the image props of a card from optimized variants of its image.
+
+    Falls back to the original `product_image` if the source can't be read
+    or decoded, so a broken image never breaks the page.
+
+    Returns:
+        dict: `productImage` (fallback `src`), `productImageSrcSet`,
+        `productImageSources` (one `srcSet` per preferred format) and
+        `productImageSizes`.
+    """
+    is_horizontal = picture_position in ("left", "right")
+    fraction = image_width_percent / 100 if is_horizontal else 1.0
+    display_width = max(1, round(card_width * fraction))
+
+    try:
+        variants = _image_cache.variants(
+            product_image,
+            display_width,
+            _parse_aspect_ratio(image_aspect_ratio),
+            crop=image_object_fit == "cover",
+        )
+    except ImportError:
+        raise
+    except Exception:  # Unreachable URL, unreadable file, not an image...
+        _LOGGER.warning(
+            "Could not optimize product image %r", product_image, exc_info=True
+        )
+        return {"productImage": product_image}
+
+    srcsets: Dict[str, List[str]] = {}
+    for variant in variants:
+        srcsets.setdefault(variant.mimetype, []).append(
+            f"{_serve(variant)} {variant.width}w"
+        )
+    fallback_mimetype = _FORMATS[-1][2]
+    fallback = srcsets.pop(fallback_mimetype)
+
+    # The card fills its iframe (or its grid column), so the image's CSS
+    # width is a fraction of the viewport; grids collapse to one column on
+    # narrow screens.
+    sizes = f"{100 * fraction / max(1, columns):.4g}vw"
+    if columns > 1:
+        sizes = f"(max-width: 600px) {100 * fraction:.4g}vw, {sizes}"
+
+    return {
+        "productImage": fallback[0].rsplit(" ", 1)[0],
+        "productImageSrcSet": ", ".join(fallback),
+        "productImageSources": [
+            {"type": mimetype, "srcSet": ", ".join(entries)}
+            for mimetype, entries in srcsets.items()
+        ],
+        "productImageSizes": sizes,
+    }
+
+
+def placeholder_args(
+    product_image: str,
+    kind: str,
+    image_aspect_ratio: str = "native",
+    image_object_fit: str = "cover",
+) -> Dict[str, Any]:
+    """
+    Builds the placeholder props of a card for its `image_placeholder`.
+
+    Returns:
+        dict: `productImagePlaceholder` (a color, or a data URI for
+        `"blur"`) and the image's `productImageWidth` and
+        `productImageHeight`. Empty if the source can't be read or decoded.
+    """
+    if kind not in PLACEHOLDER_KINDS:
+        raise ValueError(
+            f"image_placeholder must be one of {PLACEHOLDER_KINDS}, "
+            f"got {kind!r}"
+        )
+    try:
+        placeholder = _image_cache.placeholder(
+            product_image,
+            _parse_aspect_ratio(image_aspect_ratio),
+            crop=image_object_fit == "cover",
+        )
+    except ImportError:
+        raise
+    except Exception:  # Unreachable URL, unreadable file, not an image...
+        _LOGGER.warning(
+            "Could not make a placeholder for product image %r",
+            product_image,
+            exc_info=True,
+        )
+        return {}
+    return {
+        "productImagePlaceholder": (
+            placeholder.thumbnail if kind == "blur" else placeholder.color
+        ),
+        "productImageWidth": placeholder.width,
+        "productImageHeight": placeholder.height,
+    }
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in per-call metrics of `product_card`, `product_grid` and
+`product_cards_from_dataframe`.
+
+With a hook installed through `set_card_metrics_hook`, every call reports a
+`CardMetrics`: time spent building the component args, in the component
+call (serialization and mounting), in `on_button_click` callbacks, the
+approximate args size and the number of new clicks. Frames also measure
+time from new args to paint and image load times, and attach the report
+to the next value they send (i.e. with a click), so no extra reruns are
+triggered. Without a hook, each call only checks one module attribute.
+"""
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CardMetrics(NamedTuple):
+    renderer: str
+    """The function called: `"product_card"`, `"product_grid"`,
+    `"product_cards_from_dataframe"` or `"product_feed"`."""
+    key: Optional[str]
+    """The call's `key`; for an unkeyed `product_card`, its product name."""
+    cards: int
+    build_ms: float
+    """Normalizing arguments into component args."""
+    component_ms: float
+    """The component call: serializing the args and mounting the frame."""
+    callback_ms: float
+    """`on_button_click` callbacks run for new clicks."""
+    total_ms: float
+    payload_bytes: int
+    """Approximate size of the serialized component args."""
+    clicks: int
+    """New clicks received in this run."""
+    client: Optional[Dict[str, Any]]
+    """A new timing report from the frame, if it sent one: `argsToPaintMs`,
+    and `images` / `imageLoadMs` (count and slowest load of the images
+    loaded so far)."""
+
+
+_hook: Optional[Callable[[CardMetrics], None]] = None
+
+
+def set_card_metrics_hook(
+    hook: Optional[Callable[[CardMetrics], None]],
+) -> None:
+    """
+    Installs `hook` to receive a `CardMetrics` after every card or grid call.
+
+    The hook runs in the script thread, so it should be quick: e.g. record
+    to a metrics client or an OpenTelemetry span, or pass
+    `log_card_metrics`. Exceptions it raises are logged, not propagated.
+    Installing a hook also asks the frames for timing reports, which
+    remounts unkeyed cards once. Pass None to turn the metrics off again.
+    """
+    global _hook
+    _hook = hook
+
+
+def log_card_metrics(metrics: CardMetrics) -> None:
+    """A hook that logs each call's metrics at DEBUG level."""
+    _LOGGER.debug(
+        "%s %r: %d cards, build %.2f ms, component %.2f ms, callbacks "
+        "%.2f ms, %d bytes, %d clicks, client %s",
+        metrics.renderer,
+        metrics.key,
+        metrics.cards,
+        metrics.build_ms,
+        metrics.component_ms,
+        metrics.callback_ms,
+        metrics.payload_bytes,
+        metrics.clicks,
+        metrics.client,
+    )
+
+
+def _payload_bytes(args: Dict[str, Any]) -> int:
+    json_args = {}
+    size = 0
+    for name, value in args.items():
+        if hasattr(value, "memory_usage"):  # An Arrow catalog DataFrame
+            from streamlit import dataframe_util
+
+            size += len(dataframe_util.convert_pandas_df_to_arrow_bytes(value))
+        else:
+            json_args[name] = value
+    return size + len(json.dumps(json_args, default=str))
+
+
+class _CallRecorder:
+    """Times the phases of one call; only created while a hook is set."""
+
+    __slots__ = (
+        "renderer",
+        "key",
+        "cards",
+        "times",
+        "last",
+        "payload_bytes",
+        "client",
+    )
+
+    def __init__(self, renderer: str, key: Optional[str], cards: int) -> None:
+        self.renderer = renderer
+        self.key = key
+        self.cards = cards
+        self.times: Dict[str, float] = {}
+        self.payload_bytes = 0
+        self.client: Optional[Dict[str, Any]] = None
+        self.last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """Adds the time since the previous mark to `phase`."""
+        now = time.perf_counter()
+        self.times[phase] = self.times.get(phase, 0.0) + 1000 * (
+            now - self.last
+        )
+        self.last = now
+
+    def component_args(self, args: Dict[str, Any]) -> None:
+        """Measures `args` and asks the frame for timing reports. Not timed."""
+        args["reportTimings"] = True
+        self.payload_bytes = _payload_bytes(args)
+        self.last = time.perf_counter()
+
+    def component_value(
+        self, component_value: Dict[str, Any], card_state: Dict[str, Any]
+    ) -> None:
+        """Picks up the frame's timing report if it's one not seen before."""
+        timings = component_value.get("timings")
+        if not timings:
+            return
+        report_id = (component_value.get("instanceId"), timings.get("id"))
+        if card_state.get("timings") != report_id:
+            card_state["timings"] = report_id
+            self.client = {k: v for k, v in timings.items() if k != "id"}
+
+    def finish(self, clicks: int) -> None:
+        metrics = CardMetrics(
+            renderer=self.renderer,
+            key=self.key,
+            cards=self.cards,
+            build_ms=self.times.get("build", 0.0),
+            component_ms=self.times.get("component", 0.0),
+            callback_ms=self.times.get("callback", 0.0),
+            total_ms=sum(self.times.values()),
+            payload_bytes=self.payload_bytes,
+            clicks=clicks,
+            client=self.client,
+        )
+        hook = _hook
+        if hook is None:
+            return
+        try:
+            hook(metrics)
+        except Exception:
+            _LOGGER.warning("Card metrics hook failed", exc_info=True)
+
+
+def _recorder(
+    renderer: str, key: Optional[str], cards: int = 1
+) -> Optional[_CallRecorder]:
+    """A recorder for one call, or None (the fast path) without a hook."""
+    if _hook is None:
+        return None
+    return _CallRecorder(renderer, key, cards)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Live updates of cards that are already mounted.
+
+Changing a card's price normally takes a rerun that resends every card's
+complete args. `push_card_updates` sends a batch of partial updates (price,
+stock badge, button text) keyed by card key instead: it renders a
+zero-height channel frame, which hands the batch to the other card frames
+of the page. Each frame applies the fields of its own cards, so only the
+changed cards re-render and their images are left alone. Called from a
+fragment with `run_every`, it streams updates without rerunning the page.
+
+The session keeps the latest pushed values, and cards rendered afterwards
+(after a rerun, or when a frame remounts) start from them. Like the
+cards' tracking state, values neither pushed nor rendered for a while are
+dropped.
+"""
+from typing import Any, Dict, Mapping, Optional
+
+from ._core import _component
+from .state import _session_state
+
+# `push_card_updates` field -> card prop.
+_LIVE_FIELDS = {
+    "price": "price",
+    "stock": "stock",
+    "button_text": "buttonText",
+}
+
+
+def _live_values() -> Dict[str, Dict[str, str]]:
+    """Card key -> props pushed in this session, applied over the card's."""
+    return _session_state().live
+
+
+def push_card_updates(
+    updates: Mapping[Any, Mapping[str, Any]], key: str = "product_card_updates"
+) -> None:
+    """
+    Applies partial updates to mounted cards without rerunning them.
+
+    Args:
+        updates: Card key -> fields to change, any of `price`, `stock` and
+            `button_text`. A card key is a `product_card`'s `key`, or the
+            `key` of a product in a grid. A field set to None stops
+            overriding the value passed to the card.
+        key: Key of the channel element. Needed only to push from more than
+            one place in the script.
+
+    Pushed values win over the ones passed to the cards, on mounted cards
+    and on cards rendered later in the session, until they are reverted.
+    Each call renders a zero-height element, so call it in the same place
+    on every run, ideally in a fragment running every few seconds.
+    """
+    batch: Dict[str, Dict[str, Optional[str]]] = {}
+    for card_key, fields in updates.items():
+        unknown = set(fields) - set(_LIVE_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"push_card_updates() can't update {sorted(unknown)}; "
+                f"fields are {sorted(_LIVE_FIELDS)}"
+            )
+        batch[str(card_key)] = {
+            _LIVE_FIELDS[field]: None if value is None else str(value)
+            for field, value in fields.items()
+        }
+
+    state = _session_state()
+    live = state.live
+    for card_key, props in batch.items():
+        overlay = live.setdefault(card_key, {})
+        for prop, value in props.items():
+            if value is None:
+                overlay.pop(prop, None)
+            else:
+                overlay[prop] = value
+        if not overlay:
+            del live[card_key]
+            state.live_seen.pop(card_key, None)
+    state.live_used(card_key for card_key in batch if card_key in live)
+    _component(liveUpdates=batch, key=key, default=None)
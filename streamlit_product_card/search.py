@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Search, filtering and sorting of grids in the browser.
+
+With `searchable=True`, a grid gets a toolbar with a search box, a sort
+menu and a price range. Its frame indexes the cards it received (an
+inverted index of the words of their names and descriptions, and the cards
+presorted by price), so each keystroke is answered in the browser instead
+of rerunning the script. Python only sends every card's price as a number
+for this, and hears what the shopper selected along with their next click,
+or when they press Enter in the search box: `catalog_view` returns it.
+"""
+import math
+import re
+from typing import Any, Dict, NamedTuple, Optional
+
+from .state import _session_state
+
+# A number in a price text: "€1,299.00", "1.299,00 kr", "CHF 1'299.-".
+_PRICE_NUMBER = re.compile(r"-?\d(?:[\d.,' ]*\d)?")
+_DECIMAL_COMMA = re.compile(r",\d{1,2}$")
+
+
+class CatalogView(NamedTuple):
+    """What a shopper selected in the toolbar of a `searchable` grid."""
+
+    query: str
+    """Text in the search box; cards match if they contain every word."""
+    sort: str
+    """`"default"` (the order of the products), `"price_asc"`,
+    `"price_desc"` or `"name"`."""
+    min_price: Optional[float]
+    max_price: Optional[float]
+    matches: int
+    """How many products the selection showed."""
+
+
+def _price_value(price: Any) -> Optional[float]:
+    """The number in a price, for sorting and price ranges in the browser."""
+    if isinstance(price, (int, float)) and not isinstance(price, bool):
+        return float(price) if math.isfinite(price) else None
+    if not isinstance(price, str):
+        return None
+    match = _PRICE_NUMBER.search(price)
+    if match is None:
+        return None
+    digits = match.group().replace(" ", "").replace("'", "")
+    if "," in digits and "." in digits:
+        # Whichever separator comes last is the decimal point.
+        thousands = "," if digits.rfind(",") < digits.rfind(".") else "."
+        digits = digits.replace(thousands, "").replace(",", ".")
+    elif "," in digits:
+        if _DECIMAL_COMMA.search(digits) and digits.count(",") == 1:
+            digits = digits.replace(",", ".")
+        else:
+            digits = digits.replace(",", "")
+    elif digits.count(".") > 1:
+        digits = digits.replace(".", "")
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+def _price_values(series: Any) -> Any:
+    """`_price_value` of a price column, numeric columns in one step."""
+    import pandas as pd
+
+    values = pd.to_numeric(series, errors="coerce")
+    text = values.isna() & series.notna()
+    if text.any():
+        values = values.where(
+            ~text, series[text].map(_price_value).astype(float)
+        )
+    # None rather than NaN, which JSON args can't carry.
+    return values.astype(object).where(values.notna(), None)
+
+
+def _store_view(
+    component_value: Dict[str, Any], card_state: Dict[str, Any]
+) -> None:
+    """Keeps the selection a searchable grid reported, for `catalog_view`."""
+    view = component_value.get("view")
+    if view:
+        card_state["view"] = CatalogView(
+            view.get("query", ""),
+            view.get("sort", "default"),
+            view.get("minPrice"),
+            view.get("maxPrice"),
+            view.get("matches", 0),
+        )
+
+
+def catalog_view(key: Optional[str] = None) -> Optional[CatalogView]:
+    """
+    Reports what the shopper last selected in a `searchable` grid.
+
+    Args:
+        key: The `key` of the `product_grid` or
+            `product_cards_from_dataframe`.
+
+    Returns:
+        Optional[CatalogView]: The search, sort and price range in effect
+        at the shopper's last click or search submission, or None if there
+        was neither yet.
+    """
+    entry = _session_state().entries.get(f"grid:{key or ''}")
+    return entry.get("view") if entry else None
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Per-session tracking state of cards and grids, kept in one bounded entry of
+`st.session_state`.
+
+Every card or grid gets a small dict (handled click sequences, the last
+theme request, ...) under its id. Entries are ordered by when their card
+was last rendered; cards not rendered for `ttl_seconds`, and the least
+recently rendered ones beyond `max_entries`, are dropped, so browsing
+thousands of products doesn't grow the session without bound. A dropped
+card simply starts over if it's rendered again. Cards rendered in the
+current or the previous script run are never dropped: their frames may
+still be mounted and keep sending their queued clicks, which a fresh
+entry would handle again. Values pushed to card keys are kept and dropped
+the same way, by when they were last pushed or rendered.
+"""
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+_STATE_KEY = "__product_card_state"
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_SECONDS = 30 * 60
+
+_max_entries = DEFAULT_MAX_ENTRIES
+_ttl_seconds: float = DEFAULT_TTL_SECONDS
+
+
+class CardStateInfo(NamedTuple):
+    entries: int
+    """Cards and grids currently tracked in this session."""
+    approx_bytes: int
+    """Approximate memory held by the tracking state, in bytes."""
+
+
+class _SessionCardState:
+    """All card tracking state of one session."""
+
+    def __init__(self) -> None:
+        # Card id -> entry, least recently rendered first.
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Theme id -> id of the card sending the theme body.
+        self.theme_carriers: Dict[str, str] = {}
+        # Card key -> fields pushed with `push_card_updates`, as props, and
+        # when they were last pushed or rendered, least recent first. They
+        # are dropped like entries.
+        self.live: Dict[str, Dict[str, str]] = {}
+        self.live_seen: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        # The latest full script run, and how many there have been.
+        self.run: Any = None
+        self.generation = 0
+        # Values computed once per script run, and the run they belong to.
+        self.memo: Dict[Any, Any] = {}
+        self.memo_run: Any = None
+
+    def entry(self, card_id: str) -> Dict[str, Any]:
+        now = time.monotonic()
+        entry = self.entries.get(card_id)
+        if entry is None:
+            entry = self.entries[card_id] = {}
+        else:
+            self.entries.move_to_end(card_id)
+        self.update_run()
+        entry["seen"] = now
+        entry["run"] = self.generation
+        self.evict(now)
+        return entry
+
+    def live_used(self, card_keys: Iterable[str]) -> None:
+        """Marks the pushed values of `card_keys` as pushed or rendered now."""
+        now = time.monotonic()
+        self.update_run()
+        for card_key in card_keys:
+            self.live_seen[card_key] = (now, self.generation)
+            self.live_seen.move_to_end(card_key)
+        self.evict(now)
+
+    def update_run(self) -> None:
+        run = _script_run(fragments=False)
+        if run is not None and run is not self.run:
+            self.run = run
+            self.generation += 1
+
+    def _droppable(
+        self, seen: float, run: int, count: int, now: float
+    ) -> bool:
+        """Whether an item last used at `seen`, in full run `run`, can be
+        dropped from a map of `count` items."""
+        if run >= self.generation - 1:
+            # Used in this run or the previous one: its frame may still be
+            # mounted.
+            return False
+        return count > _max_entries or seen < now - _ttl_seconds
+
+    def evict(self, now: float) -> None:
+        # Both maps are ordered by last use, so each stops at the first
+        # item it keeps.
+        while self.entries:
+            card_id, oldest = next(iter(self.entries.items()))
+            if not self._droppable(
+                oldest["seen"], oldest["run"], len(self.entries), now
+            ):
+                break
+            del self.entries[card_id]
+            for theme_id, carrier in list(self.theme_carriers.items()):
+                if carrier == card_id:
+                    del self.theme_carriers[theme_id]
+        while self.live_seen:
+            card_key, (seen, run) = next(iter(self.live_seen.items()))
+            if not self._droppable(seen, run, len(self.live_seen), now):
+                break
+            del self.live_seen[card_key]
+            self.live.pop(card_key, None)
+
+
+def _script_run(fragments: bool = True) -> Any:
+    """An object identifying the script run in progress.
+
+    None outside a script run, and with `fragments=False` during fragment
+    reruns, which leave the frames of the rest of the page mounted.
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None or (
+        not fragments and getattr(ctx, "fragment_ids_this_run", None)
+    ):
+        return None
+    # Streamlit gives the context a new `cursors` dict at the start of
+    # every run; holding on to it keeps its identity unique.
+    return ctx.cursors
+
+
+def _session_state() -> _SessionCardState:
+    import streamlit as st
+
+    state = st.session_state.get(_STATE_KEY)
+    if state is None:
+        state = st.session_state[_STATE_KEY] = _SessionCardState()
+    return state
+
+
+def _card_state(card_id: str) -> Dict[str, Any]:
+    """Returns the tracking entry of `card_id`, marking it rendered now."""
+    return _session_state().entry(card_id)
+
+
+def _run_memo() -> Dict[Any, Any]:
+    """A dict of this session that starts empty in every script run."""
+    state = _session_state()
+    run = _script_run()
+    if run is not state.memo_run:
+        state.memo_run = run
+        state.memo = {}
+    return state.memo
+
+
+def _live_used(card_keys: Iterable[str]) -> None:
+    """Marks the pushed values of `card_keys` as rendered in this run."""
+    _session_state().live_used(card_keys)
+
+
+def _theme_carriers() -> Dict[str, str]:
+    """Theme id -> id of the card that sends the theme body."""
+    return _session_state().theme_carriers
+
+
+def _approx_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            _approx_size(k) + _approx_size(v) for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_approx_size(item) for item in value)
+    return size
+
+
+def configure_card_state(
+    max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None
+) -> None:
+    """
+    Sets how much card tracking state each session keeps.
+
+    Args:
+        max_entries: Cards and grids tracked per session; the least recently
+            rendered are dropped beyond it, except those rendered in the
+            current or the previous run. Defaults to 1000.
+        ttl_seconds: Cards not rendered for this long are dropped, with the
+            same exception. Defaults to 30 minutes.
+    """
+    global _max_entries, _ttl_seconds
+    _max_entries = DEFAULT_MAX_ENTRIES if max_entries is None else max_entries
+    _ttl_seconds = DEFAULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+
+
+def card_state_info() -> CardStateInfo:
+    """
+    Reports the card tracking state held by the current session.
+
+    Returns:
+        CardStateInfo: The number of tracked cards and grids, and roughly
+        how many bytes their state takes.
+    """
+    import streamlit as st
+
+    state = st.session_state.get(_STATE_KEY)
+    if state is None:
+        return CardStateInfo(0, 0)
+    state.evict(time.monotonic())
+    return CardStateInfo(
+        len(state.entries),
+        _approx_size(state.entries)
+        + _approx_size(state.theme_carriers)
+        + _approx_size(state.live)
+        + _approx_size(state.live_seen),
+    )
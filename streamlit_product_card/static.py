@@ -0,0 +1,480 @@
+# -*- coding: utf-8 -*-
+"""
+Static HTML rendering of product cards, for prerendered pages and emails.
+
+`render_product_card_html` takes the `product_card` arguments and returns
+the markup the React card renders, with the classes of the stylesheet the
+component ships (`frontend/src/card.css`), so exported cards can't drift
+from the real one. `styles` overrides become inline `style` attributes,
+and themes are resolved in Python. Markup is memoized by a digest of the
+normalized arguments.
+
+`export_product_cards_html` writes one file per product plus a shared
+stylesheet, and keeps a manifest of digests in the output directory:
+re-exporting a catalog only renders and writes the products that changed,
+spread over a process pool.
+"""
+import hashlib
+import html
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ._core import _build_card_args, _merge_styles
+from .fonts import _with_display_swap
+from .themes import get_card_theme
+
+_CSS_PATH = os.path.join(
+    os.path.dirname(__file__), "frontend", "src", "card.css"
+)
+# Rules for the component's own frame, not for a page embedding the cards.
+_FRAME_RULES = re.compile(r"^(?:body|#root) \{[^}]*\}\n*", re.MULTILINE)
+
+# Streamlit's default light theme, which the cards inherit in an app.
+_DEFAULT_THEME = {
+    "font": '"Source Sans Pro"',
+    "secondaryBackgroundColor": "#f0f2f6",
+    "textColor": "#31333F",
+    "primaryColor": "#FF4B4B",
+}
+_THEME_VARIABLES = (
+    ("--pc-font", "font", "{}, sans-serif"),
+    ("--pc-bg", "secondaryBackgroundColor", "{}"),
+    ("--pc-text-color", "textColor", "{}"),
+    ("--pc-primary-color", "primaryColor", "{}"),
+)
+
+# Layout classes of `card.css` for each mobile breakpoint behavior.
+_MOBILE_CLASSES = {
+    "stack top": "pc-card--stack-top",
+    "stack bottom": "pc-card--stack-bottom",
+}
+# CSS properties whose numeric values take no unit, as in emotion.
+_UNITLESS = {
+    "flex",
+    "flex-grow",
+    "flex-shrink",
+    "font-weight",
+    "line-height",
+    "opacity",
+    "order",
+    "z-index",
+    "zoom",
+}
+
+_MAX_CACHED_CARDS = 10000
+_markup_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+_css_text: Optional[str] = None
+
+
+class ExportStats(NamedTuple):
+    rendered: int
+    """Products rendered and written, because they were new or changed."""
+    unchanged: int
+    """Products skipped because their file is up to date."""
+    seconds: float
+    removed: int = 0
+    """Files of an earlier export deleted because their product is gone."""
+
+
+def product_card_css(theme: Optional[Dict[str, str]] = None) -> str:
+    """
+    Returns the stylesheet for cards from `render_product_card_html`.
+
+    Args:
+        theme: Colors and font the cards use, with the keys of Streamlit's
+            theme options: `font`, `secondaryBackgroundColor` (the card
+            background), `textColor` and `primaryColor`. Missing keys use
+            Streamlit's default light theme.
+    """
+    global _css_text
+    if _css_text is None:
+        with open(_CSS_PATH, encoding="utf-8") as f:
+            _css_text = _FRAME_RULES.sub("", f.read())
+    colors = {**_DEFAULT_THEME, **(theme or {})}
+    variables = "\n".join(
+        f"  {name}: {template.format(colors[option])};"
+        for name, option, template in _THEME_VARIABLES
+    )
+    return f".pc-card {{\n{variables}\n}}\n\n{_css_text}"
+
+
+def _static_args(
+    product_name: str,
+    font_url: Optional[str] = None,
+    styles: Optional[Dict[str, Dict[str, Any]]] = None,
+    theme: Optional[str] = None,
+    button_url: Optional[str] = None,
+    **card_fields: Any,
+) -> Dict[str, Any]:
+    """The card's props as the frontend would see them, themes applied."""
+    if theme is not None:
+        card_theme = get_card_theme(theme)
+        styles = _merge_styles(card_theme.styles, styles)
+        font_url = font_url or card_theme.font_url
+    font_url = _with_display_swap(font_url) if font_url else None
+    props = _build_card_args(
+        product_name,
+        styles=styles,
+        font_url=font_url,
+        # Registered fonts are served by a Streamlit app; a static page
+        # loads the font from its origin.
+        font_args={font_url: {"fontUrl": font_url}},
+        **card_fields,
+    )
+    if button_url:
+        props["buttonUrl"] = button_url
+    return props
+
+
+def _digest(props: Dict[str, Any]) -> str:
+    content = json.dumps(props, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _css_value(name: str, value: Any) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if value != 0 and name not in _UNITLESS:
+            return f"{value}px"
+    return str(value)
+
+
+def _style_attr(declarations: Dict[str, Any]) -> str:
+    if not declarations:
+        return ""
+    text = "; ".join(
+        f"{name}: {_css_value(name, v)}" for name, v in declarations.items()
+    )
+    return f' style="{html.escape(text)}"'
+
+
+def _class_attr(*names: Optional[str]) -> str:
+    return f' class="{" ".join(name for name in names if name)}"'
+
+
+def _image_markup(props: Dict[str, Any], slot_styles: Dict[str, Any]) -> str:
+    native = props["imageAspectRatio"] == "native"
+    frame_class = _class_attr(
+        "pc-image", None if native else "pc-image--ratio"
+    )
+    img_class = _class_attr("pc-img", "pc-img--native" if native else None)
+    src = html.escape(props["productImage"])
+    alt = html.escape(props["productName"])
+    return (
+        f"<div{frame_class}><img{img_class}{_style_attr(slot_styles)}"
+        f' src="{src}" alt="{alt}" loading="lazy"></div>'
+    )
+
+
+def _card_markup(props: Dict[str, Any]) -> str:
+    """Renders normalized props the way `ProductCard` in stCard.tsx does."""
+    styles = props["styles"] or {}
+    position = props["picturePosition"]
+    horizontal = position in ("left", "right")
+    button_text = props["buttonText"]
+    show_button = bool(button_text and button_text.strip())
+
+    variables: Dict[str, Any] = {"--pc-object-fit": props["imageObjectFit"]}
+    radius = (styles.get("card") or {}).get("border-radius")
+    if radius is not None:
+        variables["--pc-radius"] = _css_value("border-radius", radius)
+    if horizontal:
+        variables["--pc-image-width"] = f'{props["imageWidthPercent"]}%'
+    if props["imageAspectRatio"] != "native":
+        ratio = props["imageAspectRatio"]
+        variables["--pc-aspect-ratio"] = "1 / 1" if ratio == "1/1" else ratio
+
+    card_class = _class_attr(
+        "pc-card",
+        f"pc-card--{position}",
+        _MOBILE_CLASSES.get(props["mobileBreakpointBehavior"])
+        if horizontal
+        else None,
+        "pc-card--animated" if props["enableAnimation"] else None,
+        None if show_button else "pc-card--clickable",
+    )
+    card_styles = {**variables, **(styles.get("card") or {})}
+    parts = [f"<div{card_class}{_style_attr(card_styles)}>"]
+    image = (
+        _image_markup(props, styles.get("image") or {})
+        if props["productImage"]
+        else ""
+    )
+    if position in ("top", "left"):
+        parts.append(image)
+
+    # The "text" slot styles both the content column and the description.
+    text_styles = styles.get("text") or {}
+    parts.append(f'<div class="pc-content"{_style_attr(text_styles)}>')
+    parts.append(
+        f'<h3 class="pc-title"{_style_attr(styles.get("title") or {})}>'
+        f'{html.escape(props["productName"])}</h3>'
+    )
+    lines = props["description"]
+    if lines:
+        last = len(lines) - 1
+        spans = "".join(
+            f"<span>{html.escape(line)}{'<br>' if i < last else ''}</span>"
+            for i, line in enumerate(lines)
+        )
+        parts.append(
+            f'<div class="pc-text"{_style_attr(text_styles)}>{spans}</div>'
+        )
+    if props["price"]:
+        parts.append(
+            f'<div class="pc-price"{_style_attr(styles.get("price") or {})}>'
+            f'{html.escape(props["price"])}</div>'
+        )
+    if props.get("stock"):
+        parts.append(
+            f'<div class="pc-stock"{_style_attr(styles.get("stock") or {})}>'
+            f'{html.escape(props["stock"])}</div>'
+        )
+    if show_button:
+        button_styles = _style_attr(styles.get("button") or {})
+        if props.get("buttonUrl"):
+            href = html.escape(props["buttonUrl"])
+            parts.append(
+                f'<a class="pc-button" href="{href}"{button_styles}>'
+                f"{html.escape(button_text)}</a>"
+            )
+        else:
+            parts.append(
+                f'<button class="pc-button" type="button"{button_styles}>'
+                f"{html.escape(button_text)}</button>"
+            )
+    parts.append("</div>")
+
+    if position in ("bottom", "right"):
+        parts.append(image)
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def _cached_markup(props: Dict[str, Any], digest: str) -> str:
+    with _cache_lock:
+        markup = _markup_cache.get(digest)
+        if markup is not None:
+            _markup_cache.move_to_end(digest)
+            return markup
+    markup = _card_markup(props)
+    with _cache_lock:
+        _markup_cache[digest] = markup
+        while len(_markup_cache) > _MAX_CACHED_CARDS:
+            _markup_cache.popitem(last=False)
+    return markup
+
+
+def _font_link(font_url: Optional[str]) -> str:
+    if not font_url:
+        return ""
+    return f'<link rel="stylesheet" href="{html.escape(font_url)}">'
+
+
+def render_product_card_html(
+    product_name: str,
+    description: Optional[Union[str, List[str]]] = None,
+    price: Optional[Union[str, float]] = None,
+    product_image: Optional[str] = None,
+    button_text: Optional[str] = None,
+    picture_position: str = "top",
+    enable_animation: bool = True,
+    font_url: Optional[str] = None,
+    image_width_percent: Optional[int] = 30,
+    image_aspect_ratio: str = "native",
+    image_object_fit: str = "cover",
+    mobile_breakpoint_behavior: str = "none",
+    styles: Optional[Dict[str, Dict[str, Any]]] = None,
+    theme: Optional[str] = None,
+    stock: Optional[Union[str, int]] = None,
+    button_url: Optional[str] = None,
+    include_css: bool = True,
+) -> str:
+    """
+    Renders a product card as static HTML, matching `product_card`.
+
+    Takes the display arguments of `product_card`, plus:
+
+    Args:
+        button_url: If set, the button is a link to this URL, since a static
+            page has no `on_button_click`.
+        include_css: Prepend a `<style>` block with `product_card_css()`
+            and a `<link>` to the card's font. Leave it off when rendering
+            many cards into one page, and include the stylesheet once.
+
+    Returns:
+        str: The card's markup. Results are memoized by a digest of the
+        normalized arguments, so unchanged cards are rendered once.
+    """
+    props = _static_args(
+        product_name,
+        description=description,
+        price=price,
+        product_image=product_image,
+        button_text=button_text,
+        picture_position=picture_position,
+        enable_animation=enable_animation,
+        font_url=font_url,
+        image_width_percent=image_width_percent,
+        image_aspect_ratio=image_aspect_ratio,
+        image_object_fit=image_object_fit,
+        mobile_breakpoint_behavior=mobile_breakpoint_behavior,
+        styles=styles,
+        theme=theme,
+        stock=stock,
+        button_url=button_url,
+    )
+    markup = _cached_markup(props, _digest(props))
+    if not include_css:
+        return markup
+    css = f"<style>{product_card_css()}</style>"
+    return f"{_font_link(props['fontUrl'])}{css}{markup}"
+
+
+# Product entries `export_product_cards_html` passes on to the renderer.
+_EXPORT_FIELDS = set(
+    inspect.signature(render_product_card_html).parameters
+) - {"include_css"}
+_FILE_NAME = re.compile(r"[^\w.-]")
+_MANIFEST = "manifest.json"
+_STYLESHEET = "product-card.css"
+
+
+def _file_name(key: str) -> str:
+    """The file name (without extension) of the product with `key`.
+
+    Characters unsafe in file names are replaced, and a short digest of the
+    key is then appended so that, e.g., "a/b" and "a_b" get different files.
+    """
+    name = _FILE_NAME.sub("_", key)
+    if name == key:
+        return name
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
+    return f"{name}-{digest}"
+
+
+def _write_cards(batch: List[Tuple[str, Dict[str, Any]]]) -> int:
+    """Renders and writes a batch of (path, props); runs in pool workers."""
+    for path, props in batch:
+        markup = _font_link(props["fontUrl"]) + _card_markup(props)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markup)
+    return len(batch)
+
+
+def export_product_cards_html(
+    products: Iterable[Mapping[str, Any]],
+    out_dir: str,
+    processes: Optional[int] = None,
+    chunk_size: int = 500,
+    theme: Optional[Dict[str, str]] = None,
+) -> ExportStats:
+    """
+    Writes each product as a static HTML card, skipping unchanged ones.
+
+    Every product becomes `<out_dir>/<key>.html` (its index if it has no
+    `key`), holding the card's markup without CSS, and the stylesheet is
+    written once to `<out_dir>/product-card.css`. Keys with characters
+    unsafe in file names get them replaced and a short digest of the key
+    appended. A `manifest.json` records a digest of each product's
+    normalized arguments, so a later export with the same `out_dir` only
+    renders the products that changed, and deletes the files of products
+    that are gone.
+
+    Args:
+        products: Dicts of `render_product_card_html` arguments, plus an
+            optional `key` naming the product's file, or `ProductSpec`s. Other
+            entries, such as `on_button_click`, are ignored.
+        out_dir: Directory to write to; created if needed.
+        processes: Worker processes for rendering. Defaults to the CPU
+            count; 1 renders in this process. Small exports always do.
+        chunk_size: Products per task sent to a worker.
+        theme: Colors and font for the stylesheet, as in `product_card_css`.
+
+    Returns:
+        ExportStats: How many products were rendered and skipped, and how
+        many files of earlier exports were removed.
+
+    Raises:
+        ValueError: If two products have the same file name, e.g. the same
+            `key`, or a `key` equal to another product's index.
+    """
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, _MANIFEST)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            previous: Dict[str, str] = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    manifest: Dict[str, str] = {}
+    todo: List[Tuple[str, Dict[str, Any]]] = []
+    unchanged = 0
+    for index, product in enumerate(products):
+        key = str(product.get("key", index))
+        name = _file_name(key)
+        if name in manifest:
+            raise ValueError(
+                f"Product {index} ({key!r}) would overwrite the file of an "
+                f"earlier product, {name}.html; give it a different key"
+            )
+        props = _static_args(
+            **{k: v for k, v in product.items() if k in _EXPORT_FIELDS}
+        )
+        digest = manifest[name] = _digest(props)
+        path = os.path.join(out_dir, f"{name}.html")
+        if previous.get(name) == digest and os.path.exists(path):
+            unchanged += 1
+        else:
+            todo.append((path, props))
+
+    with open(os.path.join(out_dir, _STYLESHEET), "w", encoding="utf-8") as f:
+        f.write(product_card_css(theme))
+    batches = [
+        todo[i : i + chunk_size] for i in range(0, len(todo), chunk_size)
+    ]
+    if processes == 1 or len(batches) < 2:
+        for batch in batches:
+            _write_cards(batch)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(processes) as pool:
+            list(pool.map(_write_cards, batches))
+
+    # Only files an earlier export listed are deleted, never others that
+    # happen to be in `out_dir`.
+    removed = 0
+    for name in previous.keys() - manifest.keys():
+        if _FILE_NAME.search(name):  # Not a name this function writes
+            continue
+        try:
+            os.remove(os.path.join(out_dir, f"{name}.html"))
+        except FileNotFoundError:
+            continue
+        removed += 1
+
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return ExportStats(
+        len(todo), unchanged, time.perf_counter() - start, removed
+    )
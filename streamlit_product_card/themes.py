@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Named card themes, sent to the browser once instead of with every card.
+
+A theme bundles a `styles` dict and an optional `font_url`. Cards reference
+it by id; the body travels only with the first card that uses it in a
+session and is shared with the other card frames through the browser's
+`sessionStorage`. A `product_grid` sends each theme it uses once per grid.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from .fonts import _font_args
+from .state import _theme_carriers
+
+
+class CardTheme(NamedTuple):
+    name: str
+    theme_id: str
+    styles: Dict[str, Dict[str, Any]]
+    font_url: Optional[str]
+
+    def body(self) -> Dict[str, Any]:
+        """The theme as the frontend reads it."""
+        return {"styles": self.styles, **_font_args(self.font_url)}
+
+
+_themes: Dict[str, CardTheme] = {}
+_themes_lock = threading.Lock()
+
+
+def register_card_theme(
+    name: str,
+    styles: Dict[str, Dict[str, Any]],
+    font_url: Optional[str] = None,
+) -> str:
+    """
+    Registers a reusable card look that cards can reference with `theme=`.
+
+    Registering the same name again replaces the theme; the id changes with
+    the content, so browsers pick up the new version on the next rerun.
+
+    Args:
+        name: Name passed as `theme=` to `product_card` or `product_grid`.
+        styles: Same format as the `styles` argument of `product_card`.
+        font_url: URL to a CSS file for custom fonts, as in `product_card`.
+
+    Returns:
+        str: The theme id sent to the frontend.
+    """
+    content = json.dumps([styles, font_url], sort_keys=True)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    theme = CardTheme(name, f"{name}@{digest}", styles, font_url)
+    with _themes_lock:
+        _themes[name] = theme
+    return theme.theme_id
+
+
+def get_card_theme(name: str) -> CardTheme:
+    """Returns the registered theme called `name`."""
+    try:
+        return _themes[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown card theme {name!r}. Register it first with "
+            "register_card_theme()."
+        ) from None
+
+
+def _theme_body_if_carrier(
+    theme: CardTheme, card_id: str
+) -> Optional[Dict[str, Any]]:
+    """Returns the theme body if `card_id` is the card that carries it.
+
+    The first card of a session using a theme becomes its carrier and keeps
+    sending the body on every rerun, so no card's args (and, for unkeyed
+    cards, its identity) change between reruns. A carrier dropped from the
+    session's card state hands the theme to the next card using it.
+    """
+    carriers = _theme_carriers()
+    if carriers.setdefault(theme.theme_id, card_id) != card_id:
+        return None
+    return theme.body()
+
+
+def _forget_sent_themes(theme_ids: Iterable[str]) -> None:
+    """Makes the next card using these themes carry their body."""
+    carriers = _theme_carriers()
+    for theme_id in theme_ids:
+        carriers.pop(theme_id, None)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import json
+from typing import Any, Callable, List, Optional
+
+import pytest
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from streamlit.testing.v1 import AppTest
+
+from streamlit_product_card import configure_card_state
+
+
+def _frames(at: AppTest) -> List[Any]:
+    return [e for e in at.main if hasattr(e.proto, "json_args")]
+
+
+@pytest.fixture
+def send_values() -> Callable[[AppTest, List[Optional[Any]]], AppTest]:
+    """Reruns `at` as if its frames had sent `values`, in render order.
+
+    Frames given None send nothing. A browser frame sends its last value
+    again with every rerun, so tests of repeated delivery pass the same
+    values on each run.
+    """
+
+    def send(at: AppTest, values: List[Optional[Any]]) -> AppTest:
+        states = WidgetStates()
+        for frame, value in zip(_frames(at), values):
+            if value is not None:
+                state = states.widgets.add()
+                state.id = frame.proto.id
+                state.json_value = json.dumps(value)
+        return at._run(states)
+
+    return send
+
+
+@pytest.fixture(autouse=True)
+def _default_card_state():
+    yield
+    configure_card_state()
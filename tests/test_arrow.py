@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pyarrow as pa
+from streamlit.testing.v1 import AppTest
+
+
+def _arrow_grid_app() -> None:
+    from streamlit_product_card import product_grid
+
+    products = [
+        {"product_name": f"P{i}", "price": i, "key": i} for i in range(300)
+    ]
+    # Two looks: the grid default, and one product with its own styles.
+    products[7]["styles"] = {"card": {"border-radius": "4px"}}
+    product_grid(products, transport="arrow", key="grid")
+
+
+def test_arrow_grid_sends_columns_and_shared_looks():
+    at = AppTest.from_function(_arrow_grid_app).run()
+    assert not at.exception
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    args = json.loads(frame.proto.json_args)
+    assert "cards" not in args
+    assert len(args["looks"]) == 2
+
+    (special,) = frame.proto.special_args
+    assert special.key == "catalog"
+    table = pa.ipc.open_stream(special.arrow_dataframe.data.data).read_all()
+    assert table.num_rows == 300
+    assert table.column("productName").to_pylist()[:2] == ["P0", "P1"]
+    style_ids = table.column("styleId").to_pylist()
+    assert style_ids[7] != style_ids[6] == style_ids[8]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+def _background_app() -> None:
+    import threading
+
+    import streamlit as st
+
+    from streamlit_product_card import click_task, product_card
+
+    gate = st.session_state.setdefault("gate", threading.Event())
+
+    def reserve() -> int:
+        gate.wait(5)
+        return 42
+
+    product_card("Mug", key="mug", on_button_click=reserve, background=True)
+    st.session_state.task = click_task("mug")
+
+
+def _pending_arg(at: AppTest) -> bool:
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    return json.loads(frame.proto.json_args)["pending"]
+
+
+def test_background_click_goes_from_pending_to_done(send_values):
+    at = AppTest.from_function(_background_app).run()
+    assert not at.exception
+    assert at.session_state.task is None
+    assert _pending_arg(at) is False
+
+    click = {"instanceId": "a", "events": [{"seq": 1, "timestamp": 1}]}
+    at = send_values(at, [click])
+    assert at.session_state.task.status == "pending"
+    at = send_values(at, [click])
+    assert _pending_arg(at) is True
+    assert at.session_state.task.status == "pending"
+
+    at.session_state.gate.set()
+    deadline = time.monotonic() + 5
+    while at.session_state.task.status == "pending":
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+        at = send_values(at, [click])
+    assert at.session_state.task.status == "done"
+    assert at.session_state.task.result == 42
+    assert _pending_arg(at) is False
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from streamlit_product_card import ProductCatalog
+
+
+def test_prices_shown_as_given_without_a_format():
+    products = [
+        {"product_name": "A", "price": "$19.90"},
+        {"product_name": "B", "price": 19.9},
+        {"product_name": "C", "price": 20},
+        {"product_name": "D"},
+    ]
+    catalog = ProductCatalog(products)
+    assert [spec.get("price") for spec in catalog] == [
+        "$19.90",
+        "19.9",
+        "20",
+        None,
+    ]
+
+
+def test_price_format_applies_to_text_prices():
+    catalog = ProductCatalog(
+        [{"product_name": "A", "price": "$19.9"}], price_format="${:.2f}"
+    )
+    assert catalog[0]["price"] == "$19.90"
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import json
+
+from streamlit.testing.v1 import AppTest
+
+
+def _filtered_frame_app() -> None:
+    import pandas as pd
+
+    from streamlit_product_card import product_cards_from_dataframe
+
+    catalog = pd.DataFrame(
+        {
+            "product_name": ["A", "B", "C", "D"],
+            "description": ["Soft|Warm", None, "Light", None],
+            "price": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+    product_cards_from_dataframe(
+        catalog[catalog.price > 1], description_separator="|", key="grid"
+    )
+
+
+def test_descriptions_of_a_filtered_frame():
+    at = AppTest.from_function(_filtered_frame_app).run()
+    assert not at.exception
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    columns = json.loads(frame.proto.json_args)["cardColumns"]
+    assert columns["description"] == [[], ["Light"], []]
+
+
+def _columns_app() -> None:
+    import pandas as pd
+
+    from streamlit_product_card import product_cards_from_dataframe
+
+    catalog = pd.DataFrame(
+        {"product_name": ["A", "B"], "price": [1.5, None], "key": ["a", "b"]}
+    )
+    product_cards_from_dataframe(
+        catalog,
+        price_format="${:.2f}",
+        button_text="Add",
+        searchable=True,
+        key="grid",
+    )
+
+
+def test_json_transport_sends_columns_and_shared_fields_once():
+    at = AppTest.from_function(_columns_app).run()
+    assert not at.exception
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    args = json.loads(frame.proto.json_args)
+
+    assert "cards" not in args
+    columns = args["cardColumns"]
+    assert columns["productName"] == ["A", "B"]
+    assert columns["price"] == ["$1.50", ""]
+    assert columns["priceValue"] == [1.5, None]
+    assert columns["liveKey"] == ["a", "b"]
+    [look] = args["looks"]
+    assert look["buttonText"] == "Add"
+    assert args["search"] == {"priceRange": True}
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json
+
+from streamlit.testing.v1 import AppTest
+
+
+def _events(*seqs):
+    return [{"seq": seq, "timestamp": 1000 * seq} for seq in seqs]
+
+
+def _cards_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import product_card
+
+    st.session_state.setdefault("clicks", [])
+    for i in range(st.session_state.get("cards", 1)):
+        key = f"k{i}" if st.session_state.get("keyed") else None
+        name = "Same name" if st.session_state.get("same_name") else f"P{i}"
+        for click in product_card(name, price=i, key=key):
+            st.session_state.clicks.append((i, click.seq))
+
+
+def _acks(at: AppTest) -> dict:
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    return json.loads(json.loads(frame.proto.json_args)["acks"])
+
+
+def test_queued_clicks_delivered_once_in_order(send_values):
+    at = AppTest.from_function(_cards_app).run()
+    at = send_values(at, [{"instanceId": "a", "events": _events(2, 1)}])
+    assert at.session_state.clicks == [(0, 1), (0, 2)]
+    # The unacknowledged queue arrives again, with one more click.
+    at = send_values(at, [{"instanceId": "a", "events": _events(1, 2, 3)}])
+    at = send_values(at, [{"instanceId": "a", "events": _events(1, 2, 3)}])
+    assert at.session_state.clicks == [(0, 1), (0, 2), (0, 3)]
+
+
+def test_keyed_frames_get_acks(send_values):
+    at = AppTest.from_function(_cards_app)
+    at.session_state.keyed = True
+    at.run()
+    assert _acks(at) == {}
+    at = send_values(at, [{"instanceId": "a", "events": _events(1, 2)}])
+    # Acks are part of the args, which are sent before the clicks are
+    # handled: they reach the frame with the next run.
+    assert _acks(at) == {}
+    at.run()
+    assert _acks(at) == {"a": 2}
+    # Once acknowledged, the frame drops those clicks from its queue.
+    at = send_values(at, [{"instanceId": "a", "events": _events(3)}])
+    at.run()
+    assert at.session_state.clicks == [(0, 1), (0, 2), (0, 3)]
+    assert _acks(at) == {"a": 3}
+
+
+def test_remounted_frame_starts_a_new_sequence(send_values):
+    at = AppTest.from_function(_cards_app)
+    at.session_state.keyed = True
+    at.run()
+    at = send_values(at, [{"instanceId": "a", "events": _events(1, 2)}])
+    at = send_values(at, [{"instanceId": "b", "events": _events(1)}])
+    at.run()
+    assert at.session_state.clicks == [(0, 1), (0, 2), (0, 1)]
+    assert _acks(at) == {"a": 2, "b": 1}
+
+
+def test_many_unkeyed_cards_sharing_a_name(send_values):
+    at = AppTest.from_function(_cards_app)
+    at.session_state.cards = 10
+    at.session_state.same_name = True
+    at.run()
+    values = [{"instanceId": f"i{i}", "events": _events(1)} for i in range(10)]
+    for _ in range(4):
+        # Unkeyed frames get no acks, so they keep sending their queue.
+        at = send_values(at, values)
+        assert not at.exception
+        assert sorted(at.session_state.clicks) == [(i, 1) for i in range(10)]
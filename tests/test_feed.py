@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import json
+
+from streamlit.testing.v1 import AppTest
+
+
+def _feed_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import product_feed
+
+    pulled = st.session_state.setdefault("pulled", [])
+
+    def products():
+        for i in range(25):
+            pulled.append(i)
+            yield {"product_name": f"P{i}", "key": f"p{i}"}
+
+    st.session_state.clicks = product_feed(
+        products(), chunk_size=10, key="feed", source_key="all"
+    )
+
+
+def _grid_args(at: AppTest) -> dict:
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    return json.loads(frame.proto.json_args)
+
+
+def _names(args: dict) -> list:
+    return [card["productName"] for card in args["cards"]]
+
+
+def test_feed_sends_one_more_chunk_per_request(send_values):
+    at = AppTest.from_function(_feed_app).run()
+    assert not at.exception
+    args = _grid_args(at)
+    feed = args["feed"]
+    assert feed["chunk"] == 0 and not feed["done"]
+    assert _names(args) == [f"P{i}" for i in range(10)]
+    # The generator is read no further than the chunk sent.
+    assert at.session_state.pulled == list(range(10))
+
+    more = {"instanceId": "a", "more": [feed["id"], 0]}
+    at = send_values(at, [more])
+    args = _grid_args(at)
+    assert args["feed"]["chunk"] == 1
+    assert _names(args) == [f"P{i}" for i in range(10, 20)]
+    assert at.session_state.pulled == list(range(20))
+
+    # The same request again, as a rerun resends it, does not skip a chunk.
+    at = send_values(at, [more])
+    assert _grid_args(at)["feed"]["chunk"] == 1
+
+    at = send_values(at, [{"instanceId": "a", "more": [feed["id"], 1]}])
+    args = _grid_args(at)
+    assert args["feed"]["chunk"] == 2 and args["feed"]["done"]
+    assert _names(args) == [f"P{i}" for i in range(20, 25)]
+
+
+def test_feed_click_reports_the_product_key(send_values):
+    at = AppTest.from_function(_feed_app).run()
+    click = {
+        "instanceId": "a",
+        "events": [{"seq": 1, "timestamp": 1000, "productKey": "p3"}],
+    }
+    at = send_values(at, [click])
+
+    assert [c.product for c in at.session_state.clicks] == ["p3"]
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+CSS = """
+@font-face {
+  font-family: 'Card Sans';
+  src: url(card-sans-latin.woff2) format('woff2');
+  unicode-range: U+0000-00FF;
+}
+@font-face {
+  font-family: 'Card Sans';
+  src: url(card-sans-greek.woff2) format('woff2');
+  unicode-range: U+0370-03FF;
+}
+"""
+
+
+@pytest.fixture
+def font_url(tmp_path):
+    (tmp_path / "card-sans.css").write_text(CSS)
+    for name in ("card-sans-latin.woff2", "card-sans-greek.woff2"):
+        (tmp_path / name).write_bytes(b"wOF2" + name.encode())
+    return (tmp_path / "card-sans.css").as_uri()
+
+
+def _frame_args(at: AppTest) -> list:
+    return [
+        json.loads(e.proto.json_args)
+        for e in at.main
+        if hasattr(e.proto, "json_args")
+    ]
+
+
+def _card_props(args: dict) -> dict:
+    """A single card's props, which travel as one JSON string."""
+    props = json.loads(args.pop("card"))
+    return {**props, **args}
+
+
+def _cards_app(font_url: str, cache_dir: str) -> None:
+    from streamlit_product_card import product_card, register_card_font
+
+    register_card_font(font_url, cache_dir=cache_dir)
+    for i in range(3):
+        product_card(f"P{i}", font_url=font_url, key=f"k{i}")
+
+
+def test_registered_font_is_served_by_the_app(font_url, tmp_path):
+    at = AppTest.from_function(
+        _cards_app, args=(font_url, str(tmp_path / "cache"))
+    ).run()
+    assert not at.exception
+    cards = [_card_props(args) for args in _frame_args(at)]
+    # Every card points at the same served stylesheet, not the font host,
+    # and preloads only the file covering Latin text.
+    assert len({card["fontUrl"] for card in cards}) == 1
+    assert cards[0]["fontUrl"] != font_url
+    assert all(len(card["fontPreload"]) == 1 for card in cards)
+
+
+def _arrow_grid_app(font_url: str, cache_dir: str) -> None:
+    from streamlit_product_card import product_grid, register_card_font
+
+    register_card_font(font_url, cache_dir=cache_dir)
+    product_grid(
+        [{"product_name": f"P{i}"} for i in range(20)],
+        font_url=font_url,
+        transport="arrow",
+        key="grid",
+    )
+
+
+def test_arrow_grid_shares_one_look_with_a_registered_font(font_url, tmp_path):
+    at = AppTest.from_function(
+        _arrow_grid_app, args=(font_url, str(tmp_path / "cache"))
+    ).run()
+    assert not at.exception
+    (args,) = _frame_args(at)
+    (look,) = args["looks"]
+    assert len(look["fontPreload"]) == 1
+
+
+def test_unreachable_font_falls_back_to_its_url(tmp_path):
+    from streamlit_product_card import register_card_font
+
+    missing = (tmp_path / "missing.css").as_uri()
+    assert not register_card_font(missing, cache_dir=str(tmp_path))
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from streamlit.testing.v1 import AppTest
+
+
+def _fragment_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import product_card
+
+    st.session_state.setdefault("clicks", 0)
+
+    def count() -> None:
+        st.session_state.clicks += 1
+
+    product_card("Mug", key="mug", on_button_click=count, fragment=True)
+
+
+def test_fragment_card_calls_back_once_per_click(send_values):
+    at = AppTest.from_function(_fragment_app).run()
+    assert not at.exception
+    # The card is registered as a fragment, which a click in the browser
+    # reruns on its own.
+    assert len(at._fragment_storage._fragments) == 1
+    click = {"instanceId": "a", "events": [{"seq": 1, "timestamp": 1}]}
+    at = send_values(at, [click])
+    assert not at.exception
+    assert at.session_state.clicks == 1
+    # The frame resends its queue until it is acknowledged.
+    at = send_values(at, [click])
+    assert at.session_state.clicks == 1
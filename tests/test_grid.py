@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import json
+
+from streamlit.testing.v1 import AppTest
+
+
+def _grid_args(at: AppTest) -> dict:
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    return json.loads(frame.proto.json_args)
+
+
+def _virtualized_app() -> None:
+    from streamlit_product_card import product_grid
+
+    products = [{"product_name": f"P{i}", "key": i} for i in range(5000)]
+    product_grid(
+        products,
+        columns=4,
+        virtualized=True,
+        height=500,
+        row_height=300,
+        overscan_rows=1,
+        key="grid",
+    )
+
+
+def test_virtualized_grid_sends_its_window():
+    at = AppTest.from_function(_virtualized_app).run()
+    assert not at.exception
+    args = _grid_args(at)
+    assert args["virtualized"] is True
+    assert (args["height"], args["rowHeight"], args["overscanRows"]) == (
+        500,
+        300,
+        1,
+    )
+    # One frame for the whole catalog; the window is cut in the browser.
+    assert len([e for e in at.main if hasattr(e.proto, "json_args")]) == 1
+    assert len(args["cards"]) == 5000
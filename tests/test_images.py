@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+pytest.importorskip("PIL")
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    from PIL import Image
+
+    path = tmp_path / "mug.png"
+    Image.new("RGB", (40, 20), (200, 40, 40)).save(path)
+    return str(path)
+
+
+def _frame_args(at: AppTest) -> list:
+    """Each card's props, which travel as one JSON string."""
+    return [
+        json.loads(json.loads(e.proto.json_args)["card"])
+        for e in at.main
+        if hasattr(e.proto, "json_args")
+    ]
+
+
+def _cards_app(image: str, cache_dir: str) -> None:
+    from streamlit_product_card import configure_image_cache, product_card
+
+    configure_image_cache(cache_dir)
+    product_card("Mug", product_image=image, key="plain")
+    product_card(
+        "Mug",
+        product_image=image,
+        image_placeholder="color",
+        image_load_margin=None,
+        key="color",
+    )
+    product_card(
+        "Mug", product_image=image, image_placeholder="blur", key="blur"
+    )
+
+
+def test_placeholders_carry_the_image_size(image_path, tmp_path):
+    at = AppTest.from_function(
+        _cards_app, args=(image_path, str(tmp_path / "cache"))
+    ).run()
+
+    assert not at.exception
+    plain, color, blur = _frame_args(at)
+    assert "productImagePlaceholder" not in plain
+    assert plain["imageLoadMargin"] == 200
+    assert color["imageLoadMargin"] is None
+    assert color["productImagePlaceholder"].startswith("#")
+    assert blur["productImagePlaceholder"].startswith("data:image/")
+    for args in (color, blur):
+        assert args["productImageWidth"] == 40
+        assert args["productImageHeight"] == 20
+
+
+def _bad_kind_app(image: str) -> None:
+    from streamlit_product_card import product_card
+
+    product_card("Mug", product_image=image, image_placeholder="sepia")
+
+
+def test_unknown_placeholder_kind_is_an_error(image_path):
+    at = AppTest.from_function(_bad_kind_app, args=(image_path,)).run()
+
+    assert at.exception
+    assert "image_placeholder" in at.exception[0].message
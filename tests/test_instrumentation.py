@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from streamlit_product_card import set_card_metrics_hook
+
+
+@pytest.fixture(autouse=True)
+def _no_hook_afterwards():
+    yield
+    set_card_metrics_hook(None)
+
+
+def _metrics_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import (
+        product_card,
+        product_grid,
+        set_card_metrics_hook,
+    )
+
+    reports = st.session_state.reports = []
+    set_card_metrics_hook(reports.append)
+    product_card("Mug", key="mug", on_button_click=lambda: None)
+    product_grid([{"product_name": f"P{i}"} for i in range(10)], key="grid")
+
+
+def test_hook_gets_one_report_per_call(send_values):
+    at = AppTest.from_function(_metrics_app).run()
+    assert not at.exception
+    card, grid = at.session_state.reports
+    assert (card.renderer, card.key, card.cards) == ("product_card", "mug", 1)
+    assert (grid.renderer, grid.key, grid.cards) == (
+        "product_grid",
+        "grid",
+        10,
+    )
+    assert grid.payload_bytes > card.payload_bytes > 0
+    assert card.clicks == 0 and card.client is None
+
+    value = {
+        "instanceId": "a",
+        "events": [{"seq": 1, "timestamp": 1}],
+        "timings": {"id": 1, "argsToPaintMs": 12.5},
+    }
+    at = send_values(at, [value])
+    card = at.session_state.reports[0]
+    assert card.clicks == 1
+    assert card.client == {"argsToPaintMs": 12.5}
+
+    # The same report sent again isn't reported twice.
+    at = send_values(at, [value])
+    card = at.session_state.reports[0]
+    assert (card.clicks, card.client) == (0, None)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+
+def _frame_args(at: AppTest) -> list:
+    args = [
+        json.loads(e.proto.json_args)
+        for e in at.main
+        if hasattr(e.proto, "json_args")
+    ]
+    # A single card's props travel as one JSON string.
+    return [
+        {**json.loads(a.pop("card")), **a} if "card" in a else a for a in args
+    ]
+
+
+def _live_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import (
+        product_card,
+        product_grid,
+        push_card_updates,
+    )
+
+    push_card_updates(st.session_state.get("updates", {}))
+    product_card("Mug", price="10", stock="In stock", key="mug")
+    product_grid(
+        [{"product_name": "Cap", "price": "5", "key": "cap"}], key="grid"
+    )
+
+
+def test_pushed_values_apply_to_cards_until_reverted():
+    at = AppTest.from_function(_live_app).run()
+    assert not at.exception
+
+    at.session_state.updates = {"mug": {"price": 12}, "cap": {"stock": "Low"}}
+    at.run()
+    push, card, grid = _frame_args(at)
+    assert push["liveUpdates"] == {
+        "mug": {"price": "12"},
+        "cap": {"stock": "Low"},
+    }
+    assert (card["price"], card["stock"]) == ("12", "In stock")
+    assert grid["cards"][0]["stock"] == "Low"
+
+    # Pushed values outlive the push, for cards rendered on later runs.
+    at.session_state.updates = {}
+    at.run()
+    _, card, grid = _frame_args(at)
+    assert card["price"] == "12"
+
+    at.session_state.updates = {"mug": {"price": None}}
+    at.run()
+    _, card, _ = _frame_args(at)
+    assert card["price"] == "10"
+
+
+def test_unknown_fields_are_rejected():
+    from streamlit_product_card import push_card_updates
+
+    with pytest.raises(ValueError):
+        push_card_updates({"mug": {"description": "New"}})
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import json
+
+from streamlit.testing.v1 import AppTest
+
+
+def _cards_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import product_card
+
+    mug_price = st.session_state.get("mug_price", "$12")
+    product_card("Cap", price="$8", key="cap")
+    product_card("Mug", price=mug_price, key="mug")
+
+
+def _card_texts(at: AppTest) -> list:
+    return [
+        json.loads(e.proto.json_args)["card"]
+        for e in at.main
+        if hasattr(e.proto, "json_args")
+    ]
+
+
+def test_unchanged_cards_send_the_same_text():
+    at = AppTest.from_function(_cards_app).run()
+    assert not at.exception
+    cap, mug = _card_texts(at)
+    assert json.loads(mug)["price"] == "$12"
+
+    at.session_state.mug_price = "$10"
+    at.run()
+    new_cap, new_mug = _card_texts(at)
+    # The frame decodes a card only when its text changes.
+    assert new_cap == cap
+    assert json.loads(new_mug)["price"] == "$10"
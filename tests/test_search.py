@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import json
+
+from streamlit.testing.v1 import AppTest
+
+
+def _searchable_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import catalog_view, product_grid
+
+    product_grid(
+        [
+            {"product_name": "Mug", "price": "€1.299,00", "key": "mug"},
+            {"product_name": "Cap", "price": 5, "key": "cap"},
+            {"product_name": "Tee", "price": "Ask us", "key": "tee"},
+        ],
+        searchable=True,
+        key="catalog",
+    )
+    st.session_state.view = catalog_view("catalog")
+
+
+def test_searchable_grid_sends_prices_and_reports_the_view(send_values):
+    at = AppTest.from_function(_searchable_app).run()
+    assert not at.exception
+    frame = next(e for e in at.main if hasattr(e.proto, "json_args"))
+    args = json.loads(frame.proto.json_args)
+    assert [card["priceValue"] for card in args["cards"]] == [1299, 5, None]
+    assert args["search"] == {"priceRange": True}
+    assert at.session_state.view is None
+
+    view = {"query": "mug", "sort": "price_asc", "minPrice": 100, "matches": 1}
+    at = send_values(at, [{"view": view}])
+    assert not at.exception
+    assert at.session_state.view == ("mug", "price_asc", 100, None, 1)
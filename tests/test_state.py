@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from streamlit.testing.v1 import AppTest
+
+
+def _many_cards_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import configure_card_state, product_card
+
+    configure_card_state(max_entries=10)
+    st.session_state.setdefault("calls", 0)
+
+    def count() -> None:
+        st.session_state.calls += 1
+
+    for i in range(15):
+        product_card(f"P{i}", key=f"k{i}", on_button_click=count)
+
+
+def test_clicks_delivered_once_above_the_cap(send_values):
+    at = AppTest.from_function(_many_cards_app).run()
+    click = {"instanceId": "a", "events": [{"seq": 1, "timestamp": 1}]}
+    for _ in range(4):
+        at = send_values(at, [click, click, click])
+        assert not at.exception
+        assert at.session_state.calls == 3
+
+
+def _paged_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import (
+        card_state_info,
+        configure_card_state,
+        product_card,
+    )
+
+    configure_card_state(max_entries=10)
+    page = st.session_state.setdefault("page", 0)
+    for i in range(8):
+        product_card(f"P{i}", key=f"page{page}_card{i}")
+    st.session_state.info = card_state_info()
+
+
+def test_entries_of_earlier_pages_are_dropped():
+    at = AppTest.from_function(_paged_app).run()
+    for page in range(1, 6):
+        at.session_state.page = page
+        at.run()
+        # The cap, or the cards of this page and the previous one.
+        assert at.session_state.info.entries == 16
+
+
+def _live_paged_app() -> None:
+    import streamlit as st
+
+    from streamlit_product_card import (
+        configure_card_state,
+        product_card,
+        push_card_updates,
+    )
+    from streamlit_product_card.state import _session_state
+
+    configure_card_state(max_entries=10)
+    page = st.session_state.setdefault("page", 0)
+    keys = [f"page{page}_card{i}" for i in range(8)]
+    push_card_updates({key: {"price": 10} for key in keys})
+    for key in keys:
+        product_card("P", key=key)
+    st.session_state.live_keys = set(_session_state().live)
+
+
+def test_pushed_values_of_earlier_pages_are_dropped():
+    at = AppTest.from_function(_live_paged_app).run()
+    for page in range(1, 6):
+        at.session_state.page = page
+        at.run()
+        assert not at.exception
+        # The cap, or the values of this page and the previous one.
+        assert len(at.session_state.live_keys) == 16
+    assert "page3_card0" not in at.session_state.live_keys
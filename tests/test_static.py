@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from streamlit_product_card import export_product_cards_html
+
+
+def test_keys_sanitized_alike_get_separate_files(tmp_path):
+    products = [
+        {"key": "a/b", "product_name": "Slash"},
+        {"key": "a_b", "product_name": "Underscore"},
+    ]
+    stats = export_product_cards_html(products, str(tmp_path), processes=1)
+    assert stats.rendered == 2
+    pages = sorted(tmp_path.glob("*.html"))
+    assert len(pages) == 2
+    assert "Underscore" in (tmp_path / "a_b.html").read_text()
+    assert any("Slash" in page.read_text() for page in pages)
+
+
+def test_duplicate_keys_raise(tmp_path):
+    products = [{"key": "a", "product_name": "A"}] * 2
+    with pytest.raises(ValueError):
+        export_product_cards_html(products, str(tmp_path), processes=1)
+
+
+def test_files_of_removed_products_are_deleted(tmp_path):
+    (tmp_path / "notes.html").write_text("not a card")
+    products = [{"key": f"p{i}", "product_name": f"P{i}"} for i in range(3)]
+    export_product_cards_html(products, str(tmp_path), processes=1)
+
+    stats = export_product_cards_html(products[1:], str(tmp_path), processes=1)
+    assert (stats.rendered, stats.unchanged, stats.removed) == (0, 2, 1)
+    assert not os.path.exists(tmp_path / "p0.html")
+    assert os.path.exists(tmp_path / "notes.html")
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import json
+
+from streamlit.testing.v1 import AppTest
+
+STYLES = {"button": {"color": "#F4E0C2"}}
+
+
+def _frame_args(at: AppTest) -> list:
+    return [
+        json.loads(e.proto.json_args)
+        for e in at.main
+        if hasattr(e.proto, "json_args")
+    ]
+
+
+def _card_props(args: dict) -> dict:
+    """A single card's props, which travel as one JSON string."""
+    props = json.loads(args.pop("card"))
+    return {**props, **args}
+
+
+def _cards_app() -> None:
+    from streamlit_product_card import product_card, register_card_theme
+
+    register_card_theme("brand", {"button": {"color": "#F4E0C2"}})
+    for i in range(3):
+        product_card(f"P{i}", theme="brand", key=f"k{i}")
+
+
+def test_theme_body_sent_once_then_referenced_by_id():
+    at = AppTest.from_function(_cards_app).run()
+    assert not at.exception
+    cards = [_card_props(args) for args in _frame_args(at)]
+    theme_ids = {card["themeId"] for card in cards}
+    assert len(theme_ids) == 1
+    assert cards[0]["themeBody"]["styles"] == STYLES
+    assert all("themeBody" not in card for card in cards[1:])
+
+
+def _grid_app() -> None:
+    from streamlit_product_card import product_grid, register_card_theme
+
+    register_card_theme("brand", {"button": {"color": "#F4E0C2"}})
+    product_grid(
+        [{"product_name": f"P{i}"} for i in range(50)],
+        theme="brand",
+        key="grid",
+    )
+
+
+def test_grid_sends_each_theme_once():
+    at = AppTest.from_function(_grid_app).run()
+    assert not at.exception
+    (args,) = _frame_args(at)
+    (theme_id,) = args["themes"]
+    assert args["themes"][theme_id]["styles"] == STYLES
+    assert {card["themeId"] for card in args["cards"]} == {theme_id}